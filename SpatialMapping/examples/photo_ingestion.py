@@ -63,15 +63,11 @@ def main():
             print(f"Extracted {len(observation.entities)} entities")
             print(f"Extracted {len(observation.relationships)} relationships")
 
-            # Merge entities into graph
-            for entity in observation.entities:
-                merged = graph.add_entity(entity, merge_if_exists=True)
+            # Merge entities and relationships into graph
+            entities, _ = graph.ingest_observation(observation)
+            for merged in entities:
                 print(f"  - Entity: {merged.name} (observations: {merged.observation_count})")
 
-            # Add relationships
-            for relationship in observation.relationships:
-                graph.add_relationship(relationship, merge_if_exists=True)
-
         else:
             print(f"Processing failed: {observation.processing_errors}")
 
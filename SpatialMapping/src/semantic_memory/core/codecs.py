@@ -0,0 +1,77 @@
+"""Field conversions for the trusted (validation-free) serialization path."""
+
+import gc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def construct(model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """
+    Create a model instance from already-converted values without validation.
+
+    Like BaseModel.model_construct, but skips default handling, so values
+    must contain every field. Several times faster than model_construct.
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def datetime_to_json(value: datetime) -> str:
+    """Format a datetime the way pydantic's JSON mode does (UTC as "Z")."""
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        return text[:-6] + "Z"
+    return text
+
+
+def datetime_from_json(value: Any) -> datetime:
+    """Parse an ISO 8601 datetime string (also accepts datetime objects)."""
+    if isinstance(value, datetime):
+        return value
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def optional_list(values: Optional[Iterable[Any]]) -> Optional[List[Any]]:
+    """Copy an optional sequence into a list."""
+    return list(values) if values is not None else None
+
+
+def properties_to_json(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a free-form property dict to JSON-compatible values."""
+    if not properties:
+        return {}
+    return to_jsonable_python(properties)
+
+
+def enum_value(value: Any) -> Any:
+    """The value of an enum member, or the value itself if it is not one."""
+    return getattr(value, "value", value)
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Suspend the cyclic garbage collector for a bulk load.
+
+    Loading creates millions of long-lived objects; each collection pass
+    walks all of them, which otherwise dominates load time.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -2,10 +2,19 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
+
+from semantic_memory.core.codecs import (
+    construct,
+    datetime_from_json,
+    datetime_to_json,
+    enum_value,
+    optional_list,
+    properties_to_json,
+)
 
 
 class EntityType(str, Enum):
@@ -22,6 +31,11 @@ class EntityType(str, Enum):
     UNKNOWN = "unknown"  # Unclassified entities
 
 
+# Compact integer encoding of entity types, used by graph indices
+ENTITY_TYPES: Tuple[EntityType, ...] = tuple(EntityType)
+ENTITY_CODES: Dict[str, int] = {t.value: code for code, t in enumerate(ENTITY_TYPES)}
+
+
 class VisualFeatures(BaseModel):
     """Visual appearance features for entity matching."""
 
@@ -32,6 +46,13 @@ class VisualFeatures(BaseModel):
     shape_descriptor: Optional[str] = None
     texture_features: Optional[List[float]] = None
 
+    @field_serializer(
+        "embedding", "color_histogram", "texture_features", when_used="json-unless-none"
+    )
+    def _serialize_vector(self, value: Any) -> List[float]:
+        # Vectors loaded from a binary snapshot are read-only sequence views
+        return value if isinstance(value, list) else list(value)
+
 
 class SemanticAttributes(BaseModel):
     """Semantic properties of an entity."""
@@ -166,11 +187,93 @@ class Entity(BaseModel):
 
         return dot_product / (norm1 * norm2)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert entity to dictionary representation."""
-        return self.model_dump(mode='json')
+    def to_dict(self, trusted: bool = False) -> Dict[str, Any]:
+        """
+        Convert entity to dictionary representation.
+
+        Args:
+            trusted: Build the JSON-compatible dict directly instead of going
+                through pydantic serialization (assumes every field holds a
+                value of its declared type)
+        """
+        if not trusted:
+            return self.model_dump(mode='json')
+
+        semantic = self.semantic
+        visual = self.visual
+        return {
+            "id": str(self.id),
+            "entity_type": enum_value(self.entity_type),
+            "name": self.name,
+            "semantic": {
+                "category": semantic.category,
+                "subcategory": semantic.subcategory,
+                "function": semantic.function,
+                "material_composition": list(semantic.material_composition),
+                "brand": semantic.brand,
+                "model": semantic.model,
+                "tags": list(semantic.tags),
+                "description": semantic.description,
+                "aliases": list(semantic.aliases),
+            },
+            "visual": {
+                "embedding": optional_list(visual.embedding),
+                "color_histogram": optional_list(visual.color_histogram),
+                "dominant_colors": list(visual.dominant_colors),
+                "size_estimate": visual.size_estimate,
+                "shape_descriptor": visual.shape_descriptor,
+                "texture_features": optional_list(visual.texture_features),
+            },
+            "first_observed": datetime_to_json(self.first_observed),
+            "last_observed": datetime_to_json(self.last_observed),
+            "observation_count": self.observation_count,
+            "source_devices": list(self.source_devices),
+            "confidence": self.confidence,
+            "properties": properties_to_json(self.properties),
+        }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Entity":
-        """Create entity from dictionary representation."""
-        return cls.model_validate(data)
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> "Entity":
+        """
+        Create entity from dictionary representation.
+
+        Args:
+            data: Dictionary produced by to_dict()
+            trusted: Skip validation and convert fields directly (only for
+                data this library produced itself)
+        """
+        if not trusted:
+            return cls.model_validate(data)
+
+        semantic = data.get("semantic") or {}
+        visual = data.get("visual") or {}
+        return construct(cls, dict(
+            id=UUID(data["id"]),
+            entity_type=data["entity_type"],
+            name=data["name"],
+            semantic=construct(SemanticAttributes, dict(
+                category=semantic.get("category"),
+                subcategory=semantic.get("subcategory"),
+                function=semantic.get("function"),
+                material_composition=list(semantic.get("material_composition", ())),
+                brand=semantic.get("brand"),
+                model=semantic.get("model"),
+                tags=set(semantic.get("tags", ())),
+                description=semantic.get("description"),
+                aliases=list(semantic.get("aliases", ())),
+            )),
+            visual=construct(VisualFeatures, dict(
+                embedding=optional_list(visual.get("embedding")),
+                color_histogram=optional_list(visual.get("color_histogram")),
+                dominant_colors=list(visual.get("dominant_colors", ())),
+                size_estimate=visual.get("size_estimate"),
+                shape_descriptor=visual.get("shape_descriptor"),
+                texture_features=optional_list(visual.get("texture_features")),
+            )),
+            first_observed=datetime_from_json(data["first_observed"]),
+            last_observed=datetime_from_json(data["last_observed"]),
+            observation_count=data.get("observation_count", 1),
+            source_devices=set(data.get("source_devices", ())),
+            confidence=data.get("confidence", 0.5),
+            properties=dict(data.get("properties") or {}),
+        ))
@@ -2,11 +2,20 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
+from semantic_memory.core.codecs import (
+    construct,
+    datetime_from_json,
+    datetime_to_json,
+    enum_value,
+    properties_to_json,
+)
+
 
 class RelationType(str, Enum):
     """Types of relationships between entities."""
@@ -49,6 +58,60 @@ class RelationType(str, Enum):
     RELATED_TO = "related_to"  # Generic relationship
 
 
+# Relationship types that describe where entities are relative to each other
+SPATIAL_RELATION_TYPES = frozenset({
+    RelationType.ON, RelationType.IN, RelationType.NEAR,
+    RelationType.NEXT_TO, RelationType.ABOVE, RelationType.BELOW,
+    RelationType.LEFT_OF, RelationType.RIGHT_OF,
+    RelationType.IN_FRONT_OF, RelationType.BEHIND,
+    RelationType.ATTACHED_TO
+})
+
+# Compact integer encoding of relationship types, used by graph indices.
+# Types are stored as plain strings (use_enum_values), which hash and compare
+# equal to their enum members, so either can be used as a key.
+RELATION_TYPES: Tuple[RelationType, ...] = tuple(RelationType)
+RELATION_CODES: Dict[str, int] = {t.value: code for code, t in enumerate(RELATION_TYPES)}
+
+
+def relation_mask(relation_types: Iterable[str]) -> int:
+    """Build a bitmask with the bit of each given relationship type set."""
+    mask = 0
+    for relation_type in relation_types:
+        mask |= 1 << RELATION_CODES[relation_type]
+    return mask
+
+
+@lru_cache(maxsize=None)
+def mask_codes(mask: int) -> Tuple[int, ...]:
+    """Relationship type codes whose bits are set in a mask, in ascending order."""
+    return tuple(code for code in range(len(RELATION_TYPES)) if mask >> code & 1)
+
+
+SPATIAL_RELATION_MASK = relation_mask(SPATIAL_RELATION_TYPES)
+
+# Mask selecting every relationship type
+ALL_RELATION_MASK = (1 << len(RELATION_TYPES)) - 1
+
+_INVERSE_TYPES = {
+    RelationType.ON: RelationType.BELOW,
+    RelationType.BELOW: RelationType.ON,
+    RelationType.ABOVE: RelationType.BELOW,
+    RelationType.LEFT_OF: RelationType.RIGHT_OF,
+    RelationType.RIGHT_OF: RelationType.LEFT_OF,
+    RelationType.IN_FRONT_OF: RelationType.BEHIND,
+    RelationType.BEHIND: RelationType.IN_FRONT_OF,
+    RelationType.BEFORE: RelationType.AFTER,
+    RelationType.AFTER: RelationType.BEFORE,
+}
+
+# Inverse type code for each type code (-1 if the type has no inverse)
+INVERSE_RELATION_CODES: Tuple[int, ...] = tuple(
+    RELATION_CODES[_INVERSE_TYPES[t]] if t in _INVERSE_TYPES else -1
+    for t in RELATION_TYPES
+)
+
+
 class SpatialProperties(BaseModel):
     """Properties specific to spatial relationships."""
 
@@ -92,20 +155,8 @@ class Relationship(BaseModel):
 
     def inverse_type(self) -> Optional[RelationType]:
         """Get the inverse relationship type if applicable."""
-        inverses = {
-            RelationType.ON: RelationType.BELOW,
-            RelationType.BELOW: RelationType.ON,
-            RelationType.ABOVE: RelationType.BELOW,
-            RelationType.LEFT_OF: RelationType.RIGHT_OF,
-            RelationType.RIGHT_OF: RelationType.LEFT_OF,
-            RelationType.IN_FRONT_OF: RelationType.BEHIND,
-            RelationType.BEHIND: RelationType.IN_FRONT_OF,
-            RelationType.BEFORE: RelationType.AFTER,
-            RelationType.AFTER: RelationType.BEFORE,
-            RelationType.PART_OF: None,  # Not symmetric
-            RelationType.IN: None,  # Not symmetric (contains is different)
-        }
-        return inverses.get(self.relation_type)
+        code = INVERSE_RELATION_CODES[RELATION_CODES[self.relation_type]]
+        return RELATION_TYPES[code] if code >= 0 else None
 
     def merge_observation(self, weight: float = 0.3) -> None:
         """
@@ -122,20 +173,67 @@ class Relationship(BaseModel):
 
     def is_spatial(self) -> bool:
         """Check if this is a spatial relationship."""
-        spatial_types = {
-            RelationType.ON, RelationType.IN, RelationType.NEAR,
-            RelationType.NEXT_TO, RelationType.ABOVE, RelationType.BELOW,
-            RelationType.LEFT_OF, RelationType.RIGHT_OF,
-            RelationType.IN_FRONT_OF, RelationType.BEHIND,
-            RelationType.ATTACHED_TO
-        }
-        return self.relation_type in spatial_types
+        return (SPATIAL_RELATION_MASK >> RELATION_CODES[self.relation_type]) & 1 == 1
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert relationship to dictionary representation."""
-        return self.model_dump(mode='json')
+    def to_dict(self, trusted: bool = False) -> Dict[str, Any]:
+        """
+        Convert relationship to dictionary representation.
+
+        Args:
+            trusted: Build the JSON-compatible dict directly instead of going
+                through pydantic serialization (assumes every field holds a
+                value of its declared type)
+        """
+        if not trusted:
+            return self.model_dump(mode='json')
+
+        spatial = self.spatial
+        return {
+            "id": str(self.id),
+            "relation_type": enum_value(self.relation_type),
+            "source_id": str(self.source_id),
+            "target_id": str(self.target_id),
+            "spatial": None if spatial is None else {
+                "distance_estimate": spatial.distance_estimate,
+                "distance_meters": spatial.distance_meters,
+                "relative_orientation": spatial.relative_orientation,
+                "elevation_difference": spatial.elevation_difference,
+                "confidence": spatial.confidence,
+            },
+            "first_observed": datetime_to_json(self.first_observed),
+            "last_observed": datetime_to_json(self.last_observed),
+            "observation_count": self.observation_count,
+            "source_devices": list(self.source_devices),
+            "confidence": self.confidence,
+            "is_bidirectional": self.is_bidirectional,
+            "properties": properties_to_json(self.properties),
+        }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Relationship":
-        """Create relationship from dictionary representation."""
-        return cls.model_validate(data)
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> "Relationship":
+        """
+        Create relationship from dictionary representation.
+
+        Args:
+            data: Dictionary produced by to_dict()
+            trusted: Skip validation and convert fields directly (only for
+                data this library produced itself)
+        """
+        if not trusted:
+            return cls.model_validate(data)
+
+        spatial = data.get("spatial")
+        return construct(cls, dict(
+            id=UUID(data["id"]),
+            relation_type=data["relation_type"],
+            source_id=UUID(data["source_id"]),
+            target_id=UUID(data["target_id"]),
+            spatial=None if spatial is None else construct(SpatialProperties, dict(spatial)),
+            first_observed=datetime_from_json(data["first_observed"]),
+            last_observed=datetime_from_json(data["last_observed"]),
+            observation_count=data.get("observation_count", 1),
+            source_devices=set(data.get("source_devices", ())),
+            confidence=data.get("confidence", 0.5),
+            is_bidirectional=data.get("is_bidirectional", False),
+            properties=dict(data.get("properties") or {}),
+        ))
@@ -1,5 +1,31 @@
 """Semantic graph implementation and operations."""
 
+from semantic_memory.graph.backends import (
+    ColumnarBackend,
+    GraphBackend,
+    NativeBackend,
+    NetworkXBackend,
+)
+from semantic_memory.graph.entity_store import EntityStore
+from semantic_memory.graph.listeners import MutationListener
 from semantic_memory.graph.semantic_graph import SemanticGraph
+from semantic_memory.graph.mutation_log import MutationLog
+from semantic_memory.graph.snapshot import MappedVector
+from semantic_memory.graph.sqlite_backend import SQLiteBackend
+from semantic_memory.graph.vector_index import ExactVectorIndex, IVFVectorIndex, VectorIndex
 
-__all__ = ["SemanticGraph"]
+__all__ = [
+    "SemanticGraph",
+    "GraphBackend",
+    "NativeBackend",
+    "NetworkXBackend",
+    "ColumnarBackend",
+    "SQLiteBackend",
+    "EntityStore",
+    "MappedVector",
+    "MutationListener",
+    "MutationLog",
+    "VectorIndex",
+    "ExactVectorIndex",
+    "IVFVectorIndex",
+]
@@ -0,0 +1,494 @@
+"""Storage backends for SemanticGraph."""
+
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import networkx as nx
+
+from semantic_memory.core.entity import ENTITY_CODES, ENTITY_TYPES, Entity
+from semantic_memory.core.relationship import (
+    ALL_RELATION_MASK,
+    RELATION_CODES,
+    RELATION_TYPES,
+    Relationship,
+    mask_codes,
+)
+from semantic_memory.graph.entity_store import EntityStore
+from semantic_memory.graph.ids import IdMap
+
+
+class GraphBackend(ABC):
+    """
+    Storage for the entities and relationships of a SemanticGraph.
+
+    A backend owns the primary records and the lookups every graph operation
+    needs: by ID, by type, by lowercase name, by (source, target, type), and
+    per-type adjacency. Derived structures (embedding index, containment,
+    statistics, caches) live in SemanticGraph and work with any backend.
+
+    Entities are addressed by dense integer IDs assigned by the backend's
+    IdMap (``ids``), the one place entity UUIDs are translated.
+
+    Entities and relationships returned by a backend may be shared objects
+    or fresh copies; after mutating one, SemanticGraph always calls
+    update_entity / update_relationship so both kinds of backend persist it.
+    """
+
+    def __init__(self):
+        """Initialize an empty backend."""
+        self.ids = IdMap()
+
+    # Entities
+
+    @abstractmethod
+    def add_entity(self, entity: Entity) -> int:
+        """Store a new entity and return its integer ID."""
+
+    @abstractmethod
+    def update_entity(self, entity_id: int, entity: Entity) -> None:
+        """Persist changes to a stored entity (its type and name never change)."""
+
+    @abstractmethod
+    def remove_entity(self, entity_id: int) -> Optional[Entity]:
+        """Remove an entity that has no relationships left and release its ID."""
+
+    @abstractmethod
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        """Get an entity by integer ID."""
+
+    @abstractmethod
+    def entities(self) -> Iterator[Entity]:
+        """Iterate all entities."""
+
+    @abstractmethod
+    def entities_by_type(self, type_code: int) -> Iterator[Entity]:
+        """Iterate entities with the given entity type code."""
+
+    @abstractmethod
+    def entities_by_name(self, name_lower: str) -> Iterator[Entity]:
+        """Iterate entities whose lowercased name matches exactly."""
+
+    @abstractmethod
+    def entity_count(self) -> int:
+        """Number of stored entities."""
+
+    # Relationships
+
+    @abstractmethod
+    def add_relationship(self, rel: Relationship, source: int, target: int) -> None:
+        """Store a new relationship between the given stored entities."""
+
+    @abstractmethod
+    def update_relationship(self, rel: Relationship) -> None:
+        """Persist changes to a stored relationship (its endpoints and type never change)."""
+
+    @abstractmethod
+    def remove_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        """Remove a relationship."""
+
+    @abstractmethod
+    def get_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        """Get a relationship by ID."""
+
+    @abstractmethod
+    def relationships(self) -> Iterator[Relationship]:
+        """Iterate all relationships."""
+
+    @abstractmethod
+    def relationship_count(self) -> int:
+        """Number of stored relationships."""
+
+    @abstractmethod
+    def find_relationship(self, source: int, target: int, type_code: int) -> Optional[Relationship]:
+        """Get the first stored relationship with the given endpoints and type."""
+
+    @abstractmethod
+    def outgoing(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        """
+        Iterate relationships leaving an entity whose type is in mask.
+
+        Relationships are ordered by type code, then by insertion.
+
+        Returns:
+            Iterator of (target ID, relationship) tuples
+        """
+
+    @abstractmethod
+    def incoming(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        """Iterate (source ID, relationship) entering an entity whose type is in mask."""
+
+    def relationships_with_mask(self, mask: int) -> Iterator[Tuple[int, int, Relationship]]:
+        """
+        Iterate all relationships whose type is in mask.
+
+        Each source entity's relationships come out in outgoing() order.
+
+        Returns:
+            Iterator of (source ID, target ID, relationship) tuples
+        """
+        for source in self.ids:
+            for target, rel in self.outgoing(source, mask):
+                yield source, target, rel
+
+    def entity_summaries(self) -> Iterator[Tuple[int, UUID, int, Optional[Sequence[float]]]]:
+        """
+        Iterate what the graph's derived indices need to know about each entity.
+
+        Used to rebuild those indices when a graph is opened on a backend
+        that already holds data; backends with persistent storage can
+        override it to avoid materializing entities.
+
+        Returns:
+            Iterator of (integer ID, UUID, type code, embedding or None)
+        """
+        for entity_id in self.ids:
+            entity = self.get_entity(entity_id)
+            yield entity_id, entity.id, ENTITY_CODES[entity.entity_type], entity.visual.embedding
+
+    def relationship_keys(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterate (source ID, target ID, type code) of every relationship."""
+        for source, target, rel in self.relationships_with_mask(ALL_RELATION_MASK):
+            yield source, target, RELATION_CODES[rel.relation_type]
+
+
+class NativeBackend(GraphBackend):
+    """
+    Compact in-memory backend.
+
+    Entities are stored once in a list indexed by integer ID and
+    relationships once in a list addressed by row (freed rows are reused).
+    All indices, including the per-type int32 adjacency arrays, hold
+    integers rather than UUIDs or objects.
+    """
+
+    def __init__(self):
+        """Initialize an empty backend."""
+        super().__init__()
+        self._entities: List[Optional[Entity]] = []
+
+        self._relationship_rows: Dict[UUID, int] = {}
+        self._relationships: List[Optional[Relationship]] = []
+        self._sources = array("i")
+        self._targets = array("i")
+        self._free_rows: List[int] = []
+
+        # Per-type adjacency: type code -> entity ID -> relationship rows
+        self._outgoing: List[Dict[int, array]] = [{} for _ in RELATION_TYPES]
+        self._incoming: List[Dict[int, array]] = [{} for _ in RELATION_TYPES]
+
+        self._by_type: List[Set[int]] = [set() for _ in ENTITY_TYPES]
+        self._by_name: Dict[str, Set[int]] = {}
+        self._by_key: Dict[Tuple[int, int, int], int] = {}
+
+    def add_entity(self, entity: Entity) -> int:
+        entity_id = self.ids.add(entity.id)
+        self._store_entity(entity_id, entity)
+        self._by_type[ENTITY_CODES[entity.entity_type]].add(entity_id)
+        self._by_name.setdefault(entity.name.lower(), set()).add(entity_id)
+        return entity_id
+
+    def update_entity(self, entity_id: int, entity: Entity) -> None:
+        self._store_entity(entity_id, entity)
+
+    def remove_entity(self, entity_id: int) -> Optional[Entity]:
+        entity = self.get_entity(entity_id)
+        if entity is None:
+            return None
+        self._discard_entity(entity_id)
+        self.ids.remove(entity.id)
+
+        self._by_type[ENTITY_CODES[entity.entity_type]].discard(entity_id)
+        name_lower = entity.name.lower()
+        same_name = self._by_name[name_lower]
+        same_name.discard(entity_id)
+        if not same_name:
+            del self._by_name[name_lower]
+        return entity
+
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        if 0 <= entity_id < len(self._entities):
+            return self._entities[entity_id]
+        return None
+
+    def entities(self) -> Iterator[Entity]:
+        return (entity for entity in self._entities if entity is not None)
+
+    def entities_by_type(self, type_code: int) -> Iterator[Entity]:
+        return (self.get_entity(i) for i in self._by_type[type_code])
+
+    def entities_by_name(self, name_lower: str) -> Iterator[Entity]:
+        return (self.get_entity(i) for i in self._by_name.get(name_lower, ()))
+
+    def entity_count(self) -> int:
+        return len(self.ids)
+
+    def _store_entity(self, entity_id: int, entity: Entity) -> None:
+        if entity_id == len(self._entities):
+            self._entities.append(entity)
+        else:
+            self._entities[entity_id] = entity
+
+    def _discard_entity(self, entity_id: int) -> None:
+        self._entities[entity_id] = None
+
+    def add_relationship(self, rel: Relationship, source: int, target: int) -> None:
+        code = RELATION_CODES[rel.relation_type]
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._relationships[row] = rel
+            self._sources[row] = source
+            self._targets[row] = target
+        else:
+            row = len(self._relationships)
+            self._relationships.append(rel)
+            self._sources.append(source)
+            self._targets.append(target)
+
+        self._relationship_rows[rel.id] = row
+        self._outgoing[code].setdefault(source, array("i")).append(row)
+        self._incoming[code].setdefault(target, array("i")).append(row)
+        self._by_key.setdefault((source, target, code), row)
+
+    def update_relationship(self, rel: Relationship) -> None:
+        self._relationships[self._relationship_rows[rel.id]] = rel
+
+    def remove_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        row = self._relationship_rows.pop(relationship_id, None)
+        if row is None:
+            return None
+        rel = self._relationships[row]
+        self._relationships[row] = None
+        self._free_rows.append(row)
+
+        source, target = self._sources[row], self._targets[row]
+        code = RELATION_CODES[rel.relation_type]
+        for adjacency, entity_id in (
+            (self._outgoing[code], source),
+            (self._incoming[code], target),
+        ):
+            rows = adjacency[entity_id]
+            rows.remove(row)
+            if not rows:
+                del adjacency[entity_id]
+
+        # Point the dedup key at a remaining duplicate, if any
+        key = (source, target, code)
+        if self._by_key.get(key) == row:
+            del self._by_key[key]
+            for other in self._outgoing[code].get(source, ()):
+                if self._targets[other] == target:
+                    self._by_key[key] = other
+                    break
+        return rel
+
+    def get_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        row = self._relationship_rows.get(relationship_id)
+        return self._relationships[row] if row is not None else None
+
+    def relationships(self) -> Iterator[Relationship]:
+        return (rel for rel in self._relationships if rel is not None)
+
+    def relationship_count(self) -> int:
+        return len(self._relationship_rows)
+
+    def find_relationship(self, source: int, target: int, type_code: int) -> Optional[Relationship]:
+        row = self._by_key.get((source, target, type_code))
+        return self._relationships[row] if row is not None else None
+
+    def outgoing(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        return self._adjacent(self._outgoing, self._targets, entity_id, mask)
+
+    def incoming(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        return self._adjacent(self._incoming, self._sources, entity_id, mask)
+
+    def relationships_with_mask(self, mask: int) -> Iterator[Tuple[int, int, Relationship]]:
+        for code in mask_codes(mask):
+            for source, rows in self._outgoing[code].items():
+                for row in rows:
+                    yield source, self._targets[row], self._relationships[row]
+
+    def _adjacent(
+        self,
+        adjacency: List[Dict[int, array]],
+        other_end: array,
+        entity_id: int,
+        mask: int
+    ) -> Iterator[Tuple[int, Relationship]]:
+        for code in mask_codes(mask):
+            rows = adjacency[code].get(entity_id)
+            if rows:
+                for row in rows:
+                    yield other_end[row], self._relationships[row]
+
+
+class ColumnarBackend(NativeBackend):
+    """
+    NativeBackend with entities kept in a columnar EntityStore.
+
+    Entity records cost a few dozen bytes of typed arrays plus whatever
+    optional fields they actually use, instead of a pydantic object graph
+    each. Entities are materialized when accessed and stay shared while
+    referenced (see EntityStore).
+    """
+
+    def __init__(self, store: Optional[EntityStore] = None):
+        """
+        Initialize an empty backend.
+
+        Args:
+            store: Empty entity store to use (default: a new one)
+        """
+        super().__init__()
+        self.store = store if store is not None else EntityStore()
+
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        return self.store.get(entity_id)
+
+    def entities(self) -> Iterator[Entity]:
+        return (self.store.get(i) for i in self.store.ids())
+
+    def _store_entity(self, entity_id: int, entity: Entity) -> None:
+        self.store.put(entity_id, entity)
+
+    def _discard_entity(self, entity_id: int) -> None:
+        self.store.remove(entity_id)
+
+
+class NetworkXBackend(GraphBackend):
+    """
+    Backend storing entities and relationships in a networkx MultiDiGraph.
+
+    Kept for compatibility with code that works on the networkx graph
+    directly (available as the ``graph`` attribute, with UUID nodes).
+    """
+
+    def __init__(self):
+        """Initialize an empty backend."""
+        super().__init__()
+        self.graph = nx.MultiDiGraph()  # Supports multiple edges between nodes
+        self._endpoints: Dict[UUID, Tuple[UUID, UUID]] = {}
+        # Insertion sequence number of each relationship, for outgoing() order
+        self._sequence: Dict[UUID, int] = {}
+        self._next_sequence = 0
+        self._by_type: List[Set[int]] = [set() for _ in ENTITY_TYPES]
+        self._by_name: Dict[str, Set[int]] = {}
+        self._by_key: Dict[Tuple[int, int, int], UUID] = {}
+
+    def add_entity(self, entity: Entity) -> int:
+        entity_id = self.ids.add(entity.id)
+        self.graph.add_node(entity.id, entity=entity)
+        self._by_type[ENTITY_CODES[entity.entity_type]].add(entity_id)
+        self._by_name.setdefault(entity.name.lower(), set()).add(entity_id)
+        return entity_id
+
+    def update_entity(self, entity_id: int, entity: Entity) -> None:
+        self.graph.nodes[entity.id]["entity"] = entity
+
+    def remove_entity(self, entity_id: int) -> Optional[Entity]:
+        entity = self.get_entity(entity_id)
+        if entity is None:
+            return None
+        self.graph.remove_node(entity.id)
+        self.ids.remove(entity.id)
+        self._by_type[ENTITY_CODES[entity.entity_type]].discard(entity_id)
+        name_lower = entity.name.lower()
+        same_name = self._by_name[name_lower]
+        same_name.discard(entity_id)
+        if not same_name:
+            del self._by_name[name_lower]
+        return entity
+
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        node = self._node(entity_id)
+        return self.graph.nodes[node]["entity"] if node is not None else None
+
+    def entities(self) -> Iterator[Entity]:
+        return (data["entity"] for _, data in self.graph.nodes(data=True))
+
+    def entities_by_type(self, type_code: int) -> Iterator[Entity]:
+        return (self.get_entity(i) for i in self._by_type[type_code])
+
+    def entities_by_name(self, name_lower: str) -> Iterator[Entity]:
+        return (self.get_entity(i) for i in self._by_name.get(name_lower, ()))
+
+    def entity_count(self) -> int:
+        return self.graph.number_of_nodes()
+
+    def add_relationship(self, rel: Relationship, source: int, target: int) -> None:
+        self.graph.add_edge(rel.source_id, rel.target_id, key=rel.id, relationship=rel)
+        self._endpoints[rel.id] = (rel.source_id, rel.target_id)
+        self._sequence[rel.id] = self._next_sequence
+        self._next_sequence += 1
+        self._by_key.setdefault((source, target, RELATION_CODES[rel.relation_type]), rel.id)
+
+    def update_relationship(self, rel: Relationship) -> None:
+        self.graph.edges[rel.source_id, rel.target_id, rel.id]["relationship"] = rel
+
+    def remove_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        endpoints = self._endpoints.pop(relationship_id, None)
+        if endpoints is None:
+            return None
+        source_id, target_id = endpoints
+        del self._sequence[relationship_id]
+        rel = self.graph.edges[source_id, target_id, relationship_id]["relationship"]
+        self.graph.remove_edge(source_id, target_id, key=relationship_id)
+
+        source, target = self.ids.get(source_id), self.ids.get(target_id)
+        code = RELATION_CODES[rel.relation_type]
+        key = (source, target, code)
+        if self._by_key.get(key) == relationship_id:
+            del self._by_key[key]
+            for other_target, other in self.outgoing(source, 1 << code):
+                if other_target == target:
+                    self._by_key[key] = other.id
+                    break
+        return rel
+
+    def get_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        endpoints = self._endpoints.get(relationship_id)
+        if endpoints is None:
+            return None
+        return self.graph.edges[endpoints[0], endpoints[1], relationship_id]["relationship"]
+
+    def relationships(self) -> Iterator[Relationship]:
+        return (data["relationship"] for _, _, data in self.graph.edges(data=True))
+
+    def relationship_count(self) -> int:
+        return self.graph.number_of_edges()
+
+    def find_relationship(self, source: int, target: int, type_code: int) -> Optional[Relationship]:
+        rel_id = self._by_key.get((source, target, type_code))
+        return self.get_relationship(rel_id) if rel_id is not None else None
+
+    def outgoing(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        node = self._node(entity_id)
+        if node is None:
+            return iter(())
+        edges = ((v, data) for _, v, data in self.graph.out_edges(node, data=True))
+        return self._sorted_by_type(edges, mask)
+
+    def incoming(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        node = self._node(entity_id)
+        if node is None:
+            return iter(())
+        edges = ((u, data) for u, _, data in self.graph.in_edges(node, data=True))
+        return self._sorted_by_type(edges, mask)
+
+    def _node(self, entity_id: int) -> Optional[UUID]:
+        """UUID node of an integer ID, or None if it is not in the graph."""
+        if 0 <= entity_id < self.ids.capacity:
+            return self.ids.uuid(entity_id)
+        return None
+
+    def _sorted_by_type(self, edges, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        """Edges with type in mask, by type code and then in insertion order."""
+        matching = []
+        for other, data in edges:
+            rel = data["relationship"]
+            code = RELATION_CODES[rel.relation_type]
+            if mask >> code & 1:
+                matching.append((code, self._sequence[rel.id], self.ids.get(other), rel))
+        matching.sort(key=lambda item: item[:2])
+        return ((other, rel) for _, _, other, rel in matching)
@@ -0,0 +1,88 @@
+"""Per-record change history for delta synchronization."""
+
+from collections import OrderedDict
+from typing import Callable, Iterator, Tuple
+from uuid import UUID
+
+from semantic_memory.core.entity import Entity
+from semantic_memory.core.relationship import Relationship
+from semantic_memory.graph.listeners import MutationListener
+
+ENTITY = "entity"
+RELATIONSHIP = "relationship"
+
+
+class ChangeTracker(MutationListener):
+    """
+    Remembers the graph version at which each record last changed.
+
+    Records are kept in order of their last change, so the changes since a
+    version are found by walking back from the newest one: the cost is
+    proportional to the number of changed records, not the graph size.
+    Removed records are kept as tombstones until prune() drops them.
+    """
+
+    def __init__(self, version: Callable[[], int]):
+        """
+        Initialize an empty history.
+
+        Args:
+            version: Returns the graph's current version
+        """
+        self._version = version
+        # (kind, id) -> (version of last change, removed?), oldest first
+        self._changes: "OrderedDict[Tuple[str, UUID], Tuple[int, bool]]" = OrderedDict()
+        self.horizon = version()
+
+    def changes_since(self, version: int) -> Iterator[Tuple[str, UUID, bool]]:
+        """
+        Yield (kind, id, removed) for records changed after a version, newest first.
+
+        Raises:
+            ValueError: If the history does not reach back to that version
+        """
+        if version < self.horizon:
+            raise ValueError(
+                f"Changes before version {self.horizon} are not tracked; "
+                "a full export is needed"
+            )
+        for key in reversed(self._changes):
+            changed, removed = self._changes[key]
+            if changed <= version:
+                break
+            yield key[0], key[1], removed
+
+    def prune(self, version: int) -> int:
+        """
+        Forget tombstones of records removed at or before a version.
+
+        Deltas since versions older than this can no longer be exported.
+
+        Returns:
+            Number of tombstones dropped
+        """
+        stale = [
+            key for key, (changed, removed) in self._changes.items()
+            if removed and changed <= version
+        ]
+        for key in stale:
+            del self._changes[key]
+        self.horizon = max(self.horizon, version)
+        return len(stale)
+
+    def _stamp(self, kind: str, record_id: UUID, removed: bool) -> None:
+        key = (kind, record_id)
+        self._changes[key] = (self._version(), removed)
+        self._changes.move_to_end(key)
+
+    def entity_stored(self, entity: Entity) -> None:
+        self._stamp(ENTITY, entity.id, False)
+
+    def entity_removed(self, entity_id: UUID) -> None:
+        self._stamp(ENTITY, entity_id, True)
+
+    def relationship_stored(self, relationship: Relationship) -> None:
+        self._stamp(RELATIONSHIP, relationship.id, False)
+
+    def relationship_removed(self, relationship_id: UUID) -> None:
+        self._stamp(RELATIONSHIP, relationship_id, True)
@@ -0,0 +1,289 @@
+"""Columnar storage for entities."""
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from semantic_memory.core.entity import (
+    ENTITY_CODES,
+    ENTITY_TYPES,
+    Entity,
+    SemanticAttributes,
+    VisualFeatures,
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Fields kept only when they differ from their (empty) defaults
+_SEMANTIC_EXTRAS = (
+    "subcategory", "function", "material_composition", "brand", "model",
+    "tags", "description", "aliases",
+)
+_VISUAL_EXTRAS = (
+    "color_histogram", "dominant_colors", "size_estimate", "shape_descriptor",
+    "texture_features",
+)
+
+
+def _is_empty(value: Any) -> bool:
+    """Whether an optional field holds its default (None or an empty container)."""
+    return value is None or (isinstance(value, (list, set, dict)) and not value)
+
+
+def _copy(value: Any) -> Any:
+    """Shallow-copy a mutable container so stored and handed-out values are independent."""
+    if isinstance(value, (list, set, dict)):
+        return type(value)(value)
+    return value
+
+
+class EntityStore:
+    """
+    Column-oriented entity storage addressed by integer entity ID.
+
+    Core fields live in typed arrays: entity type, confidence, first/last
+    observation time (microseconds since the epoch), observation count, the
+    UUID as two 64-bit halves, and name and category as indices into a table
+    of interned strings. Embeddings of the dominant dimension are rows of a
+    float64 matrix, so they read back exactly as stored. Anything else an
+    entity carries (tags, aliases, properties, other visual features, ...)
+    is kept in a sparse per-entity dict only when it is non-empty, so memory
+    per entity is a small constant plus what it actually stores.
+
+    Entities are materialized on demand with model_construct. While a caller
+    holds a materialized (or originally added) Entity, get() keeps returning
+    that same object; once it is no longer referenced it is rebuilt from the
+    columns on the next access. Changes made to an Entity are stored by
+    calling put() again.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Initialize an empty store.
+
+        Args:
+            initial_capacity: Embedding rows allocated up front (the matrix
+                doubles when full)
+        """
+        self._present = array("b")
+        self._uuid_hi = array("Q")
+        self._uuid_lo = array("Q")
+        self._type = array("b")
+        self._name = array("i")
+        self._category = array("i")  # -1 if unset
+        self._confidence = array("d")
+        self._first_observed = array("q")
+        self._last_observed = array("q")
+        self._observation_count = array("i")
+        self._embedding_row = array("i")  # -1 if not in the matrix
+        # (column, value of an empty slot)
+        self._columns = (
+            (self._present, 0), (self._uuid_hi, 0), (self._uuid_lo, 0), (self._type, 0),
+            (self._name, 0), (self._category, -1), (self._confidence, 0.0),
+            (self._first_observed, 0), (self._last_observed, 0),
+            (self._observation_count, 0), (self._embedding_row, -1),
+        )
+
+        # Interned names and categories
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+        # Embeddings of one dimension (fixed by the first embedding stored)
+        self._embedding_dim: Optional[int] = None
+        self._embeddings = np.zeros((0, 0), dtype=np.float64)
+        self._embedding_count = 0
+        self._free_embedding_rows: List[int] = []
+        self._initial_capacity = initial_capacity
+
+        # Non-default fields not covered by the columns, per entity
+        self._extras: Dict[int, Dict[str, Any]] = {}
+
+        self._live: "WeakValueDictionary[int, Entity]" = WeakValueDictionary()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entity_id: int) -> bool:
+        return 0 <= entity_id < len(self._present) and bool(self._present[entity_id])
+
+    def put(self, entity_id: int, entity: Entity) -> None:
+        """Store (or overwrite) the entity at an integer ID."""
+        while len(self._present) <= entity_id:
+            for column, empty in self._columns:
+                column.append(empty)
+        if not self._present[entity_id]:
+            self._count += 1
+        else:
+            self._release_embedding(entity_id)
+        self._present[entity_id] = 1
+
+        uuid_int = entity.id.int
+        self._uuid_hi[entity_id] = uuid_int >> 64
+        self._uuid_lo[entity_id] = uuid_int & 0xFFFFFFFFFFFFFFFF
+        self._type[entity_id] = ENTITY_CODES[entity.entity_type]
+        self._name[entity_id] = self._intern(entity.name)
+        category = entity.semantic.category
+        self._category[entity_id] = self._intern(category) if category is not None else -1
+        self._confidence[entity_id] = entity.confidence
+        self._observation_count[entity_id] = entity.observation_count
+
+        extras: Dict[str, Any] = {}
+        for column, field in (
+            (self._first_observed, "first_observed"),
+            (self._last_observed, "last_observed"),
+        ):
+            value = getattr(entity, field)
+            if value.tzinfo is None:
+                column[entity_id] = (value - _EPOCH) // _MICROSECOND
+            else:
+                extras[field] = value
+
+        semantic = self._non_empty(entity.semantic, _SEMANTIC_EXTRAS)
+        visual = self._non_empty(entity.visual, _VISUAL_EXTRAS)
+        embedding = entity.visual.embedding
+        if embedding is not None and not self._store_embedding(entity_id, embedding):
+            visual["embedding"] = list(embedding)
+        if semantic:
+            extras["semantic"] = semantic
+        if visual:
+            extras["visual"] = visual
+        if entity.source_devices:
+            extras["source_devices"] = set(entity.source_devices)
+        if entity.properties:
+            extras["properties"] = dict(entity.properties)
+
+        if extras:
+            self._extras[entity_id] = extras
+        else:
+            self._extras.pop(entity_id, None)
+        self._live[entity_id] = entity
+
+    def get(self, entity_id: int) -> Optional[Entity]:
+        """Get the entity at an integer ID, materializing it if needed."""
+        entity = self._live.get(entity_id)
+        if entity is not None:
+            return entity
+        if entity_id not in self:
+            return None
+        entity = self._materialize(entity_id)
+        self._live[entity_id] = entity
+        return entity
+
+    def remove(self, entity_id: int) -> None:
+        """Delete the entity at an integer ID."""
+        if entity_id not in self:
+            return
+        self._release_embedding(entity_id)
+        self._present[entity_id] = 0
+        self._extras.pop(entity_id, None)
+        self._live.pop(entity_id, None)
+        self._count -= 1
+
+    def ids(self) -> Iterator[int]:
+        """Iterate stored integer IDs in ascending order."""
+        return (i for i, present in enumerate(self._present) if present)
+
+    def name(self, entity_id: int) -> str:
+        """Get an entity's name without materializing it."""
+        return self._strings[self._name[entity_id]]
+
+    def type_code(self, entity_id: int) -> int:
+        """Get an entity's type code without materializing it."""
+        return self._type[entity_id]
+
+    def embedding(self, entity_id: int) -> Optional[np.ndarray]:
+        """Get an entity's embedding as a float64 row view, if it is in the matrix."""
+        row = self._embedding_row[entity_id]
+        return self._embeddings[row] if row >= 0 else None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the columns and the embedding matrix."""
+        columns = sum(column.itemsize * len(column) for column, _ in self._columns)
+        return columns + self._embeddings.nbytes
+
+    @staticmethod
+    def _non_empty(model: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+        """Copies of the fields of a model that are not at their empty default."""
+        values = {}
+        for field in fields:
+            value = getattr(model, field)
+            if not _is_empty(value):
+                values[field] = _copy(value)
+        return values
+
+    def _intern(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def _store_embedding(self, entity_id: int, embedding: List[float]) -> bool:
+        """Put an embedding in the matrix; False if its dimension does not fit."""
+        if self._embedding_dim is None:
+            self._embedding_dim = len(embedding)
+            self._embeddings = np.zeros(
+                (self._initial_capacity, self._embedding_dim), dtype=np.float64
+            )
+        if len(embedding) != self._embedding_dim:
+            return False
+
+        if self._free_embedding_rows:
+            row = self._free_embedding_rows.pop()
+        else:
+            row = self._embedding_count
+            self._embedding_count += 1
+            if row == len(self._embeddings):
+                grown = np.zeros((max(2 * row, 1), self._embedding_dim), dtype=np.float64)
+                grown[:row] = self._embeddings
+                self._embeddings = grown
+        self._embeddings[row] = embedding
+        self._embedding_row[entity_id] = row
+        return True
+
+    def _release_embedding(self, entity_id: int) -> None:
+        row = self._embedding_row[entity_id]
+        if row >= 0:
+            self._free_embedding_rows.append(row)
+            self._embedding_row[entity_id] = -1
+
+    def _materialize(self, entity_id: int) -> Entity:
+        """Build an Entity from the columns without validation."""
+        extras = self._extras.get(entity_id, {})
+
+        semantic = {f: _copy(v) for f, v in extras.get("semantic", {}).items()}
+        category = self._category[entity_id]
+        if category >= 0:
+            semantic["category"] = self._strings[category]
+        visual = {f: _copy(v) for f, v in extras.get("visual", {}).items()}
+        embedding = self.embedding(entity_id)
+        if embedding is not None:
+            visual["embedding"] = embedding.tolist()
+
+        first_observed = extras.get("first_observed")
+        if first_observed is None:
+            first_observed = _EPOCH + self._first_observed[entity_id] * _MICROSECOND
+        last_observed = extras.get("last_observed")
+        if last_observed is None:
+            last_observed = _EPOCH + self._last_observed[entity_id] * _MICROSECOND
+
+        return Entity.model_construct(
+            id=UUID(int=self._uuid_hi[entity_id] << 64 | self._uuid_lo[entity_id]),
+            entity_type=ENTITY_TYPES[self._type[entity_id]].value,
+            name=self._strings[self._name[entity_id]],
+            semantic=SemanticAttributes.model_construct(**semantic),
+            visual=VisualFeatures.model_construct(**visual),
+            first_observed=first_observed,
+            last_observed=last_observed,
+            observation_count=self._observation_count[entity_id],
+            source_devices=set(extras.get("source_devices", ())),
+            confidence=self._confidence[entity_id],
+            properties=dict(extras.get("properties", {})),
+        )
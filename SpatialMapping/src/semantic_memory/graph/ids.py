@@ -0,0 +1,65 @@
+"""Dense integer IDs for entities."""
+
+from typing import Dict, Iterator, List, Optional
+from uuid import UUID
+
+
+class IdMap:
+    """
+    Two-way mapping between entity UUIDs and dense integer IDs.
+
+    Integer IDs are small non-negative ints (they fit in int32) and are
+    reused after removal, so arrays indexed by them stay compact. All graph
+    indices work with these IDs; UUIDs only appear at the public API.
+    """
+
+    def __init__(self):
+        """Initialize an empty mapping."""
+        self._ids: Dict[UUID, int] = {}
+        self._uuids: List[Optional[UUID]] = []
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, uuid: UUID) -> bool:
+        return uuid in self._ids
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate assigned integer IDs in ascending order."""
+        return (i for i, uuid in enumerate(self._uuids) if uuid is not None)
+
+    @property
+    def capacity(self) -> int:
+        """One more than the largest integer ID ever assigned."""
+        return len(self._uuids)
+
+    def add(self, uuid: UUID) -> int:
+        """Assign an integer ID to a UUID (returns the existing one if assigned)."""
+        existing = self._ids.get(uuid)
+        if existing is not None:
+            return existing
+        if self._free:
+            i = self._free.pop()
+            self._uuids[i] = uuid
+        else:
+            i = len(self._uuids)
+            self._uuids.append(uuid)
+        self._ids[uuid] = i
+        return i
+
+    def get(self, uuid: UUID) -> Optional[int]:
+        """Get the integer ID of a UUID."""
+        return self._ids.get(uuid)
+
+    def uuid(self, i: int) -> UUID:
+        """Get the UUID of an integer ID."""
+        return self._uuids[i]
+
+    def remove(self, uuid: UUID) -> Optional[int]:
+        """Release the integer ID of a UUID for reuse."""
+        i = self._ids.pop(uuid, None)
+        if i is not None:
+            self._uuids[i] = None
+            self._free.append(i)
+        return i
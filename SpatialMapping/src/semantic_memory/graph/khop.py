@@ -0,0 +1,205 @@
+"""Vectorized multi-hop expansion over CSR adjacency."""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from semantic_memory.core.relationship import RELATION_CODES, Relationship
+
+
+class _CSRAdjacency:
+    """
+    Compressed sparse row adjacency for the relationships of one type mask.
+
+    Rows are the graph's integer entity IDs.
+    """
+
+    def __init__(self, relationships: Iterable[Tuple[int, int, Relationship]]):
+        sources: List[int] = []
+        targets: List[int] = []
+        self.relationships: List[Relationship] = []
+
+        for source, target, rel in relationships:
+            sources.append(source)
+            targets.append(target)
+            self.relationships.append(rel)
+
+        source_array = np.asarray(sources, dtype=np.int64)
+        target_array = np.asarray(targets, dtype=np.int64)
+        self.node_count = int(max(source_array.max(initial=-1), target_array.max(initial=-1))) + 1
+
+        # Stable sort keeps each node's edges in the order they were supplied
+        order = np.argsort(source_array, kind="stable")
+        self.edge_order = order
+        self.targets = target_array[order]
+        counts = np.bincount(source_array, minlength=self.node_count)
+        self.indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    def edges_from(self, frontier: np.ndarray) -> np.ndarray:
+        """Edge positions leaving the frontier nodes, in frontier order."""
+        starts = self.indptr[frontier]
+        lengths = self.indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(starts, lengths) + offsets
+
+    def relationship(self, edge: int) -> Relationship:
+        return self.relationships[self.edge_order[edge]]
+
+
+class KHopEngine:
+    """
+    Multi-hop neighbourhood expansion with one CSR adjacency per type mask.
+
+    Each hop gathers all edges leaving the frontier with array operations
+    and marks newly reached nodes in a boolean visited vector. Frontiers are
+    kept as ordered index arrays so results come out in the same order as a
+    breadth-first search that visits nodes in discovery order.
+
+    CSR structures are built on first use and dropped when a relationship of
+    a type in their mask changes. Rebuilding costs O(relationships), so
+    while a structure is stale, queries walk the adjacency hop by hop
+    (O(neighbourhood)) instead, and it is only rebuilt after rebuild_after
+    queries without an intervening change. Interleaved writes and reads
+    therefore never pay for a rebuild per write.
+    """
+
+    def __init__(
+        self,
+        relationships_for_mask: Callable[[int], Iterable[Tuple[int, int, Relationship]]],
+        adjacent: Callable[[int, int], Iterator[Tuple[int, Relationship]]],
+        rebuild_after: int = 16
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            relationships_for_mask: Returns (source, target, relationship) for all
+                relationships whose type is in a mask, each source's
+                relationships in traversal order
+            adjacent: Returns (target, relationship) for the relationships
+                with type in a mask leaving an entity, in traversal order
+            rebuild_after: Queries on a stale mask answered without CSR
+                before it is rebuilt
+        """
+        self._relationships_for_mask = relationships_for_mask
+        self._adjacent = adjacent
+        self.rebuild_after = rebuild_after
+        self._cache: Dict[int, _CSRAdjacency] = {}
+        self._stale: Dict[int, int] = {}  # mask -> queries since it was dropped
+
+    def relationship_changed(self, rel: Relationship) -> None:
+        """Drop cached adjacency affected by an added or removed relationship."""
+        bit = 1 << RELATION_CODES[rel.relation_type]
+        for mask in [mask for mask in self._cache if mask & bit]:
+            del self._cache[mask]
+            self._stale[mask] = 0
+        for mask in self._stale:
+            if mask & bit:
+                self._stale[mask] = 0
+
+    def expand(
+        self,
+        entity_id: int,
+        mask: int,
+        max_hops: int,
+        vectorize: bool = True
+    ) -> List[Tuple[int, Relationship]]:
+        """
+        Find entities reachable within max_hops along relationships in mask.
+
+        Returns every direct relationship of the entity, then for each
+        further hop the first relationship reaching each newly found entity.
+
+        Args:
+            entity_id: Starting entity
+            mask: Relationship types to follow
+            max_hops: Maximum graph distance
+            vectorize: If False, always walk the adjacency hop by hop
+
+        Returns:
+            List of (target entity ID, relationship) tuples
+        """
+        csr = self._csr(mask) if vectorize else None
+        if csr is None:
+            return list(self._walk(entity_id, mask, max_hops))
+        edges = self._expand(csr, entity_id, max_hops)
+        return [
+            (target, csr.relationship(edge))
+            for edge, target in zip(edges.tolist(), csr.targets[edges].tolist())
+        ]
+
+    def count(self, entity_id: int, mask: int, max_hops: int) -> int:
+        """Count the results expand() would return without materializing them."""
+        csr = self._csr(mask)
+        if csr is None:
+            return sum(1 for _ in self._walk(entity_id, mask, max_hops))
+        return len(self._expand(csr, entity_id, max_hops))
+
+    def _csr(self, mask: int) -> Optional[_CSRAdjacency]:
+        """CSR adjacency for a mask, or None while it is stale and not due for a rebuild."""
+        csr = self._cache.get(mask)
+        if csr is None:
+            stale_queries = self._stale.get(mask)
+            if stale_queries is not None and stale_queries < self.rebuild_after:
+                self._stale[mask] = stale_queries + 1
+                return None
+            self._stale.pop(mask, None)
+            csr = self._cache[mask] = _CSRAdjacency(self._relationships_for_mask(mask))
+        return csr
+
+    def _walk(self, entity_id: int, mask: int, max_hops: int) -> Iterator[Tuple[int, Relationship]]:
+        """Breadth-first expansion over the adjacency, in the same order as _expand()."""
+        if max_hops < 1:
+            return
+        visited: Set[int] = {entity_id}
+        frontier: List[int] = []
+        for target, rel in self._adjacent(entity_id, mask):
+            yield target, rel
+            if target not in visited:
+                visited.add(target)
+                frontier.append(target)
+
+        for _ in range(max_hops - 1):
+            next_frontier: List[int] = []
+            for node in frontier:
+                for target, rel in self._adjacent(node, mask):
+                    if target not in visited:
+                        visited.add(target)
+                        next_frontier.append(target)
+                        yield target, rel
+            frontier = next_frontier
+
+    def _expand(self, csr: _CSRAdjacency, entity_id: int, max_hops: int) -> np.ndarray:
+        if not 0 <= entity_id < csr.node_count or max_hops < 1:
+            return np.empty(0, dtype=np.int64)
+
+        visited = np.zeros(csr.node_count, dtype=bool)
+        visited[entity_id] = True
+
+        # Direct relationships are all reported, including parallel ones
+        direct = csr.edges_from(np.array([entity_id]))
+        levels = [direct]
+        frontier = self._first_unvisited(csr.targets[direct], visited)[1]
+        visited[frontier] = True
+
+        for _ in range(max_hops - 1):
+            if not len(frontier):
+                break
+            edges = csr.edges_from(frontier)
+            positions, frontier = self._first_unvisited(csr.targets[edges], visited)
+            visited[frontier] = True
+            levels.append(edges[positions])
+
+        return np.concatenate(levels)
+
+    @staticmethod
+    def _first_unvisited(targets: np.ndarray, visited: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and IDs of the first occurrence of each unvisited target, in order."""
+        fresh = np.flatnonzero(~visited[targets])
+        _, first = np.unique(targets[fresh], return_index=True)
+        positions = fresh[np.sort(first)]
+        return positions, targets[positions]
@@ -0,0 +1,31 @@
+"""Observers of SemanticGraph mutations."""
+
+from uuid import UUID
+
+from semantic_memory.core.entity import Entity
+from semantic_memory.core.relationship import Relationship
+
+
+class MutationListener:
+    """
+    Receives every change made to a SemanticGraph, after it is applied.
+
+    Changes are reported as their effect rather than the call that caused
+    them: adding or merging an entity reports the entity's full new state,
+    and removing an entity first reports the removal of each attached
+    relationship. Applying the reported changes in order to a copy of the
+    graph therefore reproduces it exactly. Subclasses override the hooks
+    they need.
+    """
+
+    def entity_stored(self, entity: Entity) -> None:
+        """An entity was inserted, or merged with an observation."""
+
+    def entity_removed(self, entity_id: UUID) -> None:
+        """An entity was removed."""
+
+    def relationship_stored(self, relationship: Relationship) -> None:
+        """A relationship was inserted, or merged with an observation."""
+
+    def relationship_removed(self, relationship_id: UUID) -> None:
+        """A relationship was removed."""
@@ -0,0 +1,228 @@
+"""Path finding over filtered relationship adjacency."""
+
+import heapq
+from collections import OrderedDict
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from semantic_memory.core.relationship import RELATION_CODES, Relationship
+
+
+def relationship_weight(rel: Relationship, default: float = 1.0) -> float:
+    """Traversal cost of a relationship: its estimated distance in meters, if known."""
+    if rel.spatial is not None and rel.spatial.distance_meters is not None:
+        return max(rel.spatial.distance_meters, 0.0)
+    return default
+
+
+class _FilteredAdjacency:
+    """Forward and reverse adjacency restricted to a set of relationship types."""
+
+    def __init__(self, default_weight: float):
+        self.default_weight = default_weight
+        # entity -> neighbour -> lowest weight among parallel relationships
+        self.forward: Dict[int, Dict[int, float]] = {}
+        self.reverse: Dict[int, Dict[int, float]] = {}
+
+    def add(self, source: int, target: int, rel: Relationship) -> None:
+        weight = relationship_weight(rel, self.default_weight)
+        for index, u, v in (
+            (self.forward, source, target),
+            (self.reverse, target, source),
+        ):
+            neighbours = index.setdefault(u, {})
+            if weight < neighbours.get(v, float("inf")):
+                neighbours[v] = weight
+
+    def set_pair(self, source: int, target: int, weight: Optional[float]) -> None:
+        """Overwrite (or with None, drop) the edge between a pair."""
+        for index, u, v in (
+            (self.forward, source, target),
+            (self.reverse, target, source),
+        ):
+            if weight is None:
+                neighbours = index.get(u)
+                if neighbours is not None:
+                    neighbours.pop(v, None)
+                    if not neighbours:
+                        del index[u]
+            else:
+                index.setdefault(u, {})[v] = weight
+
+
+class PathEngine:
+    """
+    Shortest-path queries with cached per-type-mask adjacency.
+
+    Adjacency restricted to a relationship type mask is built on first use
+    and then kept up to date incrementally; the least recently used masks
+    are dropped beyond ``max_cached_masks``. Unweighted queries run a
+    bidirectional BFS, weighted ones Dijkstra (or A* with a heuristic).
+    Entities are identified by their integer graph IDs.
+    """
+
+    def __init__(
+        self,
+        relationships_for_mask: Callable[[int], Iterable[Tuple[int, int, Relationship]]],
+        pair_relationships: Callable[[int, int, int], Iterable[Relationship]],
+        default_weight: float = 1.0,
+        max_cached_masks: int = 8
+    ):
+        """
+        Initialize the path engine.
+
+        Args:
+            relationships_for_mask: Returns (source, target, relationship) for all
+                relationships whose type is in a mask
+            pair_relationships: Returns relationships from source to target within a mask
+            default_weight: Weight of relationships without a distance estimate
+            max_cached_masks: Number of filtered adjacencies kept in memory
+        """
+        self._relationships_for_mask = relationships_for_mask
+        self._pair_relationships = pair_relationships
+        self.default_weight = default_weight
+        self.max_cached_masks = max_cached_masks
+        self._cache: "OrderedDict[int, _FilteredAdjacency]" = OrderedDict()
+
+    def relationship_added(self, rel: Relationship, source: int, target: int) -> None:
+        """Add a new relationship to every cached adjacency that includes its type."""
+        bit = 1 << RELATION_CODES[rel.relation_type]
+        for mask, adjacency in self._cache.items():
+            if mask & bit:
+                adjacency.add(source, target, rel)
+
+    def relationship_removed(self, rel: Relationship, source: int, target: int) -> None:
+        """Update cached adjacencies after a relationship was removed from the graph."""
+        bit = 1 << RELATION_CODES[rel.relation_type]
+        for mask, adjacency in self._cache.items():
+            if mask & bit:
+                remaining = [
+                    relationship_weight(other, self.default_weight)
+                    for other in self._pair_relationships(source, target, mask)
+                ]
+                adjacency.set_pair(source, target, min(remaining, default=None))
+
+    def shortest_path(self, source_id: int, target_id: int, mask: int) -> Optional[List[int]]:
+        """
+        Find a path with the fewest hops using bidirectional BFS.
+
+        Returns:
+            Entity IDs from source to target, or None if unreachable
+        """
+        if source_id == target_id:
+            return [source_id]
+
+        adjacency = self._adjacency(mask)
+        forward_parents: Dict[int, Optional[int]] = {source_id: None}
+        backward_parents: Dict[int, Optional[int]] = {target_id: None}
+        forward_frontier = [source_id]
+        backward_frontier = [target_id]
+
+        while forward_frontier and backward_frontier:
+            # Expand whichever side has the smaller frontier, one full level at a time
+            if len(forward_frontier) <= len(backward_frontier):
+                meeting, forward_frontier = self._expand_level(
+                    forward_frontier, adjacency.forward, forward_parents, backward_parents
+                )
+            else:
+                meeting, backward_frontier = self._expand_level(
+                    backward_frontier, adjacency.reverse, backward_parents, forward_parents
+                )
+            if meeting is not None:
+                return self._join(meeting, forward_parents, backward_parents)
+
+        return None
+
+    def weighted_path(
+        self,
+        source_id: int,
+        target_id: int,
+        mask: int,
+        heuristic: Optional[Callable[[int], float]] = None
+    ) -> Optional[Tuple[List[int], float]]:
+        """
+        Find the lowest-cost path, weighting edges by distance_meters.
+
+        Runs A* when an admissible heuristic (lower bound on the remaining
+        cost) is given, otherwise Dijkstra.
+
+        Returns:
+            Tuple of (entity IDs from source to target, total cost), or None
+        """
+        adjacency = self._adjacency(mask)
+        tie = count()
+        best: Dict[int, float] = {source_id: 0.0}
+        parents: Dict[int, Optional[int]] = {source_id: None}
+        estimate = heuristic(source_id) if heuristic else 0.0
+        queue = [(estimate, next(tie), 0.0, source_id)]
+        done = set()
+
+        while queue:
+            _, _, cost, node = heapq.heappop(queue)
+            if node in done:
+                continue
+            if node == target_id:
+                path = [node]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return list(reversed(path)), cost
+            done.add(node)
+
+            for neighbour, weight in adjacency.forward.get(node, {}).items():
+                new_cost = cost + weight
+                if neighbour not in done and new_cost < best.get(neighbour, float("inf")):
+                    best[neighbour] = new_cost
+                    parents[neighbour] = node
+                    estimate = new_cost + (heuristic(neighbour) if heuristic else 0.0)
+                    heapq.heappush(queue, (estimate, next(tie), new_cost, neighbour))
+
+        return None
+
+    def _adjacency(self, mask: int) -> _FilteredAdjacency:
+        adjacency = self._cache.get(mask)
+        if adjacency is not None:
+            self._cache.move_to_end(mask)
+            return adjacency
+
+        adjacency = _FilteredAdjacency(self.default_weight)
+        for source, target, rel in self._relationships_for_mask(mask):
+            adjacency.add(source, target, rel)
+        self._cache[mask] = adjacency
+        while len(self._cache) > self.max_cached_masks:
+            self._cache.popitem(last=False)
+        return adjacency
+
+    @staticmethod
+    def _expand_level(
+        frontier: List[int],
+        neighbours_of: Dict[int, Dict[int, float]],
+        parents: Dict[int, Optional[int]],
+        other_parents: Dict[int, Optional[int]]
+    ) -> Tuple[Optional[int], List[int]]:
+        """Expand one BFS level; return a node reached from both sides, if any."""
+        next_frontier = []
+        for node in frontier:
+            for neighbour in neighbours_of.get(node, ()):
+                if neighbour in parents:
+                    continue
+                parents[neighbour] = node
+                if neighbour in other_parents:
+                    return neighbour, next_frontier
+                next_frontier.append(neighbour)
+        return None, next_frontier
+
+    @staticmethod
+    def _join(
+        meeting: int,
+        forward_parents: Dict[int, Optional[int]],
+        backward_parents: Dict[int, Optional[int]]
+    ) -> List[int]:
+        path = [meeting]
+        while forward_parents[path[-1]] is not None:
+            path.append(forward_parents[path[-1]])
+        path.reverse()
+        node = backward_parents[meeting]
+        while node is not None:
+            path.append(node)
+            node = backward_parents[node]
+        return path
@@ -0,0 +1,120 @@
+"""LRU cache for versioned query results."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Sentinel returned by QueryCache.get on a miss (None is a valid cached result)
+MISS = object()
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results tagged with version stamps.
+
+    Each entry stores the graph version it was computed at and the
+    dependencies it read. On lookup, a caller-supplied validator decides
+    whether any dependency has changed since; stale entries are dropped
+    and counted as misses.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries before the least recently
+                used one is evicted
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, is_valid: Callable[[int, Any], bool]) -> Any:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Query key
+            is_valid: Called with (version, dependencies) of the entry;
+                returns False if the entry is stale
+
+        Returns:
+            The cached value, or MISS
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, version, dependencies = entry
+            if is_valid(version, dependencies):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        return MISS
+
+    def put(self, key: Hashable, value: Any, version: int, dependencies: Any = None) -> None:
+        """Store a result computed at the given graph version."""
+        self._entries[key] = (value, version, dependencies)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def lookup(
+        self,
+        key: Hashable,
+        is_valid: Callable[[int, Any], bool],
+        compute: Callable[[], Tuple[Any, Any]],
+        version: int
+    ) -> Tuple[Any, bool]:
+        """
+        Return a cached result or compute and store it.
+
+        Args:
+            key: Query key
+            is_valid: Entry validator, see get()
+            compute: Returns (value, dependencies) on a miss
+            version: Current graph version, recorded with a new entry
+
+        Returns:
+            Tuple of (value, whether it came from the cache)
+        """
+        value = self.get(key, is_valid)
+        if value is not MISS:
+            return value, True
+        value, dependencies = compute()
+        self.put(key, value, version, dependencies)
+        return value, False
+
+
+def copy_result(value: Optional[Any]) -> Optional[Any]:
+    """Shallow-copy a cached result so callers cannot mutate the cached one."""
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return {k: list(v) if isinstance(v, list) else v for k, v in value.items()}
+    return value
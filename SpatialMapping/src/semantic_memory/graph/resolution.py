@@ -0,0 +1,150 @@
+"""Entity resolution: candidate lookup and deduplication of observed entities."""
+
+from typing import AbstractSet, Dict, FrozenSet, List, Set, Tuple
+
+import numpy as np
+
+from semantic_memory.core.entity import Entity, EntityType
+from semantic_memory.graph.vector_index import normalize_vector
+
+_NO_KEYS: FrozenSet[int] = frozenset()
+
+
+class MatchIndex:
+    """
+    Inverted indices of entities that may match by alias or tags.
+
+    Entity.matches() accepts an entity that shares a name or alias, or whose
+    tags overlap by a Jaccard similarity above 0.5. Entities are indexed by
+    an integer key under their type and each lowercased name and alias and
+    each tag, so these candidates are found without comparing every entity
+    of the type. Embedding similarity is left to the vector index.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._names: Dict[Tuple[EntityType, str], Set[int]] = {}
+        self._tags: Dict[Tuple[EntityType, str], Set[int]] = {}
+        # key -> (type, names, tags) it is indexed under
+        self._indexed: Dict[int, Tuple[EntityType, FrozenSet[str], FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def add(self, key: int, entity: Entity) -> None:
+        """Index an entity, replacing whatever was indexed under its key."""
+        self.remove(key)
+        names = frozenset(
+            [entity.name.lower()] + [alias.lower() for alias in entity.semantic.aliases]
+        )
+        tags = frozenset(entity.semantic.tags)
+        self._indexed[key] = (entity.entity_type, names, tags)
+        for postings, terms in ((self._names, names), (self._tags, tags)):
+            for term in terms:
+                postings.setdefault((entity.entity_type, term), set()).add(key)
+
+    def remove(self, key: int) -> None:
+        """Stop indexing the entity under a key, if any."""
+        indexed = self._indexed.pop(key, None)
+        if indexed is None:
+            return
+        entity_type, names, tags = indexed
+        for postings, terms in ((self._names, names), (self._tags, tags)):
+            for term in terms:
+                keys = postings[(entity_type, term)]
+                keys.discard(key)
+                if not keys:
+                    del postings[(entity_type, term)]
+
+    def candidates(self, entity: Entity) -> List[int]:
+        """
+        Keys of entities of the same type that may match by alias or tags.
+
+        Returns:
+            Keys of indexed entities sharing a name or alias with entity,
+            or enough of its tags for a tag match, in ascending order
+        """
+        entity_type = entity.entity_type
+        found: Set[int] = set()
+        for name in [entity.name.lower()] + [alias.lower() for alias in entity.semantic.aliases]:
+            found.update(self._names.get((entity_type, name), _NO_KEYS))
+
+        tags = entity.semantic.tags
+        if tags:
+            # A tag match shares more than half of the tags, so it shares
+            # one of any ceil(n / 2) of them: look up the rarest
+            postings: List[AbstractSet[int]] = sorted(
+                (self._tags.get((entity_type, tag), _NO_KEYS) for tag in tags), key=len
+            )
+            for keys in postings[:(len(postings) + 1) // 2]:
+                found.update(keys)
+        return sorted(found)
+
+
+def deduplicate_entities(entities: List[Entity], match_candidates: int = 8) -> List[int]:
+    """
+    Group entities in a batch that describe the same physical object.
+
+    Entities are matched with Entity.matches against earlier entities of the
+    batch with the same name. Entities with an embedding are then matched
+    against the match_candidates most similar earlier ones by embedding,
+    and against earlier ones of the same type sharing an alias or tags (see
+    MatchIndex). Needs no graph, so it can run in any thread or process.
+
+    Args:
+        entities: Entities of the batch, in order
+        match_candidates: Most similar earlier entities checked per entity
+
+    Returns:
+        For each entity, the index of the first batch entity it matches
+        (its own index if it matches none before it)
+    """
+    owners = list(range(len(entities)))
+    reps_by_name: Dict[str, List[int]] = {}
+    reps_by_terms = MatchIndex()
+
+    # Pairwise embedding similarities per entity type, one product per type
+    similarities: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    by_key: Dict[Tuple[EntityType, int], List[Tuple[int, np.ndarray]]] = {}
+    for i, entity in enumerate(entities):
+        if entity.visual.embedding:
+            unit = normalize_vector(entity.visual.embedding)
+            if unit is not None:
+                by_key.setdefault((entity.entity_type, unit.shape[0]), []).append((i, unit))
+    for members in by_key.values():
+        positions = np.array([i for i, _ in members])
+        units = np.stack([unit for _, unit in members])
+        scores = units @ units.T
+        for row, i in enumerate(positions):
+            similarities[int(i)] = (positions, scores[row])
+
+    is_rep = np.zeros(len(entities), dtype=bool)
+    for i, entity in enumerate(entities):
+        name_lower = entity.name.lower()
+        for rep in reps_by_name.get(name_lower, []):
+            if entities[rep].matches(entity):
+                owners[i] = rep
+                break
+
+        if owners[i] == i and i in similarities:
+            positions, scores = similarities[i]
+            earlier = np.flatnonzero((positions < i) & is_rep[positions])
+            earlier = earlier[np.argsort(-scores[earlier], kind="stable")]
+            for col in earlier[:match_candidates]:
+                rep = int(positions[col])
+                if entities[rep].matches(entity):
+                    owners[i] = rep
+                    break
+
+        if owners[i] == i and entity.visual.embedding:
+            for rep in reps_by_terms.candidates(entity):
+                if entities[rep].matches(entity):
+                    owners[i] = rep
+                    break
+
+        if owners[i] == i:
+            is_rep[i] = True
+            reps_by_name.setdefault(name_lower, []).append(i)
+            reps_by_terms.add(i, entity)
+
+    return owners
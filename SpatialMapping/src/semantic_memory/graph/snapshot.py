@@ -0,0 +1,224 @@
+"""Binary graph snapshots with memory-mapped vectors."""
+
+import json
+import os
+import struct
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from semantic_memory.core.entity import Entity
+from semantic_memory.core.relationship import Relationship
+
+MAGIC = b"SMGRAPH\x00"
+FORMAT_VERSION = 1
+
+# Visual features stored in the float32 block instead of the records
+VECTOR_FIELDS = ("embedding", "color_histogram", "texture_features")
+
+# magic, format version, vector block offset, vector count (floats),
+# records offset, records length (bytes)
+_PREAMBLE = struct.Struct("<8sIQQQQ")
+_ALIGNMENT = 64
+
+
+class MappedVector(Sequence):
+    """
+    Read-only float vector backed by a slice of a snapshot's float32 block.
+
+    Nothing is read from disk until the values are used; the OS pages them
+    in on demand. Behaves like a list of floats for reading (len, indexing,
+    iteration, comparison, np.asarray). To change a vector, assign a new
+    list to the field. Copies and pickles become plain lists.
+    """
+
+    __slots__ = ("block", "offset", "_length")
+
+    def __init__(self, block: np.ndarray, offset: int, length: int):
+        """
+        Initialize a view.
+
+        Args:
+            block: The snapshot's 1-D float32 array (usually an np.memmap)
+            offset: Index of the first value in block
+            length: Number of values
+        """
+        self.block = block
+        self.offset = offset
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        return self.view()[index].tolist()
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.tolist())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Sequence, np.ndarray)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        view = self.view()
+        return view if dtype is None else view.astype(dtype, copy=False)
+
+    def __reduce__(self):
+        return list, (self.tolist(),)
+
+    def __repr__(self) -> str:
+        return f"MappedVector({self.tolist()!r})"
+
+    def view(self) -> np.ndarray:
+        """The values as a float32 array view (no copy)."""
+        return self.block[self.offset:self.offset + self._length]
+
+    def tolist(self) -> List[float]:
+        """Copy the values into a list."""
+        return self.view().tolist()
+
+    @staticmethod
+    def stack(vectors: List["MappedVector"]) -> np.ndarray:
+        """
+        Gather equal-length vectors from one block into a 2-D array.
+
+        Uses a single fancy-indexing read instead of one copy per vector.
+        The result is a copy in memory, not a view of the block.
+        """
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        offsets = np.fromiter((v.offset for v in vectors), dtype=np.int64, count=len(vectors))
+        return vectors[0].block[offsets[:, None] + np.arange(len(vectors[0]))]
+
+
+def write_snapshot(
+    path: str,
+    entities: Iterable[Entity],
+    relationships: Iterable[Relationship],
+    header: Dict[str, Any]
+) -> None:
+    """
+    Write a binary snapshot.
+
+    Layout: a fixed preamble, the float32 vector block (aligned to 64
+    bytes), then the records as compact JSON. Vector fields of entities are
+    written to the block and replaced in their records by (offset, length)
+    references. The file is written next to path and moved into place, so
+    readers never see a partial snapshot; if writing fails, the partial
+    file is removed.
+
+    Args:
+        path: File to write
+        entities: Entities to store
+        relationships: Relationships to store
+        header: JSON-compatible graph-level data (vector index, metadata)
+    """
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "wb") as fp:
+            fp.write(b"\0" * _ALIGNMENT)
+            vector_count = 0
+            entity_records = []
+            for entity in entities:
+                record = entity.to_dict(trusted=True)
+                visual = record["visual"]
+                refs = {}
+                for field in VECTOR_FIELDS:
+                    values = visual[field]
+                    if values is None:
+                        continue
+                    fp.write(np.asarray(values, dtype="<f4").tobytes())
+                    refs[field] = (vector_count, len(values))
+                    vector_count += len(values)
+                    visual[field] = None
+                if refs:
+                    record["vectors"] = refs
+                entity_records.append(record)
+
+            records = json.dumps({
+                "header": header,
+                "entities": entity_records,
+                "relationships": [rel.to_dict(trusted=True) for rel in relationships],
+            }, separators=(",", ":")).encode("utf-8")
+            records_offset = _ALIGNMENT + 4 * vector_count
+            fp.write(records)
+
+            fp.seek(0)
+            fp.write(_PREAMBLE.pack(
+                MAGIC, FORMAT_VERSION, _ALIGNMENT, vector_count, records_offset, len(records)
+            ))
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class Snapshot:
+    """
+    An opened binary snapshot.
+
+    The records are parsed when the snapshot is opened; the vector block is
+    memory-mapped read-only and only read as vectors are used.
+
+    Only the vectors are lazy. Opening parses the whole records section and
+    entities() decodes every record, so the cost of opening grows with the
+    number of entities and relationships (about 1.4s for 20k entities),
+    whatever the size of their vectors.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a snapshot written by write_snapshot().
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        with open(path, "rb") as fp:
+            preamble = fp.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                raise ValueError(f"{path} is not a graph snapshot")
+            magic, version, vectors_offset, vector_count, records_offset, records_length = \
+                _PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a graph snapshot")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot format version: {version}")
+            fp.seek(records_offset)
+            records = json.loads(fp.read(records_length))
+
+        if vector_count:
+            self.vectors: np.ndarray = np.memmap(
+                path, dtype="<f4", mode="r", offset=vectors_offset, shape=(vector_count,)
+            )
+        else:
+            self.vectors = np.zeros(0, dtype=np.float32)
+        self.header: Dict[str, Any] = records["header"]
+        self._entities: List[Dict[str, Any]] = records["entities"]
+        self._relationships: List[Dict[str, Any]] = records["relationships"]
+
+    def entities(self) -> Iterator[Entity]:
+        """Decode the entities; their vector fields are MappedVectors."""
+        vectors = self.vectors
+        for record in self._entities:
+            refs: Optional[Dict[str, Tuple[int, int]]] = record.get("vectors")
+            entity = Entity.from_dict(record, trusted=True)
+            if refs:
+                visual = entity.visual.__dict__
+                for field, (offset, length) in refs.items():
+                    visual[field] = MappedVector(vectors, offset, length)
+            yield entity
+
+    def relationships(self) -> Iterator[Relationship]:
+        """Decode the relationships."""
+        for record in self._relationships:
+            yield Relationship.from_dict(record, trusted=True)
@@ -0,0 +1,412 @@
+"""SQLite-backed persistent storage for SemanticGraph."""
+
+import json
+import sqlite3
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from semantic_memory.core.entity import ENTITY_CODES, Entity
+from semantic_memory.core.relationship import RELATION_CODES, Relationship, mask_codes
+from semantic_memory.graph.backends import GraphBackend
+from semantic_memory.graph.ids import IdMap
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    uuid BLOB NOT NULL UNIQUE,
+    type INTEGER NOT NULL,
+    name_lower TEXT NOT NULL,
+    embedding BLOB,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entities_by_type ON entities (type);
+CREATE INDEX IF NOT EXISTS entities_by_name ON entities (name_lower);
+
+CREATE TABLE IF NOT EXISTS relationships (
+    row INTEGER PRIMARY KEY,
+    uuid BLOB NOT NULL UNIQUE,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS relationships_out ON relationships (source, type, row);
+CREATE INDEX IF NOT EXISTS relationships_in ON relationships (target, type, row);
+CREATE INDEX IF NOT EXISTS relationships_by_key ON relationships (source, target, type, row);
+"""
+
+
+# Rows read per statement by full scans
+_BATCH_SIZE = 1024
+
+
+@lru_cache(maxsize=None)
+def _in_codes(mask: int) -> str:
+    """SQL list of the type codes in a mask, e.g. "(0,3,5)"."""
+    return "(" + ",".join(str(code) for code in mask_codes(mask)) + ")"
+
+
+def _encode_embedding(embedding: Optional[Sequence[float]]) -> Optional[bytes]:
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype="<f8").tobytes()
+
+
+def _decode_embedding(blob: Optional[bytes]) -> Optional[list]:
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype="<f8").tolist()
+
+
+class SQLiteIdMap(IdMap):
+    """
+    IdMap backed by the entities table of a SQLite database.
+
+    Integer IDs are the table's primary keys, so they survive restarts.
+    New entities get IDs above every ID assigned so far; IDs of removed
+    entities are not reused.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """Initialize the mapping from the rows already in the database."""
+        super().__init__()
+        self._connection = connection
+        self._pending: Dict[UUID, int] = {}  # assigned, row not written yet
+        count, max_id = connection.execute("SELECT count(*), max(id) FROM entities").fetchone()
+        self._count = count
+        self._next_id = max_id + 1 if max_id is not None else 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, uuid: UUID) -> bool:
+        return self.get(uuid) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (row[0] for row in self._connection.execute("SELECT id FROM entities ORDER BY id"))
+
+    @property
+    def capacity(self) -> int:
+        return self._next_id
+
+    def add(self, uuid: UUID) -> int:
+        existing = self.get(uuid)
+        if existing is not None:
+            return existing
+        i = self._pending[uuid] = self._next_id
+        self._next_id += 1
+        self._count += 1
+        return i
+
+    def get(self, uuid: UUID) -> Optional[int]:
+        row = self._connection.execute(
+            "SELECT id FROM entities WHERE uuid = ?", (uuid.bytes,)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        return self._pending.get(uuid)
+
+    def uuid(self, i: int) -> UUID:
+        row = self._connection.execute("SELECT uuid FROM entities WHERE id = ?", (i,)).fetchone()
+        return UUID(bytes=row[0])
+
+    def remove(self, uuid: UUID) -> Optional[int]:
+        i = self.get(uuid)
+        if i is not None:
+            self._count -= 1
+        return i
+
+    def written(self, uuid: UUID) -> None:
+        """Forget the pending assignment once the entity's row exists."""
+        self._pending.pop(uuid, None)
+
+
+class SQLiteBackend(GraphBackend):
+    """
+    Persistent backend storing entities and relationships in SQLite.
+
+    Each entity is one row holding its integer ID, UUID, type code,
+    lowercased name, embedding (raw float64) and the rest of the record as
+    JSON; relationships are rows with their endpoints and type code.
+    Indices on type, name, (source, type), (target, type) and (source,
+    target, type) serve the graph's lookups and adjacency, so only the
+    rows a query touches are read.
+
+    Recently used entities and relationships are kept in LRU caches of
+    ``cache_size`` objects each; anything else is loaded on demand. Full
+    scans (entities(), relationships(), ...) read _BATCH_SIZE rows at a
+    time. Writes go into an open transaction: call commit() to make them
+    durable, and close() when done. Opening a SemanticGraph on an existing database rebuilds its
+    in-memory indices (statistics, containment, embeddings) from the
+    compact columns, without decoding entity records.
+    """
+
+    def __init__(self, path: str = ":memory:", cache_size: int = 10000):
+        """
+        Open (or create) a database.
+
+        Args:
+            path: Database file (default: a private in-memory database)
+            cache_size: Maximum number of entities (and of relationships)
+                kept in memory
+        """
+        super().__init__()
+        self.path = path
+        self.cache_size = cache_size
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self.ids = SQLiteIdMap(self._connection)
+        self._cache: "OrderedDict[int, Entity]" = OrderedDict()
+        self._relationship_cache: "OrderedDict[bytes, Relationship]" = OrderedDict()
+        self._relationship_count = self._connection.execute(
+            "SELECT count(*) FROM relationships"
+        ).fetchone()[0]
+
+    def commit(self) -> None:
+        """Make all changes so far durable."""
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self) -> "SQLiteBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Entities
+
+    def add_entity(self, entity: Entity) -> int:
+        entity_id = self.ids.add(entity.id)
+        self._connection.execute(
+            "INSERT INTO entities (id, uuid, type, name_lower, embedding, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                entity_id,
+                entity.id.bytes,
+                ENTITY_CODES[entity.entity_type],
+                entity.name.lower(),
+                _encode_embedding(entity.visual.embedding),
+                self._entity_json(entity),
+            ),
+        )
+        self.ids.written(entity.id)
+        self._cache_entity(entity_id, entity)
+        return entity_id
+
+    def update_entity(self, entity_id: int, entity: Entity) -> None:
+        self._connection.execute(
+            "UPDATE entities SET embedding = ?, data = ? WHERE id = ?",
+            (_encode_embedding(entity.visual.embedding), self._entity_json(entity), entity_id),
+        )
+        self._cache_entity(entity_id, entity)
+
+    def remove_entity(self, entity_id: int) -> Optional[Entity]:
+        entity = self.get_entity(entity_id)
+        if entity is None:
+            return None
+        self.ids.remove(entity.id)
+        self._connection.execute("DELETE FROM entities WHERE id = ?", (entity_id,))
+        self._cache.pop(entity_id, None)
+        return entity
+
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        entity = self._cache.get(entity_id)
+        if entity is not None:
+            self._cache.move_to_end(entity_id)
+            return entity
+        row = self._connection.execute(
+            "SELECT id, embedding, data FROM entities WHERE id = ?", (entity_id,)
+        ).fetchone()
+        return self._load_entity(row) if row is not None else None
+
+    def entities(self) -> Iterator[Entity]:
+        return self._query_entities("")
+
+    def entities_by_type(self, type_code: int) -> Iterator[Entity]:
+        return self._query_entities("type = ?", (type_code,))
+
+    def entities_by_name(self, name_lower: str) -> Iterator[Entity]:
+        return self._query_entities("name_lower = ?", (name_lower,))
+
+    def entity_count(self) -> int:
+        return len(self.ids)
+
+    def entity_summaries(self) -> Iterator[Tuple[int, UUID, int, Optional[Sequence[float]]]]:
+        for entity_id, uuid, type_code, embedding in self._connection.execute(
+            "SELECT id, uuid, type, embedding FROM entities ORDER BY id"
+        ):
+            vector = np.frombuffer(embedding, dtype="<f8") if embedding is not None else None
+            yield entity_id, UUID(bytes=uuid), type_code, vector
+
+    # Relationships
+
+    def add_relationship(self, rel: Relationship, source: int, target: int) -> None:
+        self._connection.execute(
+            "INSERT INTO relationships (uuid, source, target, type, data) VALUES (?, ?, ?, ?, ?)",
+            (rel.id.bytes, source, target, RELATION_CODES[rel.relation_type], self._json(rel)),
+        )
+        self._relationship_count += 1
+        self._cache_relationship(rel.id.bytes, rel)
+
+    def update_relationship(self, rel: Relationship) -> None:
+        self._connection.execute(
+            "UPDATE relationships SET data = ? WHERE uuid = ?", (self._json(rel), rel.id.bytes)
+        )
+        self._cache_relationship(rel.id.bytes, rel)
+
+    def remove_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        rel = self.get_relationship(relationship_id)
+        if rel is None:
+            return None
+        self._connection.execute(
+            "DELETE FROM relationships WHERE uuid = ?", (relationship_id.bytes,)
+        )
+        self._relationship_count -= 1
+        self._relationship_cache.pop(relationship_id.bytes, None)
+        return rel
+
+    def get_relationship(self, relationship_id: UUID) -> Optional[Relationship]:
+        key = relationship_id.bytes
+        rel = self._relationship_cache.get(key)
+        if rel is not None:
+            self._relationship_cache.move_to_end(key)
+            return rel
+        row = self._connection.execute(
+            "SELECT data FROM relationships WHERE uuid = ?", (key,)
+        ).fetchone()
+        return self._relationship(key, row[0]) if row is not None else None
+
+    def relationships(self) -> Iterator[Relationship]:
+        for _, key, data in self._paged("uuid, data", "relationships", "", (), ("row",)):
+            yield self._relationship(key, data)
+
+    def relationship_count(self) -> int:
+        return self._relationship_count
+
+    def find_relationship(self, source: int, target: int, type_code: int) -> Optional[Relationship]:
+        row = self._connection.execute(
+            "SELECT uuid, data FROM relationships WHERE source = ? AND target = ? AND type = ? "
+            "ORDER BY row LIMIT 1",
+            (source, target, type_code),
+        ).fetchone()
+        return self._relationship(*row) if row is not None else None
+
+    def outgoing(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        return self._adjacent("source", "target", entity_id, mask)
+
+    def incoming(self, entity_id: int, mask: int) -> Iterator[Tuple[int, Relationship]]:
+        return self._adjacent("target", "source", entity_id, mask)
+
+    def relationships_with_mask(self, mask: int) -> Iterator[Tuple[int, int, Relationship]]:
+        rows = self._paged(
+            "target, uuid, data", "relationships", f"type IN {_in_codes(mask)}", (),
+            ("source", "type", "row"),
+        )
+        for source, _, _, target, key, data in rows:
+            yield source, target, self._relationship(key, data)
+
+    def relationship_keys(self) -> Iterator[Tuple[int, int, int]]:
+        return iter(self._connection.execute("SELECT source, target, type FROM relationships"))
+
+    # Helpers
+
+    def _adjacent(
+        self,
+        this_end: str,
+        other_end: str,
+        entity_id: int,
+        mask: int
+    ) -> Iterator[Tuple[int, Relationship]]:
+        rows = self._connection.execute(
+            f"SELECT {other_end}, uuid, data FROM relationships "
+            f"WHERE {this_end} = ? AND type IN {_in_codes(mask)} ORDER BY type, row",
+            (entity_id,),
+        ).fetchall()
+        for other, key, data in rows:
+            yield other, self._relationship(key, data)
+
+    def _query_entities(self, where: str, parameters: Tuple[Any, ...] = ()) -> Iterator[Entity]:
+        """Entities matching a condition (all if empty), in ID order."""
+        for entity_id, embedding, data in self._paged(
+            "embedding, data", "entities", where, parameters, ("id",)
+        ):
+            entity = self._cache.get(entity_id)
+            yield entity if entity is not None else self._load_entity((entity_id, embedding, data))
+
+    def _paged(
+        self,
+        columns: str,
+        table: str,
+        where: str,
+        parameters: Tuple[Any, ...],
+        keys: Tuple[str, ...]
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream the rows of a query in batches, ordered by unique keys.
+
+        Each batch is a separate statement resuming after the last keys
+        seen, so a scan holds one batch in memory and callers can write to
+        the database while iterating. Rows are the keys followed by columns.
+        """
+        order = ", ".join(keys)
+        resume = f"({order}) > ({', '.join('?' * len(keys))})"
+        last: Tuple[Any, ...] = ()
+        while True:
+            conditions = [condition for condition in (where, resume if last else "") if condition]
+            sql = f"SELECT {order}, {columns} FROM {table}"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            rows = self._connection.execute(
+                f"{sql} ORDER BY {order} LIMIT {_BATCH_SIZE}", parameters + last
+            ).fetchall()
+            yield from rows
+            if len(rows) < _BATCH_SIZE:
+                return
+            last = tuple(rows[-1][:len(keys)])
+
+    def _load_entity(self, row: Tuple[int, Optional[bytes], str]) -> Entity:
+        entity_id, embedding, data = row
+        entity = Entity.from_dict(json.loads(data), trusted=True)
+        entity.visual.embedding = _decode_embedding(embedding)
+        self._cache_entity(entity_id, entity)
+        return entity
+
+    def _relationship(self, key: bytes, data: str) -> Relationship:
+        """The cached relationship with a UUID, or one decoded from its row."""
+        rel = self._relationship_cache.get(key)
+        if rel is None:
+            rel = Relationship.from_dict(json.loads(data), trusted=True)
+        self._cache_relationship(key, rel)
+        return rel
+
+    def _cache_entity(self, entity_id: int, entity: Entity) -> None:
+        self._cache[entity_id] = entity
+        self._cache.move_to_end(entity_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cache_relationship(self, key: bytes, rel: Relationship) -> None:
+        self._relationship_cache[key] = rel
+        self._relationship_cache.move_to_end(key)
+        if len(self._relationship_cache) > self.cache_size:
+            self._relationship_cache.popitem(last=False)
+
+    @staticmethod
+    def _entity_json(entity: Entity) -> str:
+        data = entity.to_dict(trusted=True)
+        data["visual"]["embedding"] = None  # Stored in its own column
+        return json.dumps(data, separators=(",", ":"))
+
+    @staticmethod
+    def _json(rel: Relationship) -> str:
+        return json.dumps(rel.to_dict(trusted=True), separators=(",", ":"))
@@ -0,0 +1,106 @@
+"""Incrementally maintained statistics for the semantic graph."""
+
+from typing import Any, Dict, List, Optional
+
+from semantic_memory.core.entity import ENTITY_TYPES
+from semantic_memory.core.relationship import RELATION_TYPES, SPATIAL_RELATION_MASK
+
+
+class GraphStatistics:
+    """
+    Running counters updated on every graph mutation.
+
+    Reading a summary is O(number of types) regardless of graph size, so it
+    can be polled at high frequency.
+    """
+
+    def __init__(self):
+        """Initialize counters for an empty graph."""
+        self.entities_by_type: List[int] = [0] * len(ENTITY_TYPES)
+        self.relationships_by_type: List[int] = [0] * len(RELATION_TYPES)
+        self.total_entities = 0
+        self.total_relationships = 0
+        self.spatial_relationships = 0
+
+        # Total (in + out) degree per entity and how many entities have each degree
+        self._degrees: Dict[int, int] = {}
+        self._degree_histogram: Dict[int, int] = {}
+        self._max_degree = 0
+
+    def entity_added(self, entity_id: int, type_code: int) -> None:
+        """Record a new entity."""
+        self.total_entities += 1
+        self.entities_by_type[type_code] += 1
+        self._degrees[entity_id] = 0
+        self._degree_histogram[0] = self._degree_histogram.get(0, 0) + 1
+
+    def entity_removed(self, entity_id: int, type_code: int) -> None:
+        """Record removal of an entity whose relationships were already removed."""
+        self.total_entities -= 1
+        self.entities_by_type[type_code] -= 1
+        self._shift_degree(entity_id, None)
+
+    def relationship_added(self, source: int, target: int, type_code: int) -> None:
+        """Record a new relationship."""
+        self.total_relationships += 1
+        self.relationships_by_type[type_code] += 1
+        if SPATIAL_RELATION_MASK >> type_code & 1:
+            self.spatial_relationships += 1
+        self._shift_degree(source, 1)
+        self._shift_degree(target, 1)
+
+    def relationship_removed(self, source: int, target: int, type_code: int) -> None:
+        """Record removal of a relationship."""
+        self.total_relationships -= 1
+        self.relationships_by_type[type_code] -= 1
+        if SPATIAL_RELATION_MASK >> type_code & 1:
+            self.spatial_relationships -= 1
+        self._shift_degree(source, -1)
+        self._shift_degree(target, -1)
+
+    def _shift_degree(self, entity_id: int, delta: Optional[int]) -> None:
+        """Move an entity to another degree bucket (delta None removes it)."""
+        degree = self._degrees[entity_id]
+        remaining = self._degree_histogram[degree] - 1
+        if remaining:
+            self._degree_histogram[degree] = remaining
+        else:
+            del self._degree_histogram[degree]
+
+        if delta is None:
+            del self._degrees[entity_id]
+        else:
+            degree += delta
+            self._degrees[entity_id] = degree
+            self._degree_histogram[degree] = self._degree_histogram.get(degree, 0) + 1
+            self._max_degree = max(self._max_degree, degree)
+
+        # Only walks down when the last entity with the maximum degree moved
+        while self._max_degree > 0 and self._max_degree not in self._degree_histogram:
+            self._max_degree -= 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Get a snapshot of the current statistics."""
+        n = self.total_entities
+        m = self.total_relationships
+        return {
+            "total_entities": n,
+            "total_relationships": m,
+            "entities_by_type": {
+                ENTITY_TYPES[code].value: count
+                for code, count in enumerate(self.entities_by_type)
+                if count
+            },
+            "relationships_by_type": {
+                RELATION_TYPES[code].value: count
+                for code, count in enumerate(self.relationships_by_type)
+                if count
+            },
+            "spatial_relationships": self.spatial_relationships,
+            "graph_density": m / (n * (n - 1)) if n > 1 else 0.0,
+            "degree": {
+                "mean": 2 * m / n if n else 0.0,
+                "max": self._max_degree,
+                "isolated": self._degree_histogram.get(0, 0),
+            },
+        }
@@ -0,0 +1,542 @@
+"""Vector indices for resolving entities by visual embedding."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Type
+from uuid import UUID
+
+import numpy as np
+
+
+def normalize_vector(vector: Sequence[float]) -> Optional[np.ndarray]:
+    """
+    Convert a vector to a unit-length float32 array.
+
+    Returns:
+        The normalized vector, or None if it has zero norm (such vectors
+        never match anything under cosine similarity).
+    """
+    array = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+    return array / norm
+
+
+class _VectorBlock:
+    """Growable, contiguous float32 matrix of unit vectors with a row <-> UUID map."""
+
+    def __init__(self, dim: int, capacity: int = 16):
+        self.dim = dim
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.ids: List[UUID] = []
+        self.rows: Dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, entity_id: UUID, vector: np.ndarray) -> None:
+        """Insert or overwrite the row for an entity."""
+        row = self.rows.get(entity_id)
+        if row is None:
+            row = len(self.ids)
+            if row == self.vectors.shape[0]:
+                grown = np.zeros((row * 2, self.dim), dtype=np.float32)
+                grown[:row] = self.vectors[:row]
+                self.vectors = grown
+            self.ids.append(entity_id)
+            self.rows[entity_id] = row
+        self.vectors[row] = vector
+
+    def extend(self, entity_ids: List[UUID], vectors: np.ndarray) -> None:
+        """Append rows for entities that are not in the block yet."""
+        start = len(self.ids)
+        end = start + len(entity_ids)
+        if end > self.vectors.shape[0]:
+            grown = np.zeros((max(end, start * 2), self.dim), dtype=np.float32)
+            grown[:start] = self.vectors[:start]
+            self.vectors = grown
+        self.vectors[start:end] = vectors
+        self.ids.extend(entity_ids)
+        self.rows.update(zip(entity_ids, range(start, end)))
+
+    def remove(self, entity_id: UUID) -> bool:
+        """Remove an entity's row by swapping the last row into its place."""
+        row = self.rows.pop(entity_id, None)
+        if row is None:
+            return False
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.vectors[row] = self.vectors[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+        self.ids.pop()
+        return True
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row against a unit query vector."""
+        return self.vectors[:len(self.ids)] @ query
+
+
+def _top_k(
+    ids: List[UUID],
+    scores: np.ndarray,
+    k: int,
+    threshold: Optional[float]
+) -> List[Tuple[UUID, float]]:
+    """Select the k best-scoring ids above threshold, best first."""
+    if threshold is not None:
+        candidates = np.flatnonzero(scores > threshold)
+    else:
+        candidates = np.arange(len(scores))
+    if len(candidates) > k:
+        best = np.argpartition(scores[candidates], -k)[-k:]
+        candidates = candidates[best]
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(ids[i], float(scores[i])) for i in order]
+
+
+class VectorIndex(ABC):
+    """
+    Interface for embedding indices used by SemanticGraph entity resolution.
+
+    Implementations store unit-normalized embeddings partitioned by group
+    (typically entity type) and return the most similar entries for a query.
+    """
+
+    index_type: str = ""
+    _registry: Dict[str, Type["VectorIndex"]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.index_type:
+            VectorIndex._registry[cls.index_type] = cls
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def __contains__(self, entity_id: UUID) -> bool:
+        ...
+
+    @abstractmethod
+    def add(self, entity_id: UUID, vector: Sequence[float], group: Hashable) -> None:
+        """Add or update an entity's embedding."""
+
+    def add_batch(
+        self,
+        entity_ids: Sequence[UUID],
+        vectors: np.ndarray,
+        group: Hashable
+    ) -> None:
+        """Add or update the embeddings of several entities in one group (rows of vectors)."""
+        for entity_id, vector in zip(entity_ids, vectors):
+            self.add(entity_id, vector, group)
+
+    @abstractmethod
+    def remove(self, entity_id: UUID) -> None:
+        """Remove an entity's embedding if present."""
+
+    @abstractmethod
+    def search(
+        self,
+        vector: Sequence[float],
+        group: Hashable,
+        k: int = 1,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Return up to k (entity_id, similarity) tuples, most similar first."""
+
+    def search_batch(
+        self,
+        vectors: Sequence[Sequence[float]],
+        group: Hashable,
+        k: int = 1,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[UUID, float]]]:
+        """Run search() for several query vectors, returning one result list per query."""
+        return [self.search(vector, group, k, threshold) for vector in vectors]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Export index configuration and trained state.
+
+        Stored embeddings are not included; they are re-added from the
+        entities when a graph is imported.
+        """
+        return {"type": self.index_type}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VectorIndex":
+        """Create an empty index from exported configuration and state."""
+        index_cls = VectorIndex._registry.get(data.get("type", ""))
+        if index_cls is None:
+            raise ValueError(f"Unknown vector index type: {data.get('type')}")
+        return index_cls._from_state(data)
+
+    @classmethod
+    def _from_state(cls, data: Dict[str, Any]) -> "VectorIndex":
+        return cls()
+
+
+class ExactVectorIndex(VectorIndex):
+    """
+    Exact cosine-similarity index over entity embeddings.
+
+    Embeddings are stored pre-normalized in one contiguous float32 matrix per
+    (group, dimension), so a lookup is a single matrix-vector product followed
+    by a threshold and argmax. Groups are typically entity types.
+    """
+
+    index_type = "exact"
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._blocks: Dict[Tuple[Hashable, int], _VectorBlock] = {}
+        self._keys: Dict[UUID, Tuple[Hashable, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, entity_id: UUID) -> bool:
+        return entity_id in self._keys
+
+    def add(self, entity_id: UUID, vector: Sequence[float], group: Hashable) -> None:
+        """
+        Add or update an entity's embedding.
+
+        Args:
+            entity_id: ID of the entity
+            vector: Raw (unnormalized) embedding
+            group: Partition to store it in, e.g. the entity type
+        """
+        unit = normalize_vector(vector)
+        if unit is None:
+            self.remove(entity_id)
+            return
+
+        key = (group, unit.shape[0])
+        previous = self._keys.get(entity_id)
+        if previous is not None and previous != key:
+            self._blocks[previous].remove(entity_id)
+
+        block = self._blocks.get(key)
+        if block is None:
+            block = self._blocks[key] = _VectorBlock(unit.shape[0])
+        block.add(entity_id, unit)
+        self._keys[entity_id] = key
+
+    def add_batch(
+        self,
+        entity_ids: Sequence[UUID],
+        vectors: np.ndarray,
+        group: Hashable
+    ) -> None:
+        """
+        Add the embeddings of several entities in one group.
+
+        New entities are normalized and appended to the block with a few
+        array operations; batches that update existing entries fall back
+        to add().
+
+        Args:
+            entity_ids: IDs of the entities
+            vectors: 2-D array with one raw embedding per row
+            group: Partition to store them in
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if (
+            vectors.ndim != 2
+            or len(set(entity_ids)) != len(entity_ids)
+            or any(entity_id in self._keys for entity_id in entity_ids)
+        ):
+            super().add_batch(entity_ids, vectors, group)
+            return
+
+        norms = np.linalg.norm(vectors, axis=1)
+        keep = (norms > 0) & np.isfinite(norms)
+        ids = [entity_id for entity_id, kept in zip(entity_ids, keep) if kept]
+        if not ids:
+            return
+
+        key = (group, vectors.shape[1])
+        block = self._blocks.get(key)
+        if block is None:
+            block = self._blocks[key] = _VectorBlock(vectors.shape[1])
+        block.extend(ids, vectors[keep] / norms[keep, None])
+        for entity_id in ids:
+            self._keys[entity_id] = key
+
+    def remove(self, entity_id: UUID) -> None:
+        """Remove an entity's embedding if present."""
+        key = self._keys.pop(entity_id, None)
+        if key is not None:
+            self._blocks[key].remove(entity_id)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        group: Hashable,
+        k: int = 1,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[UUID, float]]:
+        """
+        Find the most similar embeddings within a group.
+
+        Args:
+            vector: Raw query embedding
+            group: Partition to search
+            k: Maximum number of results
+            threshold: Only return similarities strictly above this value
+
+        Returns:
+            List of (entity_id, similarity) tuples, most similar first
+        """
+        unit = normalize_vector(vector)
+        if unit is None:
+            return []
+        block = self._blocks.get((group, unit.shape[0]))
+        if block is None or not len(block):
+            return []
+        return _top_k(block.ids, block.scores(unit), k, threshold)
+
+    def search_batch(
+        self,
+        vectors: Sequence[Sequence[float]],
+        group: Hashable,
+        k: int = 1,
+        threshold: Optional[float] = None,
+        chunk_size: int = 1024
+    ) -> List[List[Tuple[UUID, float]]]:
+        """
+        Find the most similar embeddings for many queries at once.
+
+        Queries are scored against each block with a single matrix product
+        per chunk of ``chunk_size`` queries.
+        """
+        results: List[List[Tuple[UUID, float]]] = [[] for _ in vectors]
+        by_dim: Dict[int, List[Tuple[int, np.ndarray]]] = {}
+        for position, vector in enumerate(vectors):
+            unit = normalize_vector(vector)
+            if unit is not None:
+                by_dim.setdefault(unit.shape[0], []).append((position, unit))
+
+        for dim, queries in by_dim.items():
+            block = self._blocks.get((group, dim))
+            if block is None or not len(block):
+                continue
+            stored = block.vectors[:len(block)]
+            for start in range(0, len(queries), chunk_size):
+                chunk = queries[start:start + chunk_size]
+                scores = np.stack([unit for _, unit in chunk]) @ stored.T
+                for (position, _), row in zip(chunk, scores):
+                    results[position] = _top_k(block.ids, row, k, threshold)
+        return results
+
+
+class _IVFGroup:
+    """Inverted lists for one (group, dimension) partition of an IVF index."""
+
+    def __init__(self, dim: int, centroids: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.centroids = centroids
+        n_lists = 1 if centroids is None else centroids.shape[0]
+        self.lists = [_VectorBlock(dim) for _ in range(n_lists)]
+        self.assignment: Dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.assignment)
+
+    def add(self, entity_id: UUID, unit: np.ndarray) -> None:
+        self.remove(entity_id)
+        list_no = 0
+        if self.centroids is not None:
+            list_no = int(np.argmax(self.centroids @ unit))
+        self.lists[list_no].add(entity_id, unit)
+        self.assignment[entity_id] = list_no
+
+    def remove(self, entity_id: UUID) -> None:
+        list_no = self.assignment.pop(entity_id, None)
+        if list_no is not None:
+            self.lists[list_no].remove(entity_id)
+
+    def search(
+        self,
+        unit: np.ndarray,
+        k: int,
+        threshold: Optional[float],
+        nprobe: int
+    ) -> List[Tuple[UUID, float]]:
+        if self.centroids is None:
+            probed = self.lists
+        else:
+            centroid_scores = self.centroids @ unit
+            if nprobe < len(self.lists):
+                nearest = np.argpartition(centroid_scores, -nprobe)[-nprobe:]
+            else:
+                nearest = range(len(self.lists))
+            probed = [self.lists[i] for i in nearest]
+
+        ids: List[UUID] = []
+        scores = []
+        for block in probed:
+            if len(block):
+                ids.extend(block.ids)
+                scores.append(block.scores(unit))
+        if not ids:
+            return []
+        return _top_k(ids, np.concatenate(scores), k, threshold)
+
+    def train(self, nlist: int, iterations: int, rng: np.random.Generator) -> None:
+        """Cluster stored vectors with spherical k-means and rebuild the lists."""
+        ids = [eid for block in self.lists for eid in block.ids]
+        data = np.concatenate([block.vectors[:len(block)] for block in self.lists])
+        n_lists = min(nlist, len(ids))
+        centroids = data[rng.choice(len(ids), size=n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            norms = np.linalg.norm(sums, axis=1)
+            filled = norms > 0
+            centroids[filled] = sums[filled] / norms[filled, None]
+
+        self.centroids = centroids
+        self.lists = [_VectorBlock(self.dim) for _ in range(n_lists)]
+        self.assignment = {}
+        labels = np.argmax(data @ centroids.T, axis=1)
+        for eid, vector, list_no in zip(ids, data, labels):
+            self.lists[list_no].add(eid, vector)
+            self.assignment[eid] = int(list_no)
+
+
+class IVFVectorIndex(VectorIndex):
+    """
+    Approximate inverted-file (IVF) index over entity embeddings.
+
+    Each group is searched exactly until it holds ``train_size`` vectors, at
+    which point its vectors are clustered into ``nlist`` inverted lists.
+    Queries then only scan the ``nprobe`` lists whose centroids are most
+    similar, trading recall for latency. Inserts and deletes are incremental;
+    call ``rebuild()`` to re-cluster after the distribution has drifted.
+    """
+
+    index_type = "ivf"
+
+    def __init__(
+        self,
+        nlist: int = 64,
+        nprobe: int = 8,
+        train_size: Optional[int] = None,
+        kmeans_iterations: int = 10,
+        seed: int = 0
+    ):
+        """
+        Initialize an empty IVF index.
+
+        Args:
+            nlist: Number of inverted lists per group
+            nprobe: Number of lists scanned per query (higher = better recall)
+            train_size: Vectors a group needs before it is clustered
+                (default: 16 * nlist)
+            kmeans_iterations: Lloyd iterations used when clustering
+            seed: Random seed for centroid initialization
+        """
+        if nlist < 1 or nprobe < 1:
+            raise ValueError("nlist and nprobe must be positive")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size if train_size is not None else 16 * nlist
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._groups: Dict[Tuple[Hashable, int], _IVFGroup] = {}
+        self._keys: Dict[UUID, Tuple[Hashable, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, entity_id: UUID) -> bool:
+        return entity_id in self._keys
+
+    def add(self, entity_id: UUID, vector: Sequence[float], group: Hashable) -> None:
+        """Add or update an entity's embedding."""
+        unit = normalize_vector(vector)
+        if unit is None:
+            self.remove(entity_id)
+            return
+
+        key = (group, unit.shape[0])
+        previous = self._keys.get(entity_id)
+        if previous is not None and previous != key:
+            self._groups[previous].remove(entity_id)
+
+        ivf_group = self._groups.get(key)
+        if ivf_group is None:
+            ivf_group = self._groups[key] = _IVFGroup(unit.shape[0])
+        ivf_group.add(entity_id, unit)
+        self._keys[entity_id] = key
+
+        if ivf_group.centroids is None and len(ivf_group) >= self.train_size:
+            ivf_group.train(self.nlist, self.kmeans_iterations, self._rng)
+
+    def remove(self, entity_id: UUID) -> None:
+        """Remove an entity's embedding if present."""
+        key = self._keys.pop(entity_id, None)
+        if key is not None:
+            self._groups[key].remove(entity_id)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        group: Hashable,
+        k: int = 1,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Return up to k approximate nearest neighbours, most similar first."""
+        unit = normalize_vector(vector)
+        if unit is None:
+            return []
+        ivf_group = self._groups.get((group, unit.shape[0]))
+        if ivf_group is None or not len(ivf_group):
+            return []
+        return ivf_group.search(unit, k, threshold, self.nprobe)
+
+    def rebuild(self) -> None:
+        """Re-cluster every group that has reached the training size."""
+        for ivf_group in self._groups.values():
+            if len(ivf_group) >= self.train_size:
+                ivf_group.train(self.nlist, self.kmeans_iterations, self._rng)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export configuration and trained centroids."""
+        return {
+            "type": self.index_type,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "train_size": self.train_size,
+            "kmeans_iterations": self.kmeans_iterations,
+            "seed": self.seed,
+            "groups": [
+                {"group": group, "dim": dim, "centroids": ivf_group.centroids.tolist()}
+                for (group, dim), ivf_group in self._groups.items()
+                if ivf_group.centroids is not None
+            ],
+        }
+
+    @classmethod
+    def _from_state(cls, data: Dict[str, Any]) -> "IVFVectorIndex":
+        index = cls(
+            nlist=data.get("nlist", 64),
+            nprobe=data.get("nprobe", 8),
+            train_size=data.get("train_size"),
+            kmeans_iterations=data.get("kmeans_iterations", 10),
+            seed=data.get("seed", 0),
+        )
+        for group_data in data.get("groups", []):
+            centroids = np.asarray(group_data["centroids"], dtype=np.float32)
+            key = (group_data["group"], group_data["dim"])
+            index._groups[key] = _IVFGroup(group_data["dim"], centroids)
+        return index
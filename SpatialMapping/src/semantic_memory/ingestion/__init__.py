@@ -1,6 +1,9 @@
 """Ingestion pipeline for photos and descriptions."""
 
+from semantic_memory.ingestion.cache import ObservationCache
+from semantic_memory.ingestion.decode import DecodePolicy
 from semantic_memory.ingestion.observation import Observation
 from semantic_memory.ingestion.photo_processor import PhotoProcessor
+from semantic_memory.ingestion.pipeline import IngestionPipeline
 
-__all__ = ["Observation", "PhotoProcessor"]
+__all__ = ["DecodePolicy", "IngestionPipeline", "Observation", "ObservationCache", "PhotoProcessor"]
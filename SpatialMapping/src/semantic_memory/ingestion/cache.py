@@ -0,0 +1,441 @@
+"""Content-addressed cache of photo processing results."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import numpy as np
+from PIL import Image
+
+from semantic_memory.core.entity import Entity
+from semantic_memory.core.relationship import Relationship
+from semantic_memory.ingestion.decode import DecodePolicy
+from semantic_memory.ingestion.observation import Observation
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    digest BLOB NOT NULL,
+    description TEXT NOT NULL,
+    phash INTEGER,
+    band0 INTEGER,
+    band1 INTEGER,
+    band2 INTEGER,
+    band3 INTEGER,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (digest, description)
+);
+CREATE INDEX IF NOT EXISTS observations_by_band0 ON observations (description, band0);
+CREATE INDEX IF NOT EXISTS observations_by_band1 ON observations (description, band1);
+CREATE INDEX IF NOT EXISTS observations_by_band2 ON observations (description, band2);
+CREATE INDEX IF NOT EXISTS observations_by_band3 ON observations (description, band3);
+CREATE INDEX IF NOT EXISTS observations_by_use ON observations (used);
+"""
+
+_CHUNK_SIZE = 1 << 20
+
+# Set bits in each byte value, for Hamming distances between hashes
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+_HASH_POLICY = DecodePolicy(target_size=(64, 64), mode="L")
+
+# Perceptual hashes are indexed as four 16-bit bands. Hashes within distance
+# d differ in at most d // 4 bits of at least one band, so near-duplicates are
+# found by looking up the band values that close to the query's.
+_BANDS = 4
+_BAND_BITS = 16
+# Bits flipped per band beyond which lookups scan all hashes instead
+_MAX_BAND_FLIPS = 2
+
+
+def _bands(phash: int) -> List[int]:
+    """The 16-bit bands of a perceptual hash, lowest first."""
+    unsigned = phash & 0xFFFFFFFFFFFFFFFF
+    mask = (1 << _BAND_BITS) - 1
+    return [(unsigned >> (_BAND_BITS * band)) & mask for band in range(_BANDS)]
+
+
+def _within(value: int, flips: int) -> List[int]:
+    """All band values differing from value in at most flips bits."""
+    values = [value]
+    for count in range(1, flips + 1):
+        for bits in combinations(range(_BAND_BITS), count):
+            flipped = value
+            for bit in bits:
+                flipped ^= 1 << bit
+            values.append(flipped)
+    return values
+
+
+def file_digest(image_path: str) -> bytes:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(image_path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def perceptual_hash(image_path: str) -> int:
+    """
+    64-bit difference hash (dHash) of an image.
+
+    Re-encoded, resized or slightly edited copies of a photo hash to values
+    a few bits apart. The image is decoded at reduced resolution.
+
+    Returns:
+        The hash as a signed 64-bit integer
+    """
+    image = _HASH_POLICY.decode(image_path).resize((9, 8), Image.Resampling.BILINEAR)
+    pixels = np.asarray(image, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">i8")[0])
+
+
+class ObservationCache:
+    """
+    Remembers the extraction results of photos by their content.
+
+    A photo is identified by the SHA-256 of its bytes together with its
+    description, so a re-uploaded photo is recognized whatever its path.
+    Optionally, a photo that is not an exact match is matched to a
+    previously processed one whose perceptual hash is within max_distance
+    bits (e.g. the same photo re-encoded by a device).
+
+    Perceptual hashes are indexed in four 16-bit bands, so a near-duplicate
+    lookup reads only the stored hashes sharing a band value close to the
+    query's (for max_distance up to 11; beyond that it scans every hash
+    stored with the description).
+
+    Results are stored in a SQLite database and evicted least recently used
+    first once they exceed max_bytes. The most recently used results and
+    file digests (by path, size and modification time) are also kept in
+    memory, so repeated lookups neither query the database nor re-read the
+    file.
+
+    A cache can be shared between threads; files are hashed outside its
+    lock. It is used by PhotoProcessor.process_photo() and batch_process(),
+    not by IngestionPipeline, whose stages call decode() and extract()
+    directly.
+
+    A hit returns a new Observation for the requesting device with fresh
+    entity and relationship IDs; nothing is shared with earlier results. A
+    cache must only be used with one extraction configuration (models and
+    their settings), since that is not part of the key.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_entries: int = 1024,
+        near_duplicates: bool = False,
+        max_distance: int = 4
+    ):
+        """
+        Open or create a cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a transient cache)
+            max_bytes: Bound on the total size of stored results
+            memory_entries: Results and file digests kept in memory
+            near_duplicates: If True, also match photos by perceptual hash
+            max_distance: Largest Hamming distance between perceptual hashes
+                of near-duplicates
+        """
+        if max_bytes < 1 or memory_entries < 1:
+            raise ValueError("max_bytes and memory_entries must be positive")
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.near_duplicates = near_duplicates
+        self.max_distance = max_distance
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        total, last_used = self._connection.execute(
+            "SELECT total(size), max(used) FROM observations"
+        ).fetchone()
+        self._bytes = int(total)
+        self._clock = last_used or 0
+
+        # (digest, description) -> stored data, most recently used last
+        self._results: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+        # path -> (size, mtime_ns, digest, phash), most recently used last
+        self._files: "OrderedDict[str, Tuple[int, int, bytes, Optional[int]]]" = OrderedDict()
+        # Uses not yet written to the database
+        self._touched: Dict[Tuple[bytes, str], int] = {}
+
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __enter__(self) -> "ObservationCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT count(*) FROM observations").fetchone()[0]
+
+    def get(
+        self,
+        image_path: str,
+        description: Optional[str] = None,
+        device_id: str = "default",
+        location_hint: Optional[str] = None
+    ) -> Optional[Observation]:
+        """
+        Look up the result of processing a photo with a description.
+
+        Args:
+            image_path: Path to image file
+            description: Description the photo was processed with
+            device_id: Identifier for the requesting device
+            location_hint: Optional location context
+
+        Returns:
+            A processed observation, or None on a miss (including when the
+            file cannot be read)
+        """
+        description = description or ""
+        try:
+            digest, _ = self._identify(image_path, perceptual=False)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            data = self._lookup(digest, description)
+            if data is not None:
+                self.hits += 1
+        if data is not None:
+            return self._reissue(data, image_path, description, device_id, location_hint, "exact")
+
+        if self.near_duplicates:
+            try:
+                _, phash = self._identify(image_path, perceptual=True)
+            except (OSError, ValueError):
+                phash = None
+            with self._lock:
+                match = self._nearest(phash, description) if phash is not None else None
+                if match is not None:
+                    data = self._lookup(match, description)
+                    self.near_hits += 1
+            if data is not None:
+                return self._reissue(
+                    data, image_path, description, device_id, location_hint, "near"
+                )
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, image_path: str, observation: Observation) -> None:
+        """
+        Store the result of processing a photo.
+
+        Args:
+            image_path: Path to the processed image file
+            observation: Processed observation (its description is part of the key)
+        """
+        description = observation.description or ""
+        digest, phash = self._identify(image_path, perceptual=self.near_duplicates)
+        data = json.dumps({
+            "metadata": observation.metadata,
+            "confidence": observation.confidence,
+            "entities": [entity.to_dict(trusted=True) for entity in observation.entities],
+            "relationships": [rel.to_dict(trusted=True) for rel in observation.relationships],
+        }, separators=(",", ":"))
+
+        bands = _bands(phash) if phash is not None else [None] * _BANDS
+
+        key = (digest, description)
+        with self._lock:
+            self._flush_uses()
+            previous = self._connection.execute(
+                "SELECT size FROM observations WHERE digest = ? AND description = ?", key
+            ).fetchone()
+            if previous is not None:
+                self._bytes -= previous[0]
+            self._clock += 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO observations "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, description, phash, *bands, data, len(data), self._clock)
+            )
+            self._bytes += len(data)
+            self._remember(key, data)
+            self._evict()
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                "entries": len(self),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """Record pending uses and close the database."""
+        with self._lock:
+            self._flush_uses()
+            self._connection.commit()
+            self._connection.close()
+
+    def _identify(self, image_path: str, perceptual: bool) -> Tuple[bytes, Optional[int]]:
+        """Digest (and perceptual hash, if requested) of a file, memoized by stat."""
+        stat = os.stat(image_path)
+        with self._lock:
+            known = self._files.get(image_path)
+        if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            digest, phash = known[2], known[3]
+        else:
+            digest, phash = file_digest(image_path), None
+        if perceptual and phash is None:
+            phash = perceptual_hash(image_path)
+        with self._lock:
+            self._files[image_path] = (stat.st_size, stat.st_mtime_ns, digest, phash)
+            self._files.move_to_end(image_path)
+            if len(self._files) > self.memory_entries:
+                self._files.popitem(last=False)
+        return digest, phash
+
+    def _lookup(self, digest: bytes, description: str) -> Optional[str]:
+        key = (digest, description)
+        data = self._results.get(key)
+        if data is None:
+            row = self._connection.execute(
+                "SELECT data FROM observations WHERE digest = ? AND description = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            data = row[0]
+        self._remember(key, data)
+        self._clock += 1
+        self._touched[key] = self._clock
+        return data
+
+    def _nearest(self, phash: int, description: str) -> Optional[bytes]:
+        """Digest of the stored photo closest to a perceptual hash, within max_distance."""
+        flips = self.max_distance // _BANDS
+        if flips > _MAX_BAND_FLIPS:
+            rows = self._connection.execute(
+                "SELECT digest, phash FROM observations "
+                "WHERE description = ? AND phash IS NOT NULL",
+                (description,)
+            ).fetchall()
+        else:
+            found: Dict[bytes, int] = {}
+            for band, value in enumerate(_bands(phash)):
+                values = _within(value, flips)
+                found.update(self._connection.execute(
+                    f"SELECT digest, phash FROM observations WHERE description = ? "
+                    f"AND band{band} IN ({', '.join('?' * len(values))})",
+                    (description, *values)
+                ).fetchall())
+            rows = list(found.items())
+        if not rows:
+            return None
+        hashes = np.array([row[1] for row in rows], dtype=np.int64)
+        distances = _POPCOUNT[(hashes ^ np.int64(phash)).view(np.uint8)].reshape(-1, 8).sum(axis=1)
+        best = int(np.argmin(distances))
+        return rows[best][0] if distances[best] <= self.max_distance else None
+
+    def _remember(self, key: Tuple[bytes, str], data: str) -> None:
+        self._results[key] = data
+        self._results.move_to_end(key)
+        if len(self._results) > self.memory_entries:
+            self._results.popitem(last=False)
+
+    def _flush_uses(self) -> None:
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE observations SET used = ? WHERE digest = ? AND description = ?",
+                [
+                    (used, digest, description)
+                    for (digest, description), used in self._touched.items()
+                ]
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used results until the size bound holds."""
+        while self._bytes > self.max_bytes:
+            rows = self._connection.execute(
+                "SELECT digest, description, size FROM observations ORDER BY used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for digest, description, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                self._connection.execute(
+                    "DELETE FROM observations WHERE digest = ? AND description = ?",
+                    (digest, description)
+                )
+                self._results.pop((digest, description), None)
+                self._bytes -= size
+                self.evictions += 1
+
+    @staticmethod
+    def _reissue(
+        data: str,
+        image_path: str,
+        description: str,
+        device_id: str,
+        location_hint: Optional[str],
+        match: str
+    ) -> Observation:
+        """Build a new observation from a stored result, with fresh IDs."""
+        stored = json.loads(data)
+        now = datetime.now()
+        observation = Observation(
+            device_id=device_id,
+            source_type="photo",
+            image_path=image_path,
+            description=description or None,
+            location_hint=location_hint,
+            confidence=stored["confidence"],
+            metadata=stored["metadata"]
+        )
+        observation.metadata["cache_hit"] = match
+
+        new_ids: Dict[str, str] = {}
+        for record in stored["entities"]:
+            new_ids[record["id"]] = record["id"] = str(uuid4())
+            record["first_observed"] = record["last_observed"] = now
+            record["source_devices"] = []
+            observation.add_entity(Entity.from_dict(record, trusted=True))
+        for record in stored["relationships"]:
+            record["id"] = str(uuid4())
+            record["source_id"] = new_ids.get(record["source_id"], record["source_id"])
+            record["target_id"] = new_ids.get(record["target_id"], record["target_id"])
+            record["first_observed"] = record["last_observed"] = now
+            record["source_devices"] = []
+            observation.add_relationship(Relationship.from_dict(record, trusted=True))
+
+        observation.processed = True
+        return observation
@@ -0,0 +1,68 @@
+"""Reduced-resolution image decoding for ingestion."""
+
+from typing import Optional, Tuple
+
+from PIL import Image
+
+# Key in Image.info holding the size of the image before reduction
+ORIGINAL_SIZE = "original_size"
+
+
+class DecodePolicy:
+    """
+    Decides how much of a photo is decoded.
+
+    Models take small inputs, so decoding a 12-48 MP photo at full
+    resolution is mostly wasted. When pixels are needed, the image is
+    reduced while decoding: JPEG decoders scale the DCT by 1/2, 1/4 or 1/8
+    (PIL draft()), so only a fraction of the pixels are ever produced, and a
+    thumbnail then brings the result down to the target size. When only
+    metadata is needed, just the header is read.
+
+    The size before reduction is kept in ``image.info["original_size"]``.
+    """
+
+    def __init__(
+        self,
+        target_size: Optional[Tuple[int, int]] = (512, 512),
+        mode: Optional[str] = "RGB",
+        resample: Image.Resampling = Image.Resampling.BILINEAR
+    ):
+        """
+        Initialize a policy.
+
+        Args:
+            target_size: Bounding box the decoded image is reduced to, keeping
+                its aspect ratio (None: decode at full resolution)
+            mode: Pixel mode to convert decoded images to (None: keep)
+            resample: Filter used for the final thumbnail step
+        """
+        if target_size is not None and min(target_size) < 1:
+            raise ValueError("target_size must be positive")
+        self.target_size = target_size
+        self.mode = mode
+        self.resample = resample
+
+    def decode(self, image_path: str, pixels: bool = True) -> Image.Image:
+        """
+        Open an image, decoding as little as the caller needs.
+
+        Args:
+            image_path: Path to image file
+            pixels: If False, only read the header; the returned image is
+                closed and only provides size, mode, format and info
+
+        Returns:
+            The image, reduced to fit target_size if pixels were decoded
+        """
+        with Image.open(image_path) as image:
+            original_size = image.size
+            if pixels:
+                if self.target_size is not None:
+                    image.draft(self.mode, self.target_size)
+                    image.thumbnail(self.target_size, self.resample)
+                image.load()
+                if self.mode is not None and image.mode != self.mode:
+                    image = image.convert(self.mode)
+            image.info[ORIGINAL_SIZE] = original_size
+        return image
@@ -1,13 +1,18 @@
 """Photo processing pipeline for extracting entities and relationships."""
 
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from PIL import Image
 
 from semantic_memory.core.entity import Entity, EntityType, SemanticAttributes, VisualFeatures
 from semantic_memory.core.relationship import Relationship, RelationType, SpatialProperties
+from semantic_memory.ingestion.cache import ObservationCache
+from semantic_memory.ingestion.decode import ORIGINAL_SIZE, DecodePolicy
 from semantic_memory.ingestion.observation import Observation
 
 
@@ -23,7 +28,9 @@ class PhotoProcessor:
         self,
         use_vision_model: bool = False,
         vision_model_name: str = "clip-vit-base-patch32",
-        detection_model_name: str = "yolov8n"
+        detection_model_name: str = "yolov8n",
+        decode_policy: Optional[DecodePolicy] = None,
+        cache: Optional[ObservationCache] = None
     ):
         """
         Initialize photo processor.
@@ -32,8 +39,14 @@ class PhotoProcessor:
             use_vision_model: If True, load ML models (requires GPU/resources)
             vision_model_name: Name of vision embedding model
             detection_model_name: Name of object detection model
+            decode_policy: How images are decoded (default: DecodePolicy())
+            cache: Cache of earlier results, reused for photos seen before
         """
         self.use_vision_model = use_vision_model
+        self.vision_model_name = vision_model_name
+        self.detection_model_name = detection_model_name
+        self.decode_policy = decode_policy or DecodePolicy()
+        self.cache = cache
         self.vision_model = None
         self.detection_model = None
 
@@ -77,6 +90,11 @@ class PhotoProcessor:
         Returns:
             Observation containing detected entities and relationships
         """
+        if self.cache is not None:
+            cached = self.cache.get(image_path, description, device_id, location_hint)
+            if cached is not None:
+                return cached
+
         observation = Observation(
             device_id=device_id,
             source_type="photo",
@@ -86,33 +104,67 @@ class PhotoProcessor:
         )
 
         try:
-            # Load image
-            image = Image.open(image_path)
-            observation.metadata["image_size"] = image.size
-            observation.metadata["image_mode"] = image.mode
-
-            if self.use_vision_model and self.vision_model:
-                # Use ML models for extraction
-                entities, relationships = self._extract_with_models(image, description)
-            else:
-                # Use rule-based/description-based extraction
-                entities, relationships = self._extract_from_description(
-                    description, image_path
-                )
+            self.extract(observation, self.decode(image_path))
+        except Exception as e:
+            observation.processing_errors.append(str(e))
+            observation.processed = False
 
-            # Add entities and relationships to observation
-            for entity in entities:
-                observation.add_entity(entity)
+        if self.cache is not None and observation.processed:
+            self.cache.put(image_path, observation)
+        return observation
 
-            for relationship in relationships:
-                observation.add_relationship(relationship)
+    def decode(self, image_path: str) -> Image.Image:
+        """
+        Open an image for extraction.
 
-            observation.processed = True
+        Pixel data is only decoded, at the reduced size of the decode
+        policy, when the vision models will use it; otherwise just the
+        header is read.
 
-        except Exception as e:
-            observation.processing_errors.append(str(e))
-            observation.processed = False
+        Args:
+            image_path: Path to image file
 
+        Returns:
+            The opened image
+        """
+        return self.decode_policy.decode(image_path, pixels=self.needs_pixels)
+
+    @property
+    def needs_pixels(self) -> bool:
+        """Whether extraction uses pixel data (otherwise only image metadata)."""
+        return bool(self.use_vision_model and self.vision_model)
+
+    def extract(self, observation: Observation, image: Image.Image) -> Observation:
+        """
+        Extract entities and relationships from a decoded image into an observation.
+
+        Args:
+            observation: Observation of the image (provides description and path)
+            image: Image returned by decode()
+
+        Returns:
+            The observation, marked as processed
+        """
+        observation.metadata["image_size"] = image.info.get(ORIGINAL_SIZE, image.size)
+        observation.metadata["image_mode"] = image.mode
+
+        if self.use_vision_model and self.vision_model:
+            # Use ML models for extraction
+            entities, relationships = self._extract_with_models(image, observation.description)
+        else:
+            # Use rule-based/description-based extraction
+            entities, relationships = self._extract_from_description(
+                observation.description, observation.image_path
+            )
+
+        # Add entities and relationships to observation
+        for entity in entities:
+            observation.add_entity(entity)
+
+        for relationship in relationships:
+            observation.add_relationship(relationship)
+
+        observation.processed = True
         return observation
 
     def _extract_with_models(
@@ -226,15 +278,30 @@ class PhotoProcessor:
         self,
         image_paths: List[str],
         descriptions: Optional[List[str]] = None,
-        device_id: str = "default"
+        device_id: str = "default",
+        max_workers: Optional[int] = 1,
+        chunksize: Optional[int] = None
     ) -> List[Observation]:
         """
         Process multiple photos in batch.
 
+        With more than one worker, photos are processed in a pool of
+        processes. Each worker builds its own PhotoProcessor (loading any
+        models once) and handles chunks of consecutive photos; results are
+        returned in input order. A photo that fails to process only records
+        the error in its own observation's processing_errors, even if it
+        crashes its worker process: the other unfinished photos are retried
+        in a new pool. The cache, if
+        any, is used in this process; only misses are sent to the workers.
+
         Args:
             image_paths: List of image file paths
             descriptions: Optional list of descriptions (same length)
             device_id: Identifier for source device
+            max_workers: Number of worker processes (None: one per CPU;
+                1: process in this process)
+            chunksize: Photos sent to a worker at a time (default: about
+                four chunks per worker)
 
         Returns:
             List of observations
@@ -242,10 +309,149 @@ class PhotoProcessor:
         if descriptions and len(descriptions) != len(image_paths):
             raise ValueError("Descriptions list must match image_paths length")
 
-        observations = []
-        for i, image_path in enumerate(image_paths):
-            description = descriptions[i] if descriptions else None
-            obs = self.process_photo(image_path, description, device_id)
-            observations.append(obs)
+        tasks = [
+            (image_path, descriptions[i] if descriptions else None, device_id)
+            for i, image_path in enumerate(image_paths)
+        ]
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(tasks))
+        if max_workers <= 1:
+            return [self.process_photo(*task) for task in tasks]
+
+        observations: List[Optional[Observation]] = [
+            self.cache.get(*task) if self.cache is not None else None for task in tasks
+        ]
+        misses = [i for i, observation in enumerate(observations) if observation is None]
+        if not misses:
+            return observations
+
+        if chunksize is None:
+            chunksize = max(1, len(misses) // (min(max_workers, len(misses)) * 4))
+
+        # A crashing worker breaks the whole pool and fails every unfinished
+        # chunk, so the photos that were in flight are then run one at a
+        # time to find the one that crashed it; the rest go back to the pool
+        remaining = misses
+        while remaining:
+            workers = min(max_workers, len(remaining))
+            remaining = self._run_pool(tasks, remaining, observations, workers, chunksize)
+            if remaining:
+                # Workers hold at most one queued chunk beyond those running
+                remaining = self._isolate_crash(
+                    tasks, remaining, observations, (workers + 1) * chunksize
+                )
 
         return observations
+
+    def _run_pool(
+        self,
+        tasks: List[Tuple[str, Optional[str], str]],
+        indices: List[int],
+        observations: List[Optional[Observation]],
+        workers: int,
+        chunksize: int
+    ) -> List[int]:
+        """
+        Process tasks in a pool of workers.
+
+        Returns:
+            Indices of the tasks left unfinished because a worker crashed
+        """
+        chunks = [indices[i:i + chunksize] for i in range(0, len(indices), chunksize)]
+        unfinished: List[int] = []
+        with self._pool(workers) as pool:
+            futures = [pool.submit(_process_chunk, [tasks[i] for i in chunk]) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    results = future.result()
+                except BrokenProcessPool:
+                    unfinished.extend(chunk)
+                    continue
+                except Exception as e:
+                    # E.g. a result that cannot be sent back
+                    results = [_failed_observation(tasks[i], e) for i in chunk]
+                for i, observation in zip(chunk, results):
+                    self._store_result(tasks[i], observation, observations, i)
+        return unfinished
+
+    def _isolate_crash(
+        self,
+        tasks: List[Tuple[str, Optional[str], str]],
+        indices: List[int],
+        observations: List[Optional[Observation]],
+        limit: int
+    ) -> List[int]:
+        """
+        Process tasks one at a time in a single worker until one crashes it.
+
+        The crashing task is marked failed. Gives up looking after limit
+        tasks (a crash that does not recur).
+
+        Returns:
+            Indices of the tasks not processed
+        """
+        with self._pool(1) as pool:
+            for position, i in enumerate(indices[:limit]):
+                try:
+                    results = pool.submit(_process_chunk, [tasks[i]]).result()
+                except BrokenProcessPool as e:
+                    observations[i] = _failed_observation(tasks[i], e)
+                    return indices[position + 1:]
+                except Exception as e:
+                    results = [_failed_observation(tasks[i], e)]
+                self._store_result(tasks[i], results[0], observations, i)
+        return indices[limit:]
+
+    def _pool(self, workers: int) -> ProcessPoolExecutor:
+        """Pool whose workers each hold a copy of this processor."""
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(type(self), self._worker_config())
+        )
+
+    def _store_result(
+        self,
+        task: Tuple[str, Optional[str], str],
+        observation: Observation,
+        observations: List[Optional[Observation]],
+        index: int
+    ) -> None:
+        observations[index] = observation
+        if self.cache is not None and observation.processed:
+            self.cache.put(task[0], observation)
+
+    def _worker_config(self) -> Dict[str, Any]:
+        """Constructor arguments that recreate this processor in a worker process."""
+        return {
+            "use_vision_model": self.use_vision_model,
+            "vision_model_name": self.vision_model_name,
+            "detection_model_name": self.detection_model_name,
+            "decode_policy": self.decode_policy,
+        }
+
+
+# PhotoProcessor of the current worker process, created once by _init_worker
+_worker_processor: Optional[PhotoProcessor] = None
+
+
+def _init_worker(processor_class: Type[PhotoProcessor], config: Dict[str, Any]) -> None:
+    global _worker_processor
+    _worker_processor = processor_class(**config)
+
+
+def _process_chunk(tasks: List[Tuple[str, Optional[str], str]]) -> List[Observation]:
+    return [_worker_processor.process_photo(*task) for task in tasks]
+
+
+def _failed_observation(task: Tuple[str, Optional[str], str], error: Exception) -> Observation:
+    image_path, description, device_id = task
+    observation = Observation(
+        device_id=device_id,
+        source_type="photo",
+        image_path=image_path,
+        description=description
+    )
+    observation.processing_errors.append(f"Worker failed: {error or type(error).__name__}")
+    return observation
@@ -0,0 +1,330 @@
+"""Asynchronous streaming ingestion of photos into a SemanticGraph."""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+from uuid import uuid4
+
+from PIL import Image
+
+from semantic_memory.core.entity import Entity
+from semantic_memory.core.relationship import Relationship
+from semantic_memory.graph.resolution import deduplicate_entities
+from semantic_memory.ingestion.decode import ORIGINAL_SIZE
+from semantic_memory.ingestion.observation import Observation
+from semantic_memory.ingestion.photo_processor import PhotoProcessor
+
+if TYPE_CHECKING:
+    # semantic_graph imports this package
+    from semantic_memory.graph.semantic_graph import SemanticGraph
+
+STAGES = ("decode", "extract", "resolve", "commit")
+
+DEFAULT_CONCURRENCY = {"decode": 4, "extract": 2, "resolve": 1, "commit": 1}
+
+IngestionResult = Tuple[Observation, List[Entity], List[Relationship]]
+
+# Pipeline token, processor class and constructor arguments
+ProcessorSpec = Tuple[str, Type[PhotoProcessor], Dict[str, Any]]
+
+
+class StageMetrics:
+    """Counters for one pipeline stage."""
+
+    def __init__(self, queue: "asyncio.Queue[_Job]", concurrency: int):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.processed = 0
+        self.failed = 0
+        self.active = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self.started = time.monotonic()
+
+    def enqueued(self) -> None:
+        """Record the queue depth after a job was queued."""
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get throughput, latency and queue depth of the stage."""
+        elapsed = time.monotonic() - self.started
+        done = self.processed + self.failed
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "active": self.active,
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "queue_size": self.queue.maxsize,
+            "throughput": done / elapsed if elapsed > 0 else 0.0,
+            "mean_latency": self.busy_seconds / done if done else 0.0,
+        }
+
+
+class _Job:
+    """A photo moving through the pipeline."""
+
+    __slots__ = ("observation", "image", "owners", "result", "future")
+
+    def __init__(self, observation: Observation, future: "asyncio.Future[IngestionResult]"):
+        self.observation = observation
+        self.image: Optional[Image.Image] = None
+        self.owners: Optional[List[int]] = None
+        self.result: Tuple[List[Entity], List[Relationship]] = ([], [])
+        self.future = future
+
+
+class IngestionPipeline:
+    """
+    Streams photos through decode, extract, resolve and commit stages.
+
+    Stages are connected by bounded queues and each runs a configurable
+    number of workers. A full queue suspends the stage feeding it, and
+    finally submit(), so a burst of photos waits at the entrance instead of
+    piling up in memory: at most the queue sizes plus the workers' jobs are
+    in flight.
+
+    Decoding, extraction and resolution (deduplicating the entities within
+    an observation) run on an executor: a thread pool by default, which
+    suits image decoding and model inference since they release the GIL, or
+    a process pool for pure-Python extraction. The executor is given
+    module-level functions with picklable arguments; in a process pool each
+    worker rebuilds the processor from its configuration once. Commits run
+    one at a time on a dedicated thread, which is the only writer of the
+    graph while the pipeline runs.
+
+    A photo that fails in any stage skips the remaining stages; the error is
+    recorded in its observation's processing_errors.
+
+    The processor's ObservationCache, if any, is not consulted: every
+    submitted photo is decoded and extracted.
+
+    Usage:
+        async with IngestionPipeline(graph) as pipeline:
+            for path in paths:
+                await pipeline.submit(path, device_id="camera-1")
+        print(pipeline.metrics())
+    """
+
+    def __init__(
+        self,
+        graph: "SemanticGraph",
+        processor: Optional[PhotoProcessor] = None,
+        queue_size: int = 64,
+        concurrency: Optional[Dict[str, int]] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize a pipeline (call start() or use it as a context manager).
+
+        Args:
+            graph: Graph to ingest into
+            processor: Processor for decoding and extraction
+                (default: PhotoProcessor())
+            queue_size: Capacity of the queue in front of each stage
+            concurrency: Workers per stage name (defaults: DEFAULT_CONCURRENCY);
+                commit is always 1
+            executor: Thread or process pool for decode, extract and resolve
+                (default: a thread pool with one thread per worker)
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive")
+        self.concurrency = dict(DEFAULT_CONCURRENCY)
+        for stage, workers in (concurrency or {}).items():
+            if stage not in self.concurrency:
+                raise ValueError(f"Unknown stage: {stage}")
+            if workers < 1:
+                raise ValueError(f"Concurrency of {stage} must be positive")
+            self.concurrency[stage] = workers
+        if self.concurrency["commit"] != 1:
+            raise ValueError("The commit stage has a single writer")
+
+        self.graph = graph
+        self.processor = processor or PhotoProcessor()
+        self.queue_size = queue_size
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._spec: ProcessorSpec = (
+            uuid4().hex, type(self.processor), self.processor._worker_config()
+        )
+        self._commit_executor: Optional[ThreadPoolExecutor] = None
+        self._queues: List["asyncio.Queue[_Job]"] = []
+        self._metrics: Dict[str, StageMetrics] = {}
+        self._workers: List["asyncio.Task[None]"] = []
+
+    async def __aenter__(self) -> "IngestionPipeline":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Create the queues and start the stage workers."""
+        if self._workers:
+            raise RuntimeError("Pipeline is already running")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=sum(self.concurrency[stage] for stage in STAGES[:-1]),
+                thread_name_prefix="ingest"
+            )
+        self._commit_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ingest-commit"
+        )
+        _processors[self._spec[0]] = self.processor
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in STAGES]
+        self._metrics = {
+            stage: StageMetrics(queue, self.concurrency[stage])
+            for stage, queue in zip(STAGES, self._queues)
+        }
+        for index, stage in enumerate(STAGES):
+            for _ in range(self.concurrency[stage]):
+                self._workers.append(asyncio.create_task(self._run_stage(index)))
+
+    async def submit(
+        self,
+        image_path: str,
+        description: Optional[str] = None,
+        device_id: str = "default",
+        location_hint: Optional[str] = None
+    ) -> "asyncio.Future[IngestionResult]":
+        """
+        Queue a photo, waiting while the first stage's queue is full.
+
+        Args:
+            image_path: Path to image file
+            description: Optional text description
+            device_id: Identifier for source device
+            location_hint: Optional location context
+
+        Returns:
+            Future of (observation, resolved entities, relationships), set
+            once the photo is committed or has failed
+        """
+        if not self._workers:
+            raise RuntimeError("Pipeline is not running")
+        observation = Observation(
+            device_id=device_id,
+            source_type="photo",
+            image_path=image_path,
+            description=description,
+            location_hint=location_hint
+        )
+        job = _Job(observation, asyncio.get_running_loop().create_future())
+        await self._queues[0].put(job)
+        self._metrics[STAGES[0]].enqueued()
+        return job.future
+
+    async def join(self) -> None:
+        """Wait until every submitted photo is committed or has failed."""
+        # Jobs move to the next queue before being marked done in this one
+        for queue in self._queues:
+            await queue.join()
+
+    async def close(self) -> None:
+        """Finish the submitted photos, then stop the workers and executors."""
+        if not self._workers:
+            return
+        await self.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        _processors.pop(self._spec[0], None)
+        self._commit_executor.shutdown()
+        if self._owns_executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get StageMetrics.stats() of each stage, in pipeline order."""
+        return {stage: self._metrics[stage].stats() for stage in STAGES if stage in self._metrics}
+
+    async def _run_stage(self, index: int) -> None:
+        stage = STAGES[index]
+        step = getattr(self, f"_{stage}")
+        queue = self._queues[index]
+        metrics = self._metrics[stage]
+
+        while True:
+            job = await queue.get()
+            metrics.active += 1
+            started = time.monotonic()
+            try:
+                await step(job)
+                metrics.processed += 1
+                failed = False
+            except Exception as e:
+                job.observation.processing_errors.append(str(e))
+                job.observation.processed = False
+                metrics.failed += 1
+                failed = True
+            finally:
+                metrics.active -= 1
+                metrics.busy_seconds += time.monotonic() - started
+
+            if failed or index == len(STAGES) - 1:
+                job.image = None
+                if not job.future.done():
+                    job.future.set_result((job.observation,) + job.result)
+            else:
+                await self._queues[index + 1].put(job)
+                self._metrics[STAGES[index + 1]].enqueued()
+            queue.task_done()
+
+    def _offload(self, function: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        return asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _decode(self, job: _Job) -> None:
+        job.image = await self._offload(_decode_photo, self._spec, job.observation.image_path)
+
+    async def _extract(self, job: _Job) -> None:
+        image, job.image = job.image, None
+        job.observation = await self._offload(_extract_photo, self._spec, job.observation, image)
+
+    async def _resolve(self, job: _Job) -> None:
+        job.owners = await self._offload(
+            deduplicate_entities, job.observation.entities, self.graph.match_candidates
+        )
+
+    async def _commit(self, job: _Job) -> None:
+        job.result = await asyncio.get_running_loop().run_in_executor(
+            self._commit_executor,
+            partial(self.graph.ingest_observation, job.observation, owners=job.owners)
+        )
+
+
+# Processors used by the stage functions in this process, by pipeline token:
+# the pipeline's own processor in its process, a rebuilt one (created once)
+# in each worker process of a process pool
+_processors: Dict[str, PhotoProcessor] = {}
+
+
+def _stage_processor(spec: ProcessorSpec) -> PhotoProcessor:
+    token, processor_class, config = spec
+    processor = _processors.get(token)
+    if processor is None:
+        processor = _processors[token] = processor_class(**config)
+    return processor
+
+
+def _decode_photo(spec: ProcessorSpec, image_path: str) -> Image.Image:
+    processor = _stage_processor(spec)
+    image = processor.decode(image_path)
+    if not processor.needs_pixels:
+        # Only the header was read; keep what extraction uses without the
+        # closed file, so the result can be sent between processes
+        header = Image.new(image.mode, (0, 0))
+        header.info.update(image.info)
+        header.info.setdefault(ORIGINAL_SIZE, image.size)
+        return header
+    return image
+
+
+def _extract_photo(
+    spec: ProcessorSpec, observation: Observation, image: Image.Image
+) -> Observation:
+    return _stage_processor(spec).extract(observation, image)
@@ -1 +1,5 @@
 """Spatial reasoning without fixed coordinates."""
+
+from semantic_memory.spatial.containment import CONTAINMENT_RELATION_MASK, ContainmentIndex
+
+__all__ = ["ContainmentIndex", "CONTAINMENT_RELATION_MASK"]
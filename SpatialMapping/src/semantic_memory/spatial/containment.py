@@ -0,0 +1,244 @@
+"""Containment hierarchy with interval labels for constant-time ancestor checks."""
+
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from semantic_memory.core.relationship import (
+    RELATION_CODES,
+    Relationship,
+    RelationType,
+    relation_mask,
+)
+
+# Relationship types meaning "source is (transitively) inside target"
+CONTAINMENT_RELATION_MASK = relation_mask([
+    RelationType.IN, RelationType.ON, RelationType.STORED_IN, RelationType.PART_OF
+])
+
+# Smallest label spacing per subtree node before a subtree must be relabeled
+_MIN_UNIT = 4
+
+# Label spacing per node for newly placed trees (leaves room for deep nesting)
+_ROOT_UNIT = 1 << 40
+
+
+class ContainmentIndex:
+    """
+    Forest of containment relationships labeled with nested intervals.
+
+    Entities are identified by their integer graph IDs. Each entity has at
+    most one primary container: the earliest containment
+    relationship from it that does not create a cycle. Later ones are kept
+    as alternates and promoted if the primary one is removed. Ones rejected
+    as cycles are retried when the relationship that closed the cycle is
+    removed. When an entity has several containers that conflict through a
+    cycle, which of them becomes primary can still depend on the order of
+    past edits rather than only on the relationships that remain.
+
+    Every node in the forest owns an integer interval [lo, hi] that strictly
+    contains the intervals of everything inside it, so "is X inside Y" is a
+    pair of comparisons. Intervals are allocated with spare room; when a
+    container runs out, its subtree (or an enclosing one) is relabeled, which
+    costs amortized O(1) per insertion. Python integers keep labels from
+    overflowing.
+    """
+
+    def __init__(self):
+        """Initialize an empty containment forest."""
+        self._parent: Dict[int, int] = {}
+        self._parent_rel: Dict[int, UUID] = {}
+        self._children: Dict[int, Dict[int, None]] = {}
+        self._candidates: Dict[int, Dict[UUID, int]] = {}  # child -> rel ID -> container
+
+        self._size: Dict[int, int] = {}
+        self._lo: Dict[int, int] = {}
+        self._hi: Dict[int, int] = {}
+        self._tail: Dict[int, int] = {}  # Next free label for a new child
+        self._unit: Dict[int, int] = {}  # Label spacing per node for children
+        self._next_root = 0
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._lo
+
+    def relationship_added(self, rel: Relationship, child: int, container: int) -> None:
+        """
+        Update the forest for a new relationship (non-containment types are ignored).
+
+        Args:
+            rel: The new relationship
+            child: Integer ID of its source entity
+            container: Integer ID of its target entity
+        """
+        if not CONTAINMENT_RELATION_MASK >> RELATION_CODES[rel.relation_type] & 1:
+            return
+        self._ensure_node(child)
+        self._ensure_node(container)
+        self._candidates.setdefault(child, {})[rel.id] = container
+        if child not in self._parent:
+            self._try_attach(child, container, rel.id)
+
+    def relationship_removed(self, rel: Relationship, child: int) -> None:
+        """Update the forest after a relationship from child was removed."""
+        if not CONTAINMENT_RELATION_MASK >> RELATION_CODES[rel.relation_type] & 1:
+            return
+        candidates = self._candidates.get(child)
+        if not candidates or candidates.pop(rel.id, None) is None:
+            return
+        if not candidates:
+            del self._candidates[child]
+
+        if self._parent_rel.get(child) == rel.id:
+            root = self._root(child)
+            self._detach(child)
+            self._retry_candidates(child)
+            # The old root may have rejected a container in the detached
+            # subtree as a cycle; now it might fit
+            if root not in self._parent:
+                self._retry_candidates(root)
+
+    def entity_removed(self, entity_id: int) -> None:
+        """Forget an entity whose relationships were already removed."""
+        if entity_id in self._lo and not self._children.get(entity_id):
+            for index in (self._size, self._lo, self._hi, self._tail, self._unit):
+                del index[entity_id]
+            self._children.pop(entity_id, None)
+
+    def is_inside(self, entity_id: int, container_id: int) -> bool:
+        """Check whether an entity is transitively inside a container in O(1)."""
+        lo = self._lo.get(entity_id)
+        container_lo = self._lo.get(container_id)
+        if lo is None or container_lo is None:
+            return False
+        return container_lo < lo and self._hi[entity_id] < self._hi[container_id]
+
+    def container(self, entity_id: int) -> Optional[int]:
+        """Get the primary container of an entity."""
+        return self._parent.get(entity_id)
+
+    def ancestors(self, entity_id: int) -> List[int]:
+        """Get all containers of an entity, innermost first."""
+        result = []
+        current = self._parent.get(entity_id)
+        while current is not None:
+            result.append(current)
+            current = self._parent.get(current)
+        return result
+
+    def descendants(self, container_id: int) -> List[int]:
+        """Get everything transitively inside a container, in O(result)."""
+        result: List[int] = []
+        stack = list(reversed(self._children.get(container_id, {})))
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(reversed(self._children.get(node, {})))
+        return result
+
+    def children(self, container_id: int) -> List[int]:
+        """Get entities whose primary container is the given one."""
+        return list(self._children.get(container_id, ()))
+
+    def _root(self, entity_id: int) -> int:
+        """Get the outermost container of an entity (itself if it has none)."""
+        parent = self._parent.get(entity_id)
+        while parent is not None:
+            entity_id = parent
+            parent = self._parent.get(entity_id)
+        return entity_id
+
+    def _retry_candidates(self, child: int) -> None:
+        """Attach a child without a container to its first candidate that fits."""
+        for rel_id, container in self._candidates.get(child, {}).items():
+            if self._try_attach(child, container, rel_id):
+                break
+
+    def _ensure_node(self, entity_id: int) -> None:
+        if entity_id not in self._lo:
+            self._size[entity_id] = 1
+            self._place_root(entity_id)
+
+    def _try_attach(self, child: int, container: int, rel_id: UUID) -> bool:
+        """Make container the primary parent of child unless that creates a cycle."""
+        if container == child or self.is_inside(container, child):
+            return False
+
+        size = self._size[child]
+        self._parent[child] = container
+        self._parent_rel[child] = rel_id
+        self._children.setdefault(container, {})[child] = None
+        node: Optional[int] = container
+        while node is not None:
+            self._size[node] += size
+            node = self._parent.get(node)
+
+        span = size * self._unit[container]
+        start = self._tail[container]
+        if start + span <= self._hi[container] and self._layout(child, start, start + span - 1):
+            self._tail[container] = start + span
+        else:
+            self._relabel(container)
+        return True
+
+    def _detach(self, child: int) -> None:
+        """Turn a child and its subtree into a separate tree."""
+        container = self._parent.pop(child)
+        del self._parent_rel[child]
+        siblings = self._children[container]
+        del siblings[child]
+        if not siblings:
+            del self._children[container]
+
+        size = self._size[child]
+        node: Optional[int] = container
+        while node is not None:
+            self._size[node] -= size
+            node = self._parent.get(node)
+        self._place_root(child)
+
+    def _relabel(self, node: int) -> None:
+        """Re-spread a subtree in its current interval, escalating to ancestors if it is full."""
+        while True:
+            if self._layout(node, self._lo[node], self._hi[node]):
+                return
+            parent = self._parent.get(node)
+            if parent is None:
+                self._place_root(node)
+                return
+            node = parent
+
+    def _place_root(self, root: int) -> None:
+        """Give a tree a fresh interval at the end of the label space."""
+        unit = _ROOT_UNIT
+        while True:
+            lo = self._next_root
+            hi = lo + 2 * self._size[root] * unit
+            if self._layout(root, lo, hi):
+                self._next_root = hi + 1
+                return
+            unit *= unit
+
+    def _layout(self, node: int, lo: int, hi: int) -> bool:
+        """
+        Assign [lo, hi] to a node and spread its subtree inside it.
+
+        Children are packed from the start in proportion to their subtree
+        size, leaving half the interval free for future children.
+
+        Returns:
+            False if the interval is too small for the subtree
+        """
+        unit = (hi - lo - 1) // (2 * self._size[node])
+        if unit < _MIN_UNIT:
+            return False
+        self._lo[node] = lo
+        self._hi[node] = hi
+        self._unit[node] = unit
+
+        position = lo + 1
+        for child in self._children.get(node, ()):
+            span = self._size[child] * unit
+            if not self._layout(child, position, position + span - 1):
+                return False
+            position += span
+        self._tail[node] = position
+        return True
@@ -0,0 +1,107 @@
+"""Tests for the containment hierarchy index."""
+
+import random
+from uuid import uuid4
+
+from semantic_memory.core.relationship import Relationship, RelationType
+from semantic_memory.spatial.containment import ContainmentIndex
+
+
+def _naive_ancestors(parents, node):
+    result = []
+    while node in parents:
+        node = parents[node]
+        result.append(node)
+    return result
+
+
+def _link(index, relation_type, child, container):
+    """Add a relationship between two integer entity IDs."""
+    rel = Relationship(relation_type=relation_type, source_id=uuid4(), target_id=uuid4())
+    index.relationship_added(rel, child, container)
+    return rel
+
+
+def test_containment_matches_naive_forest():
+    """Test labels against a naive parent-walk under random edits."""
+    rng = random.Random(7)
+    nodes = list(range(60))
+    index = ContainmentIndex()
+    edges = []
+
+    for step in range(600):
+        if edges and rng.random() < 0.3:
+            rel, child = edges.pop(rng.randrange(len(edges)))
+            index.relationship_removed(rel, child)
+        else:
+            child = rng.choice(nodes)
+            rel = _link(
+                index,
+                rng.choice([RelationType.IN, RelationType.ON, RelationType.NEAR]),
+                child,
+                rng.choice(nodes),
+            )
+            edges.append((rel, child))
+
+        if step % 20 == 0:
+            parents = {n: index.container(n) for n in nodes if index.container(n) is not None}
+            for node in nodes:
+                ancestors = _naive_ancestors(parents, node)
+                assert index.ancestors(node) == ancestors
+                for other in nodes:
+                    assert index.is_inside(node, other) == (other in ancestors)
+
+
+def test_alternate_container_promoted():
+    """Test that removing the primary container falls back to another one."""
+    item, box, shelf = 0, 1, 2
+    index = ContainmentIndex()
+    in_box = _link(index, RelationType.IN, item, box)
+    _link(index, RelationType.ON, item, shelf)
+
+    assert index.is_inside(item, box)
+    assert not index.is_inside(item, shelf)
+
+    index.relationship_removed(in_box, item)
+    assert index.container(item) == shelf
+    assert index.is_inside(item, shelf)
+    assert not index.is_inside(item, box)
+
+
+def test_large_container_relabels():
+    """Test that a container with many items stays correctly labeled."""
+    room, shelf = 0, 1
+    index = ContainmentIndex()
+    _link(index, RelationType.IN, shelf, room)
+    items = list(range(2, 2002))
+    for item in items:
+        _link(index, RelationType.ON, item, shelf)
+
+    assert all(index.is_inside(item, room) for item in items)
+    assert not index.is_inside(items[0], items[1])
+    assert len(index.descendants(room)) == 2001
+
+
+def _rebuilt(live, nodes):
+    """Index built from scratch from the remaining relationships, in order."""
+    index = ContainmentIndex()
+    for rel, child, container in live:
+        index.relationship_added(rel, child, container)
+    return {(a, b): index.is_inside(a, b) for a in nodes for b in nodes}
+
+
+def test_cycle_rejection_retried_when_cycle_is_broken():
+    """Test that a container rejected as a cycle is used once the cycle is gone."""
+    nodes = [0, 1, 2]
+    a, b, c = nodes
+    index = ContainmentIndex()
+    live = []
+    for child, container in [(b, a), (c, b), (a, c)]:
+        live.append((_link(index, RelationType.IN, child, container), child, container))
+    assert not index.is_inside(a, c)
+
+    rel, child, _ = live.pop(0)  # b IN a closed the cycle a -> c -> b -> a
+    index.relationship_removed(rel, child)
+
+    assert index.is_inside(a, c) and index.is_inside(a, b)
+    assert {(x, y): index.is_inside(x, y) for x in nodes for y in nodes} == _rebuilt(live, nodes)
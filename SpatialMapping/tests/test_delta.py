@@ -0,0 +1,101 @@
+"""Tests for delta export and apply."""
+
+import pytest
+
+from semantic_memory.core.entity import Entity, EntityType
+from semantic_memory.core.relationship import Relationship, RelationType
+from semantic_memory.graph.semantic_graph import SemanticGraph
+
+
+def _state(graph):
+    data = graph.export_to_dict()
+    return (
+        sorted(data["entities"], key=lambda e: e["id"]),
+        sorted(data["relationships"], key=lambda r: r["id"]),
+        graph.stats(),
+    )
+
+
+def _replica_of(graph):
+    return SemanticGraph.import_from_dict(graph.export_to_dict())
+
+
+def test_delta_contains_only_changes():
+    """Test that a delta carries changed records and tombstones, once each."""
+    graph = SemanticGraph()
+    graph.track_changes()
+    drill = graph.add_entity(Entity(entity_type=EntityType.EQUIPMENT, name="Drill"))
+    bench = graph.add_entity(Entity(entity_type=EntityType.SURFACE, name="Bench"))
+    rel = graph.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=drill.id, target_id=bench.id)
+    )
+    since = graph.version
+
+    assert graph.export_delta(since)["entities"] == []
+
+    graph.add_entity(Entity(entity_type=EntityType.EQUIPMENT, name="drill"))  # merge
+    graph.add_entity(Entity(entity_type=EntityType.EQUIPMENT, name="DRILL"))  # merge again
+    graph.remove_relationship(rel.id)
+    delta = graph.export_delta(since)
+
+    assert [e["id"] for e in delta["entities"]] == [str(drill.id)]
+    assert delta["entities"][0]["observation_count"] == 3
+    assert delta["relationships"] == []
+    assert delta["removed_relationships"] == [str(rel.id)]
+    assert delta["removed_entities"] == []
+    assert delta["to_version"] == graph.version > since
+
+
+def test_replica_follows_deltas():
+    """Test that applying successive deltas keeps a replica identical."""
+    primary = SemanticGraph()
+    drill = primary.add_entity(Entity(entity_type=EntityType.EQUIPMENT, name="Drill",
+                                      visual={"embedding": [1.0, 0.0]}))
+    case = primary.add_entity(Entity(entity_type=EntityType.CONTAINER, name="Case"))
+    primary.track_changes()
+    replica = _replica_of(primary)
+    synced = primary.version
+
+    shelf = primary.add_entity(Entity(entity_type=EntityType.SURFACE, name="Shelf"))
+    primary.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=drill.id, target_id=case.id)
+    )
+    primary.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=case.id, target_id=shelf.id)
+    )
+    synced = replica.apply_delta(primary.export_delta(synced), trusted=True)
+    assert _state(replica) == _state(primary)
+
+    primary.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=drill.id, target_id=case.id)
+    )
+    primary.remove_entity(shelf.id)
+    primary.add_entity(Entity(entity_type=EntityType.OBJECT, name="Bit"))
+    delta = primary.export_delta(synced)
+    synced = replica.apply_delta(delta)
+    assert _state(replica) == _state(primary)
+
+    # Re-applying is harmless
+    replica.apply_delta(delta)
+    assert _state(replica) == _state(primary)
+    assert [e.name for e in replica.get_containers(replica.get_entity(drill.id))] == ["Case"]
+
+
+def test_delta_requires_tracking_history():
+    """Test that deltas older than the tracked history are refused."""
+    graph = SemanticGraph()
+    with pytest.raises(ValueError):
+        graph.export_delta(0)
+
+    graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Screw"))
+    graph.track_changes()
+    with pytest.raises(ValueError):
+        graph.export_delta(0)
+
+    nut = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Nut"))
+    start = graph.version
+    graph.remove_entity(nut.id)
+    assert graph.prune_changes(graph.version) == 1
+    with pytest.raises(ValueError):
+        graph.export_delta(start)
+    assert graph.export_delta(graph.version)["removed_entities"] == []
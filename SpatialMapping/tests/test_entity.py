@@ -1,8 +1,11 @@
 """Tests for Entity class."""
 
+from datetime import datetime, timezone
+from uuid import uuid4
+
 import pytest
 
-from semantic_memory.core.entity import Entity, EntityType, SemanticAttributes
+from semantic_memory.core.entity import Entity, EntityType, SemanticAttributes, VisualFeatures
 
 
 def test_entity_creation():
@@ -79,3 +82,26 @@ def test_entity_serialization():
     assert restored.name == entity.name
     assert restored.entity_type == entity.entity_type
     assert restored.semantic.category == entity.semantic.category
+
+
+def test_trusted_codec_matches_pydantic():
+    """Test that the trusted dumper and loader agree with pydantic."""
+    entity = Entity(
+        entity_type=EntityType.OBJECT,
+        name="Drill",
+        semantic=SemanticAttributes(category="tool", tags={"power", "red"}, aliases=["driver"]),
+        visual=VisualFeatures(embedding=[0.1, 0.2], dominant_colors=["red"]),
+        first_observed=datetime(2024, 5, 1, 12, 30, 15, 123456),
+        last_observed=datetime(2024, 5, 2, tzinfo=timezone.utc),
+        source_devices={"cam-1"},
+        properties={"serial": uuid4(), "seen": datetime(2024, 1, 1), "bins": {"a"}},
+    )
+
+    data = entity.to_dict()
+    assert entity.to_dict(trusted=True) == data
+
+    restored = Entity.from_dict(data, trusted=True)
+    validated = Entity.from_dict(data)
+    assert restored.model_dump() == validated.model_dump()
+    # Sets are dumped as lists in iteration order, which a rebuilt set need not keep
+    assert Entity.from_dict(restored.to_dict(trusted=True)).model_dump() == validated.model_dump()
@@ -0,0 +1,99 @@
+"""Tests for the columnar entity store."""
+
+import gc
+from datetime import datetime, timezone
+
+import pytest
+
+from semantic_memory.core.entity import Entity, EntityType, SemanticAttributes, VisualFeatures
+from semantic_memory.graph.entity_store import EntityStore
+
+
+def _entity(**kwargs):
+    return Entity(entity_type=EntityType.OBJECT, name="Drill", **kwargs)
+
+
+def test_materialized_entity_round_trips():
+    """Test that an entity rebuilt from the columns equals the original."""
+    store = EntityStore()
+    original = _entity(
+        semantic=SemanticAttributes(category="tool", tags={"power"}, aliases=["driver"]),
+        visual=VisualFeatures(embedding=[0.5, 0.25, 1.0], dominant_colors=["red"]),
+        source_devices={"cam-1"},
+        properties={"voltage": 18},
+        confidence=0.8,
+        observation_count=3,
+        first_observed=datetime(2024, 5, 1, 12, 30, 15, 123456),
+        last_observed=datetime(2024, 5, 2, tzinfo=timezone.utc),
+    )
+    expected = original.to_dict()
+    store.put(7, original)
+    del original
+    gc.collect()
+
+    rebuilt = store.get(7)
+    assert rebuilt.to_dict() == expected
+    assert 7 in store and len(store) == 1
+    assert store.name(7) == "Drill"
+
+
+def test_live_entity_is_shared_and_updates_persist():
+    """Test that a referenced entity is handed out as-is and put() stores changes."""
+    store = EntityStore()
+    entity = _entity()
+    store.put(0, entity)
+    assert store.get(0) is entity
+
+    entity.semantic.tags.add("cordless")
+    entity.observation_count = 5
+    store.put(0, entity)
+    del entity
+    gc.collect()
+
+    rebuilt = store.get(0)
+    assert rebuilt.semantic.tags == {"cordless"}
+    assert rebuilt.observation_count == 5
+
+    # Handed-out containers are copies of the stored ones
+    rebuilt.semantic.tags.add("scratch")
+    del rebuilt
+    gc.collect()
+    assert store.get(0).semantic.tags == {"cordless"}
+
+
+def test_embeddings_share_one_matrix():
+    """Test that embeddings are stored as matrix rows and rows are reused."""
+    store = EntityStore(initial_capacity=2)
+    for i in range(5):
+        store.put(i, _entity(visual=VisualFeatures(embedding=[float(i), 1.0])))
+    store.put(5, _entity(visual=VisualFeatures(embedding=[1.0, 2.0, 3.0])))
+
+    assert store.embedding(3).tolist() == [3.0, 1.0]
+    assert store.embedding(5) is None
+    assert store.get(5).visual.embedding == [1.0, 2.0, 3.0]
+
+    store.remove(1)
+    before = store.nbytes
+    store.put(1, _entity(visual=VisualFeatures(embedding=[9.0, 9.0])))
+    assert store.nbytes == before
+    assert store.get(1).visual.embedding == pytest.approx([9.0, 9.0])
+
+
+def test_remove():
+    """Test that removed entities are gone."""
+    store = EntityStore()
+    store.put(0, _entity())
+    store.remove(0)
+    assert store.get(0) is None
+    assert list(store.ids()) == []
+
+
+def test_embeddings_read_back_exactly():
+    """Test that stored embeddings keep full float precision."""
+    store = EntityStore()
+    embedding = [0.1, 1 / 3, 1e-300, 123456.789012345]
+    entity = _entity(visual=VisualFeatures(embedding=embedding))
+    store.put(0, entity)
+    del entity
+    gc.collect()
+    assert store.get(0).visual.embedding == embedding
@@ -1,10 +1,26 @@
 """Tests for SemanticGraph class."""
 
+import io
+from uuid import uuid4
+
 import pytest
 
 from semantic_memory.core.entity import Entity, EntityType
 from semantic_memory.core.relationship import Relationship, RelationType
+from semantic_memory.graph.backends import ColumnarBackend, NativeBackend, NetworkXBackend
+from semantic_memory.graph.listeners import MutationListener
 from semantic_memory.graph.semantic_graph import SemanticGraph
+from semantic_memory.graph.sqlite_backend import SQLiteBackend
+from semantic_memory.ingestion.observation import Observation
+
+
+@pytest.fixture(
+    autouse=True, params=[NativeBackend, NetworkXBackend, ColumnarBackend, SQLiteBackend]
+)
+def backend(request, monkeypatch):
+    """Run every test in this module against each storage backend."""
+    monkeypatch.setattr(SemanticGraph, "default_backend", request.param)
+    return request.param
 
 
 def test_graph_creation():
@@ -106,3 +122,448 @@ def test_graph_serialization():
 
     assert new_graph.stats()["total_entities"] == 2
     assert new_graph.stats()["total_relationships"] == 1
+
+
+def test_trusted_graph_round_trip():
+    """Test that a trusted export/import reproduces the graph."""
+    graph = SemanticGraph()
+    drill, case, shelf = _containment_chain(graph, "Drill", "Case", "Shelf")
+    drill.visual.embedding = [1.0, 0.0]
+    graph.add_entity(drill)  # merge re-indexes the embedding
+
+    data = graph.export_to_dict(trusted=True)
+    restored = SemanticGraph.import_from_dict(data, trusted=True)
+
+    assert restored.export_to_dict(trusted=True)["entities"] == data["entities"]
+    assert restored.export_to_dict(trusted=True)["relationships"] == data["relationships"]
+    assert restored.stats() == graph.stats()
+    containers = restored.get_containers(restored.get_entity(drill.id))
+    assert [e.name for e in containers] == ["Case", "Shelf"]
+
+    probe = Entity(
+        entity_type=EntityType.OBJECT, name="Cordless", visual={"embedding": [1.0, 0.01]}
+    )
+    assert restored.add_entity(probe).id == drill.id
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_stream_round_trip(trusted):
+    """Test JSON Lines export/import, one record per line."""
+    graph = SemanticGraph()
+    drill, case, shelf = _containment_chain(graph, "Drill", "Case", "Shelf")
+    drill.visual.embedding = [1.0, 0.0]
+    graph.add_entity(drill)
+
+    buffer = io.StringIO()
+    assert graph.export_stream(buffer, trusted=trusted) == 5
+    lines = buffer.getvalue().splitlines()
+    assert len(lines) == 6
+    assert [line.split(",")[0] for line in lines[1:]] == (
+        ['{"kind": "entity"'] * 3 + ['{"kind": "relationship"'] * 2
+    )
+
+    buffer.seek(0)
+    restored = SemanticGraph.import_stream(buffer, trusted=trusted)
+    assert restored.export_to_dict()["entities"] == graph.export_to_dict()["entities"]
+    assert restored.stats() == graph.stats()
+    containers = restored.get_containers(restored.get_entity(drill.id))
+    assert [e.name for e in containers] == ["Case", "Shelf"]
+
+    probe = Entity(
+        entity_type=EntityType.OBJECT, name="Cordless", visual={"embedding": [1.0, 0.01]}
+    )
+    assert restored.add_entity(probe).id == drill.id
+
+
+def test_import_stream_rejects_unknown_input():
+    """Test that streams without a valid header are rejected."""
+    with pytest.raises(ValueError):
+        SemanticGraph.import_stream(io.StringIO('{"kind": "entity", "data": {}}\n'))
+    with pytest.raises(ValueError):
+        SemanticGraph.import_stream(io.StringIO('{"kind": "header", "format_version": 99}\n'))
+
+
+def test_visual_matching():
+    """Test merging entities by embedding similarity."""
+    graph = SemanticGraph()
+
+    drill = Entity(entity_type=EntityType.EQUIPMENT, name="Drill")
+    drill.visual.embedding = [1.0, 0.0, 0.1]
+    graph.add_entity(drill)
+
+    # Similar embedding, different name, same type: merged
+    seen_again = Entity(entity_type=EntityType.EQUIPMENT, name="Power Tool")
+    seen_again.visual.embedding = [0.9, 0.05, 0.1]
+    assert graph.add_entity(seen_again).id == drill.id
+
+    # Similar embedding but different type: kept separate
+    other_type = Entity(entity_type=EntityType.OBJECT, name="Drill Case")
+    other_type.visual.embedding = [1.0, 0.0, 0.1]
+    assert graph.add_entity(other_type).id == other_type.id
+
+    # Dissimilar embedding: kept separate
+    saw = Entity(entity_type=EntityType.EQUIPMENT, name="Saw")
+    saw.visual.embedding = [0.0, 1.0, 0.0]
+    assert graph.add_entity(saw).id == saw.id
+
+    assert graph.stats()["total_entities"] == 3
+
+
+def test_add_entities_batch():
+    """Test batch entity resolution against the batch and the graph."""
+    graph = SemanticGraph()
+
+    bench = Entity(entity_type=EntityType.SURFACE, name="Workbench")
+    drill = Entity(entity_type=EntityType.EQUIPMENT, name="Drill")
+    drill.visual.embedding = [1.0, 0.0, 0.0]
+    graph.add_entity(bench)
+    graph.add_entity(drill)
+
+    batch = [
+        Entity(entity_type=EntityType.OBJECT, name="Hammer"),
+        Entity(entity_type=EntityType.SURFACE, name="workbench"),
+        Entity(entity_type=EntityType.OBJECT, name="hammer"),
+        Entity(
+            entity_type=EntityType.EQUIPMENT,
+            name="Cordless Drill",
+            visual={"embedding": [0.95, 0.1, 0.0]},
+        ),
+        Entity(entity_type=EntityType.OBJECT, name="Tape", visual={"embedding": [0.0, 1.0]}),
+        Entity(entity_type=EntityType.OBJECT, name="Roll", visual={"embedding": [0.0, 0.9]}),
+    ]
+    resolved = graph.add_entities(batch)
+
+    assert [e.id for e in resolved] == [
+        batch[0].id, bench.id, batch[0].id, drill.id, batch[4].id, batch[4].id
+    ]
+    assert resolved[0].observation_count == 2
+    assert bench.observation_count == 2
+    assert graph.stats()["total_entities"] == 4
+    assert graph.get_entities_by_name("Tape")[0].id == batch[4].id
+
+
+def _alias_and_tag_probes():
+    graph = SemanticGraph(match_candidates=1)
+    drill = graph.add_entity(Entity(
+        entity_type=EntityType.EQUIPMENT, name="Cordless Drill", semantic={"aliases": ["driver"]}
+    ))
+    sander = graph.add_entity(Entity(
+        entity_type=EntityType.EQUIPMENT,
+        name="Sander",
+        semantic={"tags": {"power", "tool", "orbital"}},
+        visual={"embedding": [0.0, 1.0, 0.0, 0.0]},
+    ))
+    # Nearest by embedding to the probes, but not matches
+    graph.add_entity(Entity(
+        entity_type=EntityType.EQUIPMENT, name="Saw", visual={"embedding": [1.0, 0.0, 0.0, 1.2]}
+    ))
+    graph.add_entity(Entity(
+        entity_type=EntityType.EQUIPMENT, name="Grinder", visual={"embedding": [0.0, 0.0, 1.0, 1.2]}
+    ))
+    probes = [
+        Entity(
+            entity_type=EntityType.EQUIPMENT,
+            name="Impact Driver",
+            semantic={"aliases": ["Driver"]},
+            visual={"embedding": [1.0, 0.0, 0.0, 0.0]},
+        ),
+        Entity(
+            entity_type=EntityType.EQUIPMENT,
+            name="Orbital Sander",
+            semantic={"tags": {"power", "orbital"}},
+            visual={"embedding": [0.0, 0.0, 1.0, 0.0]},
+        ),
+        Entity(
+            entity_type=EntityType.OBJECT,
+            name="Driver Bit",
+            semantic={"aliases": ["driver"]},
+            visual={"embedding": [1.0, 0.0, 0.0, 0.0]},
+        ),
+    ]
+    return graph, [drill.id, sander.id, probes[2].id], probes
+
+
+def test_alias_and_tag_matches_outside_embedding_neighbours():
+    """Test that entities matching by alias or tags merge whatever their embeddings."""
+    graph, expected, probes = _alias_and_tag_probes()
+    assert [graph.add_entity(probe).id for probe in probes] == expected
+
+    graph, expected, probes = _alias_and_tag_probes()
+    assert [e.id for e in graph.add_entities(probes)] == expected
+    assert graph.stats()["total_entities"] == 5
+
+    # Within a batch too
+    graph = SemanticGraph(match_candidates=1)
+    batch = [
+        Entity(
+            entity_type=EntityType.EQUIPMENT,
+            name="Drill",
+            semantic={"aliases": ["driver"]},
+            visual={"embedding": [1.0, 0.0]},
+        ),
+        Entity(entity_type=EntityType.EQUIPMENT, name="Saw", visual={"embedding": [0.3, 1.0]}),
+        Entity(
+            entity_type=EntityType.EQUIPMENT,
+            name="Driver",
+            visual={"embedding": [-1.0, 1.0]},
+        ),
+    ]
+    assert [e.id for e in graph.add_entities(batch)] == [batch[0].id, batch[1].id, batch[0].id]
+
+
+def test_ingest_observation_remaps_merged_ids():
+    """Test that relationships follow entities merged into existing ones."""
+    graph = SemanticGraph()
+    table = Entity(entity_type=EntityType.SURFACE, name="Table")
+    graph.add_entity(table)
+
+    observation = Observation(device_id="phone")
+    tool = Entity(entity_type=EntityType.OBJECT, name="Tool")
+    table_again = Entity(entity_type=EntityType.SURFACE, name="table")
+    observation.add_entity(tool)
+    observation.add_entity(table_again)
+    observation.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=tool.id, target_id=table_again.id)
+    )
+
+    entities, relationships = graph.ingest_observation(observation)
+
+    assert [e.id for e in entities] == [tool.id, table.id]
+    assert relationships[0].target_id == table.id
+    assert graph.get_relationships(source_id=tool.id, target_id=table.id)
+    assert "phone" in table.source_devices
+
+    # Unknown endpoints are rejected before anything is written
+    bad = Observation(device_id="phone")
+    bad.add_entity(Entity(entity_type=EntityType.OBJECT, name="Orphan"))
+    bad.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=uuid4(), target_id=table.id)
+    )
+    with pytest.raises(ValueError):
+        graph.ingest_observation(bad)
+    assert not graph.get_entities_by_name("Orphan")
+
+
+def test_relationship_deduplication():
+    """Test that repeated relationships merge by (source, target, type)."""
+    graph = SemanticGraph()
+    tool = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Tool"))
+    table = graph.add_entity(Entity(entity_type=EntityType.SURFACE, name="Table"))
+
+    first = graph.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=tool.id, target_id=table.id)
+    )
+    again = graph.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=tool.id, target_id=table.id)
+    )
+    near = graph.add_relationship(
+        Relationship(relation_type=RelationType.NEAR, source_id=tool.id, target_id=table.id)
+    )
+
+    assert again.id == first.id
+    assert first.observation_count == 2
+    assert near.id != first.id
+    assert graph.stats()["total_relationships"] == 2
+
+
+def _containment_chain(graph, *names):
+    """Add entities each IN the next one and return them."""
+    entities = [graph.add_entity(Entity(entity_type=EntityType.OBJECT, name=n)) for n in names]
+    for inner, outer in zip(entities, entities[1:]):
+        graph.add_relationship(
+            Relationship(relation_type=RelationType.IN, source_id=inner.id, target_id=outer.id)
+        )
+    return entities
+
+
+def test_multi_hop_spatial_query():
+    """Test multi-hop queries follow only the requested edge types."""
+    graph = SemanticGraph()
+    drill, case, shelf, room = _containment_chain(graph, "Drill", "Case", "Shelf", "Room")
+    owner = graph.add_entity(Entity(entity_type=EntityType.PERSON, name="Sam"))
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.OWNED_BY, source_id=case.id, target_id=owner.id)
+    )
+
+    assert [e.id for e, _ in graph.query_spatial(drill)] == [case.id]
+    assert [e.id for e, _ in graph.query_spatial(drill, max_hops=3)] == [
+        case.id, shelf.id, room.id
+    ]
+    assert graph.query_spatial(drill, relation_type=RelationType.ON, max_hops=3) == []
+    assert graph.query_spatial(case, relation_type=RelationType.OWNED_BY) == []
+
+    context = graph.get_context(case)
+    assert context["container"].id == shelf.id
+    assert [e.id for e in context["contents"]] == [drill.id]
+
+    assert [e.id for e in graph.find_path(drill, room)] == [drill.id, case.id, shelf.id, room.id]
+    assert graph.find_path(room, drill) is None
+
+
+def test_incremental_stats_and_removal():
+    """Test that stats stay consistent through adds, merges and removals."""
+    graph = SemanticGraph()
+    drill, case, shelf = _containment_chain(graph, "Drill", "Case", "Shelf")
+    graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="drill"))  # Merge
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.USED_WITH, source_id=drill.id, target_id=shelf.id)
+    )
+
+    stats = graph.stats()
+    assert stats["total_entities"] == 3
+    assert stats["relationships_by_type"] == {"in": 2, "used_with": 1}
+    assert stats["spatial_relationships"] == 2
+    assert stats["graph_density"] == pytest.approx(3 / 6)
+    assert stats["degree"] == {"mean": 2.0, "max": 2, "isolated": 0}
+
+    graph.remove_entity(case.id)
+
+    stats = graph.stats()
+    assert stats["total_entities"] == 2
+    assert stats["total_relationships"] == 1
+    assert stats["spatial_relationships"] == 0
+    assert stats["degree"] == {"mean": 1.0, "max": 1, "isolated": 0}
+    assert graph.get_relationships(source_id=drill.id, relation_type=RelationType.IN) == []
+    assert graph.get_entities_by_name("case") == []
+
+    (used_with,) = graph.get_relationships(source_id=drill.id)
+    assert graph.remove_relationship(used_with.id) is used_with
+    assert graph.remove_relationship(used_with.id) is None
+    assert graph.stats()["degree"] == {"mean": 0.0, "max": 0, "isolated": 2}
+
+
+def test_readding_an_entity_updates_it():
+    """Test that adding a stored entity again without merging updates it."""
+    graph = SemanticGraph()
+    changes = []
+
+    class Recorder(MutationListener):
+        def entity_stored(self, entity):
+            changes.append(entity.id)
+
+    graph.add_listener(Recorder())
+    drill = Entity(entity_type=EntityType.OBJECT, name="Drill")
+    graph.add_entity(drill, merge_if_exists=False)
+
+    again = Entity(id=drill.id, entity_type=EntityType.OBJECT, name="Drill", confidence=0.5)
+    assert graph.add_entity(again, merge_if_exists=False) is again
+    graph.add_entities([again], merge_if_exists=False)
+
+    stats = graph.stats()
+    assert stats["total_entities"] == 1
+    assert stats["entities_by_type"] == {"object": 1}
+    assert stats["degree"]["isolated"] == 1
+    assert graph.get_entity(drill.id).confidence == 0.5
+    assert graph.get_entities_by_name("drill") == [again]
+    assert changes == [drill.id] * 3
+
+    with pytest.raises(ValueError):
+        graph.add_entity(Entity(id=drill.id, entity_type=EntityType.EQUIPMENT, name="Drill"))
+
+
+def test_containment_queries():
+    """Test transitive containment queries."""
+    graph = SemanticGraph()
+    drill, case, workshop = _containment_chain(graph, "Drill", "Case", "Workshop B")
+    bit = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Bit"))
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.STORED_IN, source_id=bit.id, target_id=case.id)
+    )
+
+    assert graph.is_inside(drill, workshop)
+    assert not graph.is_inside(workshop, drill)
+    assert [e.id for e in graph.get_containers(drill)] == [case.id, workshop.id]
+    assert {e.id for e in graph.get_contents(workshop)} == {case.id, drill.id, bit.id}
+    assert [e.id for e in graph.get_contents(workshop, transitive=False)] == [case.id]
+
+    graph.remove_entity(case.id)
+    assert not graph.is_inside(drill, workshop)
+
+
+def test_query_cache_invalidation():
+    """Test that cached reads are only invalidated by writes that affect them."""
+    graph = SemanticGraph(query_cache_size=16)
+    drill, case, shelf = _containment_chain(graph, "Drill", "Case", "Shelf")
+    elsewhere = graph.add_entity(Entity(entity_type=EntityType.SPACE, name="Elsewhere"))
+    far = graph.add_entity(Entity(entity_type=EntityType.SPACE, name="Far"))
+
+    first = graph.get_context(case)
+    assert graph.get_context(case) == first
+    assert graph.find_path(drill, shelf) == graph.find_path(drill, shelf)
+    assert graph.query_cache_stats()["hits"] == 2
+
+    # Unrelated write: cached context and path survive
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.OWNED_BY, source_id=elsewhere.id, target_id=far.id)
+    )
+    graph.get_context(case)
+    graph.find_path(drill, shelf)
+    assert graph.query_cache_stats()["hits"] == 4
+
+    # Write in the neighbourhood: recomputed
+    tape = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Tape"))
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=tape.id, target_id=case.id)
+    )
+    assert {e.id for e in graph.get_context(case)["contents"]} == {drill.id, tape.id}
+    assert graph.query_cache_stats()["invalidations"] == 1
+
+    # Fuzzy name results follow new names
+    assert [e.id for e in graph.get_entities_by_name("ta", fuzzy=True)] == [tape.id]
+    graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Table"))
+    assert len(graph.get_entities_by_name("ta", fuzzy=True)) == 2
+
+
+def test_backend_lookups_after_removal(backend):
+    """Test that type, name and dedup lookups forget removed records."""
+    graph = SemanticGraph()
+    assert isinstance(graph.backend, backend)
+
+    cup = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Cup"))
+    table = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Table"))
+    first = graph.add_relationship(
+        Relationship(source_id=cup.id, target_id=table.id, relation_type=RelationType.ON),
+        merge_if_exists=False
+    )
+    second = graph.add_relationship(
+        Relationship(source_id=cup.id, target_id=table.id, relation_type=RelationType.ON),
+        merge_if_exists=False
+    )
+
+    # The dedup key moves to the remaining duplicate
+    graph.remove_relationship(first.id)
+    merged = graph.add_relationship(
+        Relationship(source_id=cup.id, target_id=table.id, relation_type=RelationType.ON)
+    )
+    assert merged.id == second.id
+    assert merged.observation_count == 2
+
+    graph.remove_entity(cup.id)
+    assert graph.get_entities_by_name("cup") == []
+    assert graph.get_entities_by_type(EntityType.OBJECT) == [table]
+    assert graph.get_relationships(target_id=table.id) == []
+
+    nx_graph = graph.to_networkx()
+    assert list(nx_graph.nodes) == [table.id]
+    assert nx_graph.nodes[table.id]["entity"] is table
+    with pytest.deprecated_call():
+        assert list(graph.graph.nodes) == [table.id]
+
+
+def test_reused_internal_ids_do_not_leak_state():
+    """Test that an entity reusing a removed entity's integer ID starts clean."""
+    graph = SemanticGraph(query_cache_size=16)
+    drill, case, shelf = _containment_chain(graph, "Drill", "Case", "Shelf")
+    assert graph.get_context(case)["container"] is shelf
+
+    graph.remove_entity(case.id)
+    hammer = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Hammer"))
+
+    context = graph.get_context(hammer)
+    assert context["container"] is None
+    assert context["contents"] == []
+    assert graph.get_containers(hammer) == []
+    assert graph.get_containers(drill) == []
+    assert graph.query_spatial(hammer, max_hops=3) == []
+    assert graph.get_entity(case.id) is None
+    assert graph.get_entity(hammer.id) is hammer
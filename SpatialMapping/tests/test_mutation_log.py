@@ -0,0 +1,155 @@
+"""Tests for the write-ahead mutation log."""
+
+import shutil
+
+import pytest
+
+from semantic_memory.core.entity import Entity, EntityType
+from semantic_memory.core.relationship import Relationship, RelationType
+from semantic_memory.graph.listeners import MutationListener
+from semantic_memory.graph.mutation_log import MutationLog
+from semantic_memory.graph.semantic_graph import SemanticGraph
+
+
+def _populate(graph):
+    drill = graph.add_entity(Entity(entity_type=EntityType.EQUIPMENT, name="Drill",
+                                    visual={"embedding": [1.0, 0.0]}))
+    case = graph.add_entity(Entity(entity_type=EntityType.CONTAINER, name="Case"))
+    bench = graph.add_entity(Entity(entity_type=EntityType.SURFACE, name="Bench"))
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=drill.id, target_id=case.id)
+    )
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=case.id, target_id=bench.id)
+    )
+    # Merges
+    graph.add_entity(
+        Entity(entity_type=EntityType.EQUIPMENT, name="drill", semantic={"tags": {"tool"}})
+    )
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=drill.id, target_id=case.id)
+    )
+    return drill, case, bench
+
+
+def _state(graph):
+    return (
+        sorted(graph.export_to_dict()["entities"], key=lambda e: e["id"]),
+        sorted(graph.export_to_dict()["relationships"], key=lambda r: r["id"]),
+        graph.stats(),
+    )
+
+
+def test_listener_sees_effects():
+    """Test that listeners receive final states, including cascaded removals."""
+    events = []
+
+    class Recorder(MutationListener):
+        def entity_stored(self, entity):
+            events.append(("entity", entity.name, entity.observation_count))
+
+        def entity_removed(self, entity_id):
+            events.append(("remove_entity", entity_id))
+
+        def relationship_stored(self, relationship):
+            events.append(("relationship", relationship.relation_type))
+
+        def relationship_removed(self, relationship_id):
+            events.append(("remove_relationship", relationship_id))
+
+    graph = SemanticGraph()
+    graph.add_listener(Recorder())
+    drill, case, _ = _populate(graph)
+    assert events[5] == ("entity", "Drill", 2)
+
+    del events[:]
+    graph.remove_entity(case.id)
+    assert [e[0] for e in events] == ["remove_relationship", "remove_relationship", "remove_entity"]
+
+
+def test_recover_replays_log(tmp_path):
+    """Test that a recovered graph equals the graph that wrote the log."""
+    log = MutationLog(str(tmp_path))
+    graph = log.recover()
+    drill, case, bench = _populate(graph)
+    graph.remove_entity(bench.id)
+    log.close()
+
+    with MutationLog(str(tmp_path)) as reopened:
+        recovered = reopened.recover()
+        assert _state(recovered) == _state(graph)
+        assert [e.name for e in recovered.get_containers(recovered.get_entity(drill.id))] == [
+            "Case"
+        ]
+        probe = Entity(
+            entity_type=EntityType.EQUIPMENT, name="Cordless", visual={"embedding": [1.0, 0.1]}
+        )
+        assert recovered.add_entity(probe).id == drill.id
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    """Test that a partially written last record is ignored and truncated."""
+    log = MutationLog(str(tmp_path))
+    graph = log.recover()
+    _populate(graph)
+    log.close()
+    expected = _state(graph)
+
+    with open(log.log_path, "ab") as fp:
+        fp.write(b'0badf00d {"op":"entity","da')
+
+    with MutationLog(str(tmp_path)) as reopened:
+        recovered = reopened.recover()
+        assert _state(recovered) == expected
+        recovered.add_entity(Entity(entity_type=EntityType.OBJECT, name="Screw"))
+
+    with MutationLog(str(tmp_path)) as reopened:
+        assert reopened.recover().stats()["total_entities"] == 4
+
+
+def test_compaction(tmp_path):
+    """Test that compaction moves the log into the snapshot."""
+    log = MutationLog(str(tmp_path), sync_every=2)
+    graph = log.recover()
+    _, case, _ = _populate(graph)
+    assert log.size > 0
+
+    log.compact()
+    assert log.size == 0
+    graph.remove_entity(case.id)
+    log.close()
+
+    with MutationLog(str(tmp_path)) as reopened:
+        assert _state(reopened.recover()) == _state(graph)
+
+
+def test_crash_between_snapshot_and_truncate(tmp_path):
+    """Test replaying a log onto a snapshot that already contains it."""
+    log = MutationLog(str(tmp_path))
+    graph = log.recover()
+    _, case, bench = _populate(graph)
+    log.compact()
+
+    # The log now references an entity that only the old snapshot has
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.NEAR, source_id=case.id, target_id=bench.id)
+    )
+    graph.remove_entity(case.id)
+    log.close()
+
+    # Simulate the crash: the new snapshot exists, the log was not truncated
+    shutil.copy(log.log_path, tmp_path / "kept.log")
+    MutationLog(str(tmp_path)).compact(graph)
+    shutil.copy(tmp_path / "kept.log", log.log_path)
+
+    with MutationLog(str(tmp_path)) as reopened:
+        assert _state(reopened.recover()) == _state(graph)
+
+
+def test_attach_twice_fails(tmp_path):
+    """Test that a log follows a single graph."""
+    log = MutationLog(str(tmp_path))
+    log.recover()
+    with pytest.raises(RuntimeError):
+        log.attach(SemanticGraph())
+    log.close()
@@ -0,0 +1,149 @@
+"""Tests for the content-addressed observation cache."""
+
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from semantic_memory.ingestion import ObservationCache, PhotoProcessor
+from semantic_memory.ingestion import cache as cache_module
+from semantic_memory.ingestion.observation import Observation
+
+
+def _photo(path, seed=0, fmt=None, quality=95):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (6, 8, 3), dtype=np.uint8)
+    image = Image.fromarray(pixels).resize((160, 120), Image.Resampling.BICUBIC)
+    image.save(path, fmt, quality=quality)
+    return str(path)
+
+
+def test_reupload_is_served_from_cache(tmp_path, monkeypatch):
+    """Test that a re-uploaded photo is served from the cache with fresh entity IDs."""
+    original = _photo(tmp_path / "original.png")
+    reupload = str(tmp_path / "retry.png")
+    shutil.copy(original, reupload)
+    processor = PhotoProcessor(cache=ObservationCache(str(tmp_path / "cache.db")))
+
+    first = processor.process_photo(original, "a red toolbox on the bench", device_id="phone")
+
+    def fail(*args):
+        raise AssertionError("extraction should not run on a hit")
+
+    monkeypatch.setattr(processor, "extract", fail)
+    second = processor.process_photo(reupload, "a red toolbox on the bench", device_id="tablet")
+
+    assert second.processed and second.metadata["cache_hit"] == "exact"
+    assert second.image_path == reupload
+    assert [e.name for e in second.entities] == [e.name for e in first.entities]
+    assert not {e.id for e in second.entities} & {e.id for e in first.entities}
+    assert all(e.source_devices == {"tablet"} for e in second.entities)
+    ids = {e.id for e in second.entities}
+    assert all(r.source_id in ids and r.target_id in ids for r in second.relationships)
+
+    # The description is part of the key
+    assert processor.cache.get(reupload, "a drill in the drawer") is None
+    assert processor.cache.stats()["hits"] == 1
+
+
+def test_cache_persists_and_evicts_least_recently_used(tmp_path):
+    """Test that entries survive reopening and the least recently used is evicted."""
+    db = str(tmp_path / "cache.db")
+    photos = [_photo(tmp_path / f"photo_{i}.png", seed=i) for i in range(3)]
+    processor = PhotoProcessor(cache=ObservationCache(db))
+    for photo in photos[:2]:
+        processor.process_photo(photo, "a box on the shelf")
+    entry_size = processor.cache.stats()["bytes"] // 2
+    processor.cache.close()
+
+    cache = ObservationCache(db, max_bytes=2 * entry_size + entry_size // 2)
+    assert cache.get(photos[0], "a box on the shelf") is not None
+    PhotoProcessor(cache=cache).process_photo(photos[2], "a box on the shelf")
+
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(photos[1], "a box on the shelf") is None
+    assert cache.get(photos[0], "a box on the shelf") is not None
+    cache.close()
+
+
+@pytest.mark.parametrize("near_duplicates", [False, True])
+def test_near_duplicates_match_by_perceptual_hash(tmp_path, near_duplicates):
+    """Test that a recompressed photo hits only when near duplicates are enabled."""
+    cache = ObservationCache(":memory:", near_duplicates=near_duplicates)
+    processor = PhotoProcessor(cache=cache)
+    processor.process_photo(_photo(tmp_path / "photo.png"), "a box on the shelf")
+
+    recompressed = _photo(tmp_path / "photo.jpg", quality=70)
+    different = _photo(tmp_path / "other.png", seed=1)
+
+    hit = cache.get(recompressed, "a box on the shelf")
+    assert (hit is not None) == near_duplicates
+    if near_duplicates:
+        assert hit.metadata["cache_hit"] == "near"
+    assert cache.get(different, "a box on the shelf") is None
+
+
+def test_batch_process_uses_cache_in_parallel(tmp_path):
+    """Test that batch_process serves hits and stores misses with several workers."""
+    photos = [_photo(tmp_path / f"photo_{i}.png", seed=i) for i in range(4)]
+    cache = ObservationCache(":memory:")
+    processor = PhotoProcessor(cache=cache)
+    processor.process_photo(photos[1], "a box on the shelf")
+
+    observations = processor.batch_process(
+        photos, ["a box on the shelf"] * 4, max_workers=2
+    )
+
+    assert [o.image_path for o in observations] == photos
+    assert [o.metadata.get("cache_hit") for o in observations] == [None, "exact", None, None]
+    assert len(cache) == 4
+
+
+@pytest.mark.parametrize("max_distance", [3, 7])
+def test_banded_near_duplicate_lookup_matches_scan(tmp_path, monkeypatch, max_distance):
+    """Test that the banded lookup finds the closest hash a full scan would."""
+    rng = np.random.default_rng(max_distance)
+    hashes = {}
+    monkeypatch.setattr(cache_module, "perceptual_hash", lambda path: hashes[path])
+    cache = ObservationCache(":memory:", near_duplicates=True, max_distance=max_distance)
+    for i in range(200):
+        path = tmp_path / f"photo_{i}.bin"
+        path.write_bytes(str(i).encode())
+        hashes[str(path)] = int(rng.integers(-2**63, 2**63 - 1))
+        cache.put(str(path), Observation(device_id="phone", source_type="photo", processed=True))
+    stored = list(hashes.values())
+
+    def distance(a, b):
+        return bin((a ^ b) & 0xFFFFFFFFFFFFFFFF).count("1")
+
+    by_digest = {cache_module.file_digest(path): phash for path, phash in hashes.items()}
+    for i in range(300):
+        query = stored[i % len(stored)]
+        for bit in rng.choice(64, size=rng.integers(0, 2 * max_distance), replace=False):
+            query ^= 1 << int(bit)
+        query = (query + 2**63) % 2**64 - 2**63
+        closest = min(distance(query, phash) for phash in stored)
+        match = cache._nearest(query, "")
+        if closest > max_distance:
+            assert match is None
+        else:
+            assert distance(query, by_digest[match]) == closest
+
+
+def test_cache_is_shared_between_threads(tmp_path):
+    """Test that one cache can be used from several threads at once."""
+    photos = [_photo(tmp_path / f"photo_{i}.png", seed=i) for i in range(6)]
+    cache = ObservationCache(str(tmp_path / "cache.db"), near_duplicates=True)
+    processor = PhotoProcessor(cache=cache)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda photo: processor.process_photo(photo, "a box"), photos))
+        again = list(pool.map(lambda photo: processor.process_photo(photo, "a box"), photos * 2))
+
+    assert [o.metadata["cache_hit"] for o in again] == ["exact"] * 12
+    assert len(cache) == 6
+    assert cache.stats()["hits"] == 12
+    cache.close()
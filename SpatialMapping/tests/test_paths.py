@@ -0,0 +1,185 @@
+"""Tests for path finding."""
+
+import random
+
+import networkx as nx
+import pytest
+
+from semantic_memory.core.entity import Entity, EntityType
+from semantic_memory.core.relationship import Relationship, RelationType, SpatialProperties
+from semantic_memory.graph import khop
+from semantic_memory.graph.backends import ColumnarBackend, NativeBackend, NetworkXBackend
+from semantic_memory.graph.semantic_graph import SemanticGraph
+
+
+def _random_graph(seed, n=40, m=90):
+    rng = random.Random(seed)
+    graph = SemanticGraph()
+    reference = nx.DiGraph()
+    entities = [
+        graph.add_entity(Entity(entity_type=EntityType.SPACE, name=f"Zone {i}"))
+        for i in range(n)
+    ]
+    for entity in entities:
+        reference.add_node(entity.id)
+    for _ in range(m):
+        source, target = rng.sample(entities, 2)
+        distance = rng.uniform(0.5, 10.0)
+        rel_type = rng.choice([RelationType.NEXT_TO, RelationType.NEAR, RelationType.OWNED_BY])
+        graph.add_relationship(Relationship(
+            relation_type=rel_type,
+            source_id=source.id,
+            target_id=target.id,
+            spatial=SpatialProperties(distance_meters=distance),
+        ), merge_if_exists=False)
+        if rel_type != RelationType.OWNED_BY:
+            weight = min(distance, reference.get_edge_data(source.id, target.id, {}).get(
+                "weight", float("inf")
+            ))
+            reference.add_edge(source.id, target.id, weight=weight)
+    return graph, reference, entities
+
+
+def test_paths_match_reference():
+    """Test hop-count and weighted paths against networkx."""
+    graph, reference, entities = _random_graph(seed=3)
+    for source in entities[:10]:
+        for target in entities[-10:]:
+            path = graph.find_path(source, target)
+            weighted = graph.find_path(source, target, weighted=True)
+            if not nx.has_path(reference, source.id, target.id):
+                assert path is None and weighted is None
+                continue
+
+            assert len(path) - 1 == nx.shortest_path_length(reference, source.id, target.id)
+            assert all(reference.has_edge(a.id, b.id) for a, b in zip(path, path[1:]))
+
+            cost = sum(reference[a.id][b.id]["weight"] for a, b in zip(weighted, weighted[1:]))
+            expected = nx.dijkstra_path_length(reference, source.id, target.id)
+            assert abs(cost - expected) < 1e-9
+
+
+def test_path_cache_tracks_mutations():
+    """Test that cached adjacency follows added and removed relationships."""
+    graph = SemanticGraph()
+    a, b, c = (
+        graph.add_entity(Entity(entity_type=EntityType.SPACE, name=name)) for name in "ABC"
+    )
+    assert graph.find_path(a, c) is None
+
+    ab = graph.add_relationship(
+        Relationship(relation_type=RelationType.NEAR, source_id=a.id, target_id=b.id)
+    )
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.NEXT_TO, source_id=b.id, target_id=c.id)
+    )
+    assert [e.name for e in graph.find_path(a, c)] == ["A", "B", "C"]
+    assert graph.find_path(a, c, relation_types={RelationType.NEAR}) is None
+
+    graph.remove_relationship(ab.id)
+    assert graph.find_path(a, c) is None
+    assert [e.name for e in graph.find_path(b, c, heuristic=lambda e, t: 0.0)] == ["B", "C"]
+
+
+def test_vectorized_query_spatial_matches_loop():
+    """Test that the sparse-matrix k-hop engine matches the Python traversal."""
+    graph, _, entities = _random_graph(seed=11, n=60, m=200)
+
+    def both_ways(entity, hops):
+        graph.vectorized_hops = 100
+        loop = [(e.id, r.id) for e, r in graph.query_spatial(entity, max_hops=hops)]
+        graph.vectorized_hops = 1
+        vectorized = [(e.id, r.id) for e, r in graph.query_spatial(entity, max_hops=hops)]
+        return loop, vectorized
+
+    for entity in entities[:15]:
+        for hops in (1, 2, 3, 5):
+            loop, vectorized = both_ways(entity, hops)
+            assert vectorized == loop
+            assert graph.count_spatial(entity, max_hops=hops) == len(loop)
+
+        assert graph.count_spatial(entity, relation_type=RelationType.OWNED_BY, max_hops=3) == 0
+
+    # Cached adjacency is rebuilt after a mutation
+    removed = graph.query_spatial(entities[0])[0][1]
+    graph.remove_relationship(removed.id)
+    loop, vectorized = both_ways(entities[0], 4)
+    assert vectorized == loop
+    assert removed.id not in {rel_id for _, rel_id in vectorized}
+
+
+def test_khop_adjacency_not_rebuilt_per_write(monkeypatch):
+    """Test that interleaved writes and k-hop queries walk the graph until writes pause."""
+    builds = []
+    original = khop._CSRAdjacency
+
+    def counting(relationships):
+        builds.append(1)
+        return original(relationships)
+
+    monkeypatch.setattr(khop, "_CSRAdjacency", counting)
+    graph, _, entities = _random_graph(seed=5, n=40, m=100)
+    graph.vectorized_hops = 1
+    graph._khop.rebuild_after = 4
+
+    def loop_result(entity, hops):
+        graph.vectorized_hops = 100
+        result = [(e.id, r.id) for e, r in graph.query_spatial(entity, max_hops=hops)]
+        graph.vectorized_hops = 1
+        return result
+
+    graph.count_spatial(entities[0], max_hops=3)
+    assert len(builds) == 1
+
+    rng = random.Random(6)
+    for _ in range(20):
+        source, target = rng.sample(entities, 2)
+        graph.add_relationship(
+            Relationship(relation_type=RelationType.NEAR, source_id=source.id, target_id=target.id)
+        )
+        entity = rng.choice(entities)
+        expected = loop_result(entity, 3)
+        assert [(e.id, r.id) for e, r in graph.query_spatial(entity, max_hops=3)] == expected
+        assert graph.count_spatial(entity, max_hops=3) == len(expected)
+    assert len(builds) == 1
+
+    # Rebuilt once reads continue without writes
+    for entity in entities[:6]:
+        expected = loop_result(entity, 3)
+        assert [(e.id, r.id) for e, r in graph.query_spatial(entity, max_hops=3)] == expected
+    assert len(builds) == 2
+
+
+@pytest.mark.parametrize("seed", [5, 16])
+def test_backends_agree_on_query_spatial_order(seed):
+    """Test that every backend returns multi-hop spatial results in the same order."""
+    rng = random.Random(seed)
+    entities = [Entity(entity_type=EntityType.SPACE, name=f"Zone {i}") for i in range(30)]
+    rels = []
+    for _ in range(120):
+        source, target = rng.sample(entities, 2)
+        rels.append(Relationship(
+            relation_type=rng.choice([RelationType.NEXT_TO, RelationType.NEAR]),
+            source_id=source.id,
+            target_id=target.id,
+        ))
+    removed = rng.sample(rels, 20)
+
+    results = []
+    for backend in (NativeBackend(), NetworkXBackend(), ColumnarBackend()):
+        graph = SemanticGraph(backend=backend)
+        for entity in entities:
+            graph.add_entity(entity.model_copy(deep=True), merge_if_exists=False)
+        for rel in rels:
+            graph.add_relationship(rel.model_copy(deep=True), merge_if_exists=False)
+        for rel in removed:
+            graph.remove_relationship(rel.id)
+        for rel in removed[:10]:
+            graph.add_relationship(rel.model_copy(deep=True), merge_if_exists=False)
+        results.append([
+            [(e.id, r.id) for e, r in graph.query_spatial(start, max_hops=hops)]
+            for start in map(graph.get_entity, [entity.id for entity in entities])
+            for hops in (1, 2, 3)
+        ])
+    assert results[1] == results[0]
+    assert results[2] == results[0]
@@ -0,0 +1,99 @@
+"""Tests for PhotoProcessor."""
+
+import os
+
+from PIL import Image
+
+from semantic_memory.ingestion import DecodePolicy, PhotoProcessor
+
+
+class _CrashingProcessor(PhotoProcessor):
+    """Kills its worker process on photos named crash*."""
+
+    def extract(self, observation, image):
+        if os.path.basename(observation.image_path).startswith("crash"):
+            os._exit(1)
+        return super().extract(observation, image)
+
+
+def _write_images(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"photo_{i}.png"
+        Image.new("RGB", (8 + i, 8), color=(i * 20, 0, 0)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_batch_process_in_parallel_matches_serial(tmp_path):
+    """Test that a process-pool batch returns the same observations as a serial one."""
+    paths = _write_images(tmp_path, 6)
+    paths.insert(3, str(tmp_path / "missing.png"))
+    descriptions = [f"a chair next to a table ({i})" for i in range(len(paths))]
+    processor = PhotoProcessor()
+
+    serial = processor.batch_process(paths, descriptions, device_id="phone")
+    parallel = processor.batch_process(
+        paths, descriptions, device_id="phone", max_workers=2, chunksize=2
+    )
+
+    assert [obs.image_path for obs in parallel] == paths
+    for expected, actual in zip(serial, parallel):
+        assert actual.device_id == "phone"
+        assert actual.description == expected.description
+        assert actual.processed == expected.processed
+        assert actual.metadata == expected.metadata
+        assert [e.name for e in actual.entities] == [e.name for e in expected.entities]
+        assert len(actual.relationships) == len(expected.relationships)
+
+    # Only the unreadable photo records an error
+    assert [bool(obs.processing_errors) for obs in parallel] == [
+        i == 3 for i in range(len(paths))
+    ]
+
+
+def test_decode_policy_reduces_jpeg_while_decoding(tmp_path):
+    """Test that JPEGs are reduced while decoding and keep their original size."""
+    path = str(tmp_path / "large.jpg")
+    Image.new("RGB", (1600, 1200), color=(10, 200, 30)).save(path)
+
+    image = DecodePolicy(target_size=(200, 200)).decode(path)
+
+    assert max(image.size) <= 200
+    assert image.size[0] / image.size[1] == 1600 / 1200
+    assert image.mode == "RGB"
+    assert image.info["original_size"] == (1600, 1200)
+    assert image.getpixel((5, 5)) == (10, 200, 30)
+
+    full = DecodePolicy(target_size=None).decode(path)
+    assert full.size == (1600, 1200)
+
+
+def test_decode_policy_header_only(tmp_path):
+    """Test that decoding without pixels reads only the image header."""
+    path = str(tmp_path / "large.png")
+    Image.new("L", (640, 480)).save(path)
+
+    image = DecodePolicy().decode(path, pixels=False)
+
+    assert image.size == (640, 480)
+    assert image.mode == "L"
+
+    # Without vision models only metadata is read, and it reports the original size
+    processor = PhotoProcessor(decode_policy=DecodePolicy(target_size=(64, 64)))
+    observation = processor.process_photo(path)
+    assert observation.metadata["image_size"] == (640, 480)
+
+
+def test_batch_process_survives_worker_crash(tmp_path):
+    """Test that a worker crash fails only the photo that caused it."""
+    paths = _write_images(tmp_path, 8)
+    crash = str(tmp_path / "crash.png")
+    Image.new("RGB", (8, 8)).save(crash)
+    paths.insert(2, crash)
+
+    observations = _CrashingProcessor().batch_process(paths, max_workers=3, chunksize=1)
+
+    assert [obs.image_path for obs in observations] == paths
+    assert [obs.processed for obs in observations] == [path != crash for path in paths]
+    assert "Worker failed" in observations[2].processing_errors[0]
@@ -0,0 +1,91 @@
+"""Tests for the asynchronous ingestion pipeline."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from PIL import Image
+
+from semantic_memory.graph.semantic_graph import SemanticGraph
+from semantic_memory.ingestion import IngestionPipeline, PhotoProcessor
+
+
+def _write_images(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"photo_{i % 3}_{i}.png"
+        Image.new("RGB", (8, 8)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def _summary(graph):
+    return sorted(
+        (entity["name"], entity["observation_count"])
+        for entity in graph.export_to_dict()["entities"]
+    )
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_pipeline_matches_synchronous_ingestion(tmp_path, processes):
+    """Test that the pipeline ingests photos as synchronous ingest_observation calls would."""
+    paths = _write_images(tmp_path, 12)
+    descriptions = [f"a red toolbox on the bench ({i % 4})" for i in range(len(paths))]
+
+    expected = SemanticGraph()
+    processor = PhotoProcessor()
+    for path, description in zip(paths, descriptions):
+        expected.ingest_observation(processor.process_photo(path, description))
+
+    graph = SemanticGraph()
+    executor = ProcessPoolExecutor(max_workers=2) if processes else None
+
+    async def run():
+        async with IngestionPipeline(graph, queue_size=2, executor=executor) as pipeline:
+            futures = [
+                await pipeline.submit(path, description)
+                for path, description in zip(paths, descriptions)
+            ]
+            results = await asyncio.gather(*futures)
+        return results, pipeline.metrics()
+
+    results, metrics = asyncio.run(run())
+    if executor is not None:
+        executor.shutdown()
+
+    assert [observation.image_path for observation, _, _ in results] == paths
+    assert all(observation.processed for observation, _, _ in results)
+    assert _summary(graph) == _summary(expected)
+    assert graph.stats() == expected.stats()
+    for stage in ("decode", "extract", "resolve", "commit"):
+        assert metrics[stage]["processed"] == len(paths)
+        assert metrics[stage]["queue_depth"] == 0
+        assert metrics[stage]["max_queue_depth"] <= 2
+
+
+def test_pipeline_records_failures_per_photo(tmp_path):
+    """Test that a failing photo is reported in its own result and does not stop the rest."""
+    paths = _write_images(tmp_path, 2)
+    paths.insert(1, str(tmp_path / "missing.png"))
+    graph = SemanticGraph()
+
+    async def run():
+        async with IngestionPipeline(graph) as pipeline:
+            futures = [await pipeline.submit(path) for path in paths]
+        return [future.result() for future in futures], pipeline.metrics()
+
+    results, metrics = asyncio.run(run())
+
+    assert [bool(observation.processing_errors) for observation, _, _ in results] == [
+        False, True, False
+    ]
+    assert results[1][1] == []
+    assert metrics["decode"]["failed"] == 1
+    assert metrics["commit"]["processed"] == 2
+    assert len(graph.export_to_dict()["entities"]) == 2
+
+
+def test_pipeline_rejects_parallel_commits():
+    """Test that the commit stage cannot have more than one worker."""
+    with pytest.raises(ValueError):
+        IngestionPipeline(SemanticGraph(), concurrency={"commit": 2})
@@ -0,0 +1,54 @@
+"""Tests for Relationship class."""
+
+from uuid import uuid4
+
+import pytest
+
+from semantic_memory.core.relationship import (
+    RELATION_CODES,
+    SPATIAL_RELATION_MASK,
+    SPATIAL_RELATION_TYPES,
+    Relationship,
+    RelationType,
+    SpatialProperties,
+    relation_mask,
+)
+
+
+def _relationship(relation_type):
+    return Relationship(relation_type=relation_type, source_id=uuid4(), target_id=uuid4())
+
+
+def test_spatial_classification():
+    """Test spatial checks against the precomputed bitmask."""
+    for relation_type in RelationType:
+        rel = _relationship(relation_type)
+        assert rel.is_spatial() == (relation_type in SPATIAL_RELATION_TYPES)
+
+    assert relation_mask(SPATIAL_RELATION_TYPES) == SPATIAL_RELATION_MASK
+    assert relation_mask(["in"]) == 1 << RELATION_CODES[RelationType.IN]
+
+
+def test_inverse_type():
+    """Test inverse relationship lookup."""
+    assert _relationship(RelationType.ON).inverse_type() == RelationType.BELOW
+    assert _relationship(RelationType.LEFT_OF).inverse_type() == RelationType.RIGHT_OF
+    assert _relationship(RelationType.BEFORE).inverse_type() == RelationType.AFTER
+    assert _relationship(RelationType.IN).inverse_type() is None
+    assert _relationship(RelationType.NEAR).inverse_type() is None
+
+
+def test_trusted_codec_matches_pydantic():
+    """Test that the trusted dumper and loader agree with pydantic."""
+    for spatial in (None, SpatialProperties(distance_meters=1.5, distance_estimate="close")):
+        rel = Relationship(
+            relation_type=RelationType.NEAR,
+            source_id=uuid4(),
+            target_id=uuid4(),
+            spatial=spatial,
+            source_devices={"cam-1"},
+        )
+        data = rel.to_dict()
+        assert rel.to_dict(trusted=True) == data
+        restored = Relationship.from_dict(data, trusted=True)
+        assert restored.model_dump() == Relationship.from_dict(data).model_dump()
@@ -0,0 +1,117 @@
+"""Tests for binary graph snapshots."""
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from semantic_memory.core.entity import Entity, EntityType
+from semantic_memory.core.relationship import Relationship, RelationType
+from semantic_memory.graph.backends import ColumnarBackend, NativeBackend, NetworkXBackend
+from semantic_memory.graph.semantic_graph import SemanticGraph
+from semantic_memory.graph.snapshot import MappedVector, write_snapshot
+
+
+def _sample_graph():
+    graph = SemanticGraph()
+    drill = Entity(entity_type=EntityType.EQUIPMENT, name="Drill", properties={"watts": 500})
+    drill.visual.embedding = [1.0, 0.0, 0.5]
+    drill.visual.color_histogram = [0.25, 0.75]
+    drill.semantic.tags = {"tool", "power"}
+    bench = Entity(entity_type=EntityType.SURFACE, name="Bench")
+    graph.add_entity(drill)
+    graph.add_entity(bench)
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=drill.id, target_id=bench.id)
+    )
+    return graph, drill, bench
+
+
+def _export(graph):
+    """Exported entities and relationships, with set fields (exported unordered) sorted."""
+    data = graph.export_to_dict()
+    for record in data["entities"]:
+        record["semantic"]["tags"].sort()
+    for record in data["entities"] + data["relationships"]:
+        record["source_devices"].sort()
+    return data["entities"], data["relationships"]
+
+
+@pytest.mark.parametrize("backend", [NativeBackend, NetworkXBackend, ColumnarBackend])
+def test_snapshot_round_trip(tmp_path, backend):
+    """Test that a snapshot reproduces the graph."""
+    graph, drill, bench = _sample_graph()
+    path = str(tmp_path / "graph.snap")
+    graph.save_snapshot(path)
+
+    restored = SemanticGraph.load_snapshot(path, backend=backend())
+    assert _export(restored) == _export(graph)
+    assert restored.stats() == graph.stats()
+    assert [
+        e.name for e, _ in restored.query_spatial(restored.get_entity(drill.id), RelationType.ON)
+    ] == ["Bench"]
+
+    # The embedding index was rebuilt from the mapped vectors
+    probe = Entity(
+        entity_type=EntityType.EQUIPMENT, name="Cordless", visual={"embedding": [1.0, 0.0, 0.4]}
+    )
+    assert restored.add_entity(probe).id == drill.id
+
+
+def test_snapshot_vectors_are_mapped(tmp_path):
+    """Test that loaded vectors are lazy views that behave like lists."""
+    graph, drill, _ = _sample_graph()
+    path = str(tmp_path / "graph.snap")
+    graph.save_snapshot(path)
+
+    restored = SemanticGraph.load_snapshot(path)
+    embedding = restored.get_entity(drill.id).visual.embedding
+    assert isinstance(embedding, MappedVector)
+    assert isinstance(embedding.block, np.memmap)
+    assert embedding == [1.0, 0.0, 0.5]
+    assert embedding[2] == 0.5 and embedding[:2] == [1.0, 0.0]
+    assert np.asarray(embedding).dtype == np.float32
+
+    # Copies and pickles are plain lists
+    assert copy.deepcopy(embedding) == [1.0, 0.0, 0.5]
+    assert type(pickle.loads(pickle.dumps(embedding))) is list
+
+    # Replacing a vector and snapshotting again works
+    entity = restored.get_entity(drill.id)
+    entity.visual.embedding = [0.0, 1.0, 0.0]
+    restored.save_snapshot(path)
+    reloaded = SemanticGraph.load_snapshot(path)
+    assert reloaded.get_entity(drill.id).visual.embedding == [0.0, 1.0, 0.0]
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Test that non-snapshot files are rejected."""
+    path = tmp_path / "graph.json"
+    path.write_text('{"entities": []}')
+    with pytest.raises(ValueError):
+        SemanticGraph.load_snapshot(str(path))
+
+
+def test_empty_snapshot(tmp_path):
+    """Test that a graph without vectors round-trips."""
+    path = str(tmp_path / "empty.snap")
+    SemanticGraph().save_snapshot(path)
+    assert SemanticGraph.load_snapshot(path).stats()["total_entities"] == 0
+
+
+def test_failed_snapshot_write_leaves_no_partial_file(tmp_path):
+    """Test that a write that fails midway removes its temporary file."""
+    graph, drill, _ = _sample_graph()
+    path = tmp_path / "graph.smg"
+    graph.save_snapshot(str(path))
+    before = path.read_bytes()
+
+    def failing():
+        yield drill
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        write_snapshot(str(path), failing(), [], {})
+    assert path.read_bytes() == before
+    assert not (tmp_path / "graph.smg.tmp").exists()
@@ -0,0 +1,161 @@
+"""Tests for the SQLite backend."""
+
+from semantic_memory.core.entity import ENTITY_CODES, Entity, EntityType
+from semantic_memory.core.relationship import (
+    RELATION_CODES,
+    SPATIAL_RELATION_MASK,
+    Relationship,
+    RelationType,
+)
+from semantic_memory.graph import sqlite_backend
+from semantic_memory.graph.semantic_graph import SemanticGraph
+from semantic_memory.graph.sqlite_backend import SQLiteBackend
+
+
+def _build(graph):
+    drill = graph.add_entity(Entity(entity_type=EntityType.EQUIPMENT, name="Drill",
+                                    visual={"embedding": [1.0, 0.0, 0.25]}))
+    case = graph.add_entity(Entity(entity_type=EntityType.CONTAINER, name="Case"))
+    shelf = graph.add_entity(Entity(entity_type=EntityType.SURFACE, name="Shelf"))
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.IN, source_id=drill.id, target_id=case.id)
+    )
+    graph.add_relationship(
+        Relationship(relation_type=RelationType.ON, source_id=case.id, target_id=shelf.id)
+    )
+    return drill, case, shelf
+
+
+def test_graph_survives_reopen(tmp_path):
+    """Test that a reopened database serves the same graph and indices."""
+    path = str(tmp_path / "graph.db")
+    with SQLiteBackend(path) as backend:
+        graph = SemanticGraph(backend=backend)
+        drill, case, shelf = _build(graph)
+        graph.add_entity(
+            Entity(entity_type=EntityType.EQUIPMENT, name="drill", semantic={"tags": {"tool"}})
+        )
+        graph.remove_entity(
+            graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="Screw")).id
+        )
+        expected_stats = graph.stats()
+
+    with SQLiteBackend(path) as backend:
+        reopened = SemanticGraph(backend=backend)
+        assert reopened.stats() == expected_stats
+
+        drill = reopened.get_entity(drill.id)
+        assert drill.observation_count == 2 and drill.semantic.tags == {"tool"}
+        assert drill.visual.embedding == [1.0, 0.0, 0.25]
+        assert [e.name for e in reopened.get_containers(drill)] == ["Case", "Shelf"]
+        assert [e.name for e in reopened.find_path(drill, reopened.get_entity(shelf.id))] == [
+            "Drill", "Case", "Shelf"
+        ]
+        assert len(reopened.get_relationships(source_id=case.id)) == 1
+
+        # Rebuilt embedding index resolves new observations
+        probe = Entity(
+            entity_type=EntityType.EQUIPMENT, name="Cordless", visual={"embedding": [1.0, 0.0, 0.2]}
+        )
+        assert reopened.add_entity(probe).id == drill.id
+        assert reopened._match_index is None
+        probe = Entity(
+            entity_type=EntityType.EQUIPMENT,
+            name="Hammer Drill",
+            semantic={"aliases": ["drill"]},
+            visual={"embedding": [0.0, 1.0, 0.0]},
+        )
+        assert reopened.add_entity(probe).id == drill.id
+
+        # New IDs do not collide with persisted ones
+        bit = reopened.add_entity(Entity(entity_type=EntityType.OBJECT, name="Bit"))
+        assert reopened.get_entity(bit.id).name == "Bit"
+
+
+def test_bounded_cache_reads_through(tmp_path):
+    """Test that entities evicted from the cache are reloaded with their changes."""
+    backend = SQLiteBackend(str(tmp_path / "graph.db"), cache_size=2)
+    graph = SemanticGraph(backend=backend)
+    entities = [
+        graph.add_entity(
+            Entity(entity_type=EntityType.OBJECT, name=f"Part {i}"), merge_if_exists=False
+        )
+        for i in range(10)
+    ]
+    assert len(backend._cache) == 2
+
+    merged = graph.add_entity(Entity(entity_type=EntityType.OBJECT, name="part 0", confidence=0.9))
+    assert merged.id == entities[0].id
+    for entity in entities[1:]:
+        graph.get_entity(entity.id)
+
+    reloaded = graph.get_entity(entities[0].id)
+    assert reloaded is not merged
+    assert reloaded.observation_count == 2
+    assert len(backend._cache) == 2
+    backend.close()
+
+
+def test_reopened_graph_accepts_writes(tmp_path):
+    """Test that relationships of persisted entities can be added and removed after reopening."""
+    path = str(tmp_path / "graph.db")
+    with SQLiteBackend(path) as backend:
+        drill, case, shelf = _build(SemanticGraph(backend=backend))
+
+    with SQLiteBackend(path) as backend:
+        reopened = SemanticGraph(backend=backend, query_cache_size=16)
+        drill, case, shelf = (reopened.get_entity(e.id) for e in (drill, case, shelf))
+        assert reopened.get_context(drill)["container"].name == "Case"
+
+        near = reopened.add_relationship(
+            Relationship(relation_type=RelationType.NEAR, source_id=drill.id, target_id=shelf.id)
+        )
+        assert [e.name for e, _ in reopened.query_spatial(drill, RelationType.NEAR)] == ["Shelf"]
+        reopened.remove_relationship(near.id)
+        assert reopened.query_spatial(drill, RelationType.NEAR) == []
+
+        in_case = reopened.get_relationships(source_id=drill.id)[0]
+        reopened.remove_relationship(in_case.id)
+        assert reopened.get_context(drill)["container"] is None
+        reopened.remove_entity(case.id)
+        assert reopened.stats()["total_entities"] == 2
+        expected_stats = reopened.stats()
+
+    with SQLiteBackend(path) as backend:
+        assert SemanticGraph(backend=backend).stats() == expected_stats
+
+
+def test_scans_stream_in_batches(tmp_path, monkeypatch):
+    """Test that full scans return every row across batches, even with writes in between."""
+    monkeypatch.setattr(sqlite_backend, "_BATCH_SIZE", 3)
+    backend = SQLiteBackend(str(tmp_path / "graph.db"), cache_size=2)
+    graph = SemanticGraph(backend=backend)
+    parts = [
+        graph.add_entity(
+            Entity(entity_type=EntityType.OBJECT, name=f"Part {i}"), merge_if_exists=False
+        )
+        for i in range(10)
+    ]
+    rels = [
+        graph.add_relationship(Relationship(
+            relation_type=RelationType.NEAR if i % 2 else RelationType.NEXT_TO,
+            source_id=parts[i % 4].id,
+            target_id=parts[i + 1].id,
+        ), merge_if_exists=False)
+        for i in range(9)
+    ]
+
+    names = []
+    for entity in backend.entities():
+        names.append(entity.name)
+        entity.confidence = 0.5
+        backend.update_entity(graph._ids.get(entity.id), entity)
+    assert names == [f"Part {i}" for i in range(10)]
+    assert len(list(backend.entities_by_type(ENTITY_CODES[EntityType.OBJECT]))) == 10
+    assert [rel.id for rel in backend.relationships()] == [rel.id for rel in rels]
+
+    scanned = list(backend.relationships_with_mask(SPATIAL_RELATION_MASK))
+    assert sorted(rel.id for _, _, rel in scanned) == sorted(rel.id for rel in rels)
+    keys = [(s, RELATION_CODES[rel.relation_type]) for s, _, rel in scanned]
+    assert keys == sorted(keys)
+    backend.close()
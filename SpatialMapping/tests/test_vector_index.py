@@ -0,0 +1,111 @@
+"""Tests for vector indices."""
+
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from semantic_memory.core.entity import Entity, EntityType
+from semantic_memory.graph.semantic_graph import SemanticGraph
+from semantic_memory.graph.vector_index import ExactVectorIndex, IVFVectorIndex, VectorIndex
+
+
+def test_exact_index_search():
+    """Test nearest-neighbour search within a group."""
+    index = ExactVectorIndex()
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    index.add(a, [1.0, 0.0], "object")
+    index.add(b, [0.6, 0.8], "object")
+    index.add(c, [1.0, 0.0], "space")
+
+    results = index.search([2.0, 0.1], "object", k=2)
+    assert [eid for eid, _ in results] == [a, b]
+    assert results[0][1] == pytest.approx(0.9988, abs=1e-3)
+
+    assert index.search([0.0, 1.0], "object", threshold=0.9) == []
+    assert index.search([1.0, 0.0, 0.0], "object") == []  # Dimension mismatch
+
+
+def test_exact_index_remove():
+    """Test that removal keeps the row map consistent."""
+    index = ExactVectorIndex()
+    ids = [uuid4() for _ in range(5)]
+    for i, eid in enumerate(ids):
+        index.add(eid, [1.0, float(i)], "object")
+
+    index.remove(ids[0])
+    index.remove(ids[2])
+
+    assert len(index) == 3
+    assert ids[0] not in index
+    best, _ = index.search([1.0, 4.0], "object")[0]
+    assert best == ids[4]
+
+
+def test_exact_index_add_batch():
+    """Test that a batched insert matches one-by-one inserts."""
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(20, 4)).astype(np.float32)
+    vectors[3] = 0.0  # Zero vectors are skipped
+    ids = [uuid4() for _ in range(len(vectors))]
+
+    batched = ExactVectorIndex()
+    batched.add(ids[0], [1.0, 0.0, 0.0, 0.0], "object")
+    batched.add_batch(ids[1:], vectors[1:], "object")
+    single = ExactVectorIndex()
+    single.add(ids[0], [1.0, 0.0, 0.0, 0.0], "object")
+    for eid, vector in zip(ids[1:], vectors[1:]):
+        single.add(eid, vector, "object")
+
+    assert len(batched) == len(single) == 19
+    assert ids[3] not in batched
+    for vector in vectors[::3]:
+        expected = single.search(vector, "object", k=3)
+        results = batched.search(vector, "object", k=3)
+        assert [eid for eid, _ in results] == [eid for eid, _ in expected]
+        assert [s for _, s in results] == pytest.approx([s for _, s in expected], abs=1e-6)
+
+    # Updating existing entries goes through add()
+    batched.add_batch([ids[1]], np.array([[0.0, 0.0, 0.0, 1.0]]), "object")
+    assert batched.search([0.0, 0.0, 0.0, 1.0], "object")[0][0] == ids[1]
+
+
+def test_ivf_index_recall():
+    """Test that the IVF index finds exact neighbours once clustered."""
+    rng = np.random.default_rng(42)
+    vectors = rng.normal(size=(400, 16))
+    ids = [uuid4() for _ in range(len(vectors))]
+
+    index = IVFVectorIndex(nlist=8, nprobe=8, train_size=100)
+    for eid, vector in zip(ids, vectors):
+        index.add(eid, vector, "object")
+
+    # Probing every list is exhaustive
+    for i in range(0, 400, 37):
+        assert index.search(vectors[i], "object")[0][0] == ids[i]
+
+    index.remove(ids[0])
+    assert ids[0] not in index
+    assert all(eid != ids[0] for eid, _ in index.search(vectors[0], "object", k=5))
+
+
+def test_ivf_index_persistence():
+    """Test that a graph export carries the trained index state."""
+    index = IVFVectorIndex(nlist=2, nprobe=1, train_size=4)
+    graph = SemanticGraph(vector_index=index)
+    for i in range(6):
+        entity = Entity(entity_type=EntityType.OBJECT, name=f"Part {i}")
+        entity.visual.embedding = [1.0, float(i % 2), 0.5 * i]
+        graph.add_entity(entity, merge_if_exists=False)
+
+    restored = SemanticGraph.import_from_dict(graph.export_to_dict())
+    restored_index = restored._vector_index
+
+    assert isinstance(restored_index, IVFVectorIndex)
+    assert restored_index.nprobe == 1
+    assert len(restored_index) == 6
+    assert restored_index.to_dict() == index.to_dict()
+
+    with pytest.raises(ValueError):
+        VectorIndex.from_dict({"type": "unknown"})